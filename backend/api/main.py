@@ -3,19 +3,61 @@ from fastapi.middleware.cors import CORSMiddleware
 from backend.core.logging import configure_logging, get_logger
 from backend.api.routes import router as routes_router
 from backend.api.places import router as places_router
+from backend.services.cache_service import cleanup_periodically, get_cache, snapshot_periodically
+from backend.services.warming_service import get_cache_warmer
+from backend.services.places_service import get_places_service
+from backend.services.enrichment_service import get_detail_enricher
+from backend.core.config import get_settings
 from contextlib import asynccontextmanager
+import asyncio
 import time 
 from backend.api.recommend import router as recommend_router
 
 #1 Configure Login on Startup
 
+def _seed_spatial_index(logger):
+    """Load cataloged places into the nearby-search index."""
+    try:
+        get_places_service().seed_spatial_index()
+    except Exception as e:
+        logger.error(f'Failed to seed spatial index: {e}')
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging()
     logger = get_logger('Odyssey.main')
     logger.info('Starting Application...')
+
+    # Warm-start the cache from the last snapshot without blocking startup
+    settings = get_settings()
+    cache = get_cache()
+    background_tasks = []
+    if settings.CACHE_SNAPSHOT_PATH:
+        background_tasks.append(asyncio.create_task(
+            asyncio.to_thread(cache.load_snapshot, settings.CACHE_SNAPSHOT_PATH)
+        ))
+        background_tasks.append(asyncio.create_task(snapshot_periodically(
+            cache, settings.CACHE_SNAPSHOT_PATH, settings.CACHE_SNAPSHOT_INTERVAL_SECONDS
+        )))
+    background_tasks.append(asyncio.create_task(
+        cleanup_periodically(cache, settings.CACHE_CLEANUP_INTERVAL_SECONDS)
+    ))
+    background_tasks.append(asyncio.create_task(asyncio.to_thread(_seed_spatial_index, logger)))
+    if settings.CACHE_WARM_ENABLED:
+        background_tasks.append(asyncio.create_task(get_cache_warmer().run_periodically()))
+    if settings.ENRICH_ENABLED:
+        background_tasks.append(asyncio.create_task(get_detail_enricher().run_periodically(get_places_service)))
+
     yield
+
     logger.info('Shutting Down Application...')
+    for task in background_tasks:
+        task.cancel()
+    if settings.CACHE_SNAPSHOT_PATH:
+        try:
+            cache.save_snapshot(settings.CACHE_SNAPSHOT_PATH)
+        except Exception as e:
+            logger.error(f'Failed to save cache snapshot: {e}')
 
 app = FastAPI(lifespan=lifespan)
 logger = get_logger('Odyssey.main')
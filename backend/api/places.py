@@ -2,12 +2,29 @@
 Places API - Endpoints for discovering and searching places.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
-from backend.services.places_service import get_places_service, PLACE_TYPES
+import asyncio
+import orjson
+from backend.services.places_service import (
+    get_places_service,
+    normalize_city,
+    PLACE_TYPES,
+    discover_cache_key,
+    search_cache_key,
+    place_cache_key,
+)
 from backend.services.cache_service import get_cache
+from backend.services.warming_service import get_cache_warmer
+from backend.services.city_index import get_city_index
+from backend.services.enrichment_service import get_detail_enricher
+from backend.services.quota_service import get_quota_manager
+from backend.services.upstream_service import get_upstream_caller
+from backend.services.taste_profile import get_taste_profile_store
+from backend.services.photo_service import get_photo_service, content_type, etag_for, CACHE_CONTROL
+from backend.services.map_tiles import MAX_ZOOM, tiles_in_viewport
 from backend.core.logging import get_logger
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from backend.core.limiter import limiter
 from backend.core.config import get_settings
 from fastapi import Request, Depends
@@ -50,7 +67,7 @@ async def autocomplete_cities(
     q: str = Query(..., min_length=1, description="Partial city name to search for")
 ) -> CityAutocompleteResponse:
     """
-    Autocomplete California cities using Google Places API.
+    Autocomplete California cities (local index first, Google as fallback).
     
     As the user types, this returns matching California cities.
     Use this for dynamic city search instead of a static city list.
@@ -90,6 +107,30 @@ class DiscoverResponse(BaseModel):
     categories: List[str]
 
 
+def _to_place_response(service, p) -> PlaceResponse:
+    """
+    Convert a place record into the API response shape. Records come
+    from our own services, so the model is constructed without validation.
+    """
+    return PlaceResponse.model_construct(
+        id=p.id,
+        name=p.name,
+        address=p.address,
+        rating=p.rating,
+        user_rating_total=p.user_rating_total,
+        types=list(p.types),
+        photo_url=service.get_photo_url(p.photo_reference) if p.photo_reference else None,
+        summary=p.summary,
+        lat=p.coordinates.lat if p.coordinates else None,
+        lng=p.coordinates.lng if p.coordinates else None
+    )
+
+
+def _json_response(body: bytes) -> Response:
+    """Return an already-serialized JSON body, skipping FastAPI re-validation."""
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("/discover/{city}")
 @limiter.limit(settings.RATE_LIMIT_EXPENSIVE)
 async def discover_places(
@@ -123,10 +164,14 @@ async def discover_places(
                 )
         
         # Add state suffix if not present
-        city_query = city if "," in city else f"{city}, CA"
+        city_query = normalize_city(city)
 
         if current_user:
             try:
+                # Rebuild the taste profile before the new row lands, so it counts once
+                profiles = get_taste_profile_store()
+                profiles.ensure(current_user.id, db)
+
                 # Save to history
                 history = SearchHistory(
                     user_id=current_user.id,
@@ -136,10 +181,19 @@ async def discover_places(
                 )
                 db.add(history)
                 db.commit()
+                profiles.record(current_user.id, city_query, cat_list or [], history.timestamp)
                 logger.info(f"Saved search history for user {current_user.email}")
             except Exception as e:
                 logger.error(f"Failed to save history: {e}")
         
+        # Fast path: serve the pre-rendered body attached to the cached result
+        cache = get_cache()
+        data_k = discover_cache_key(city_query, cat_list)
+        variant = f"limit={limit}"
+        body = cache.get_rendered(data_k, variant)
+        if body is not None:
+            return _json_response(body)
+
         logger.info(f"Discovering places in {city_query}, categories: {cat_list}")
         
         places = service.discover_places(
@@ -148,32 +202,17 @@ async def discover_places(
             max_results=limit
         )
         
-        # Convert to response format
-        place_responses = []
-        for p in places:
-            photo_url = None
-            if p.photo_reference:
-                photo_url = service.get_photo_url(p.photo_reference)
-            
-            place_responses.append(PlaceResponse(
-                id=p.id,
-                name=p.name,
-                address=p.address,
-                rating=p.rating,
-                user_rating_total=p.user_rating_total,
-                types=p.types,
-                photo_url=photo_url,
-                summary=p.summary,
-                lat=p.coordinates.lat if p.coordinates else None,
-                lng=p.coordinates.lng if p.coordinates else None
-            ))
+        place_responses = [_to_place_response(service, p) for p in places]
         
-        return DiscoverResponse(
+        response = DiscoverResponse(
             city=city_query,
             count=len(place_responses),
             places=place_responses,
             categories=cat_list or ["attractions", "restaurants"]
         )
+        body = orjson.dumps(response.model_dump())
+        cache.set_rendered(data_k, body, variant)
+        return _json_response(body)
         
     except HTTPException:
         raise
@@ -190,7 +229,8 @@ async def discover_places(
 async def search_places(
     request: Request,
     q: str = Query(..., min_length=2, description="Search query"),
-    city: str = Query("San Francisco", description="City to search in")
+    city: str = Query("San Francisco", description="City to search in"),
+    open_at: Optional[datetime] = Query(None, description="Only places open at this local time (ISO 8601)")
 
 ) -> List[PlaceResponse]:
     """
@@ -198,7 +238,7 @@ async def search_places(
     """
     try:
         service = get_places_service()
-        city_query = city if "," in city else f"{city}, CA"
+        city_query = normalize_city(city)
         
         # 1. AI Vibe Parsing
         
@@ -218,7 +258,20 @@ async def search_places(
 
         logger.info(f"Searching '{search_term}' in {city_query} with params: {ai_params}")
         
-        # 2. Search with filters
+        # 2. Fast path: pre-rendered body for this filter set, attached to the
+        # cached base result. open_now depends on fetch time, so it's never pre-rendered.
+        cache = get_cache()
+        data_k = search_cache_key(search_term, city_query, ai_params.get("type"))
+        variant = (
+            f"min_price={ai_params.get('min_price')}:max_price={ai_params.get('max_price')}"
+            f":min_rating={ai_params.get('min_rating')}:open_at={open_at}"
+        )
+        if not ai_params.get("open_now"):
+            body = cache.get_rendered(data_k, variant)
+            if body is not None:
+                return _json_response(body)
+
+        # 3. Search with filters
         places = service.search_places(
             query=search_term, 
             city=city_query,
@@ -226,24 +279,14 @@ async def search_places(
             min_price=ai_params.get("min_price"),
             max_price=ai_params.get("max_price"),
             open_now=ai_params.get("open_now"),
-            min_rating=ai_params.get("min_rating")
+            min_rating=ai_params.get("min_rating"),
+            open_at=open_at
         )
         
-        return [
-            PlaceResponse(
-                id=p.id,
-                name=p.name,
-                address=p.address,
-                rating=p.rating,
-                user_rating_total=p.user_rating_total,
-                types=p.types,
-                photo_url=service.get_photo_url(p.photo_reference) if p.photo_reference else None,
-                summary=p.summary,
-                lat=p.coordinates.lat if p.coordinates else None,
-                lng=p.coordinates.lng if p.coordinates else None
-            )
-            for p in places
-        ]
+        body = orjson.dumps([_to_place_response(service, p).model_dump() for p in places])
+        if not ai_params.get("open_now"):
+            cache.set_rendered(data_k, body, variant)
+        return _json_response(body)
         
     except Exception as e:
         logger.error(f"Error searching places: {e}")
@@ -258,24 +301,21 @@ async def get_place_detail(request: Request, place_id: str) -> PlaceResponse:
     Get detailed information about a specific place.
     """
     try:
+        cache = get_cache()
+        data_k = place_cache_key(place_id)
+        body = cache.get_rendered(data_k)
+        if body is not None:
+            return _json_response(body)
+
         service = get_places_service()
         place = service.get_place_details(place_id)
         
         if not place:
             raise HTTPException(status_code=404, detail="Place not found")
         
-        return PlaceResponse(
-            id=place.id,
-            name=place.name,
-            address=place.address,
-            rating=place.rating,
-            user_rating_total=place.user_rating_total,
-            types=place.types,
-            photo_url=service.get_photo_url(place.photo_reference) if place.photo_reference else None,
-            summary=place.summary,
-            lat=place.coordinates.lat if place.coordinates else None,
-            lng=place.coordinates.lng if place.coordinates else None
-        )
+        body = orjson.dumps(_to_place_response(service, place).model_dump())
+        cache.set_rendered(data_k, body)
+        return _json_response(body)
         
     except HTTPException:
         raise
@@ -284,6 +324,180 @@ async def get_place_detail(request: Request, place_id: str) -> PlaceResponse:
         raise HTTPException(status_code=500, detail=f"Failed to get place: {str(e)}")
 
 
+class NearbyPlaceResponse(PlaceResponse):
+    distance_m: float
+
+
+class NearbyResponse(BaseModel):
+    count: int
+    places: List[NearbyPlaceResponse]
+
+
+@router.get("/nearby")
+@limiter.limit(settings.RATE_LIMIT_GLOBAL)
+async def nearby_places(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(1000, gt=0, le=20000, description="Search radius in meters"),
+    category: Optional[str] = Query(None, description="Optional category filter"),
+    limit: int = Query(20, ge=1, le=50)
+) -> NearbyResponse:
+    """
+    Known places near a point, nearest first.
+    
+    Answered from the local spatial index (places seen through discover,
+    search and details), so it never calls Google.
+    """
+    if category and category not in PLACE_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid category: {category}. Valid: {list(PLACE_TYPES.keys())}"
+        )
+    try:
+        service = get_places_service()
+        results = service.nearby_places(lat, lng, radius, category=category, limit=limit)
+        places = [
+            NearbyPlaceResponse(**_to_place_response(service, p).model_dump(), distance_m=round(d, 1))
+            for p, d in results
+        ]
+        return NearbyResponse(count=len(places), places=places)
+    except Exception as e:
+        logger.error(f"Error finding nearby places: {e}")
+        raise HTTPException(status_code=500, detail=f"Nearby search failed: {str(e)}")
+
+
+class MarkerCluster(BaseModel):
+    lat: float
+    lng: float
+    count: int
+
+
+class ViewportResponse(BaseModel):
+    zoom: int
+    clusters: List[MarkerCluster]
+    places: List[PlaceResponse]
+
+
+# A typical map viewport covers 20-40 tiles
+MAX_VIEWPORT_TILES = 64
+# All of California fits in a couple of tiles at zoom 5; lower zooms show nothing more
+MIN_VIEWPORT_ZOOM = 4
+
+
+@router.get("/viewport")
+@limiter.limit(settings.RATE_LIMIT_GLOBAL)
+async def viewport_places(
+    request: Request,
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=MIN_VIEWPORT_ZOOM, le=MAX_ZOOM),
+    category: Optional[str] = Query(None, description="Optional category filter")
+) -> ViewportResponse:
+    """
+    Map markers inside a viewport, clustered server-side for the zoom level.
+    
+    Dense areas come back as clusters (centroid + count) so the payload
+    stays small however many places a city has.
+    """
+    if south > north or west > east:
+        raise HTTPException(status_code=400, detail="Viewport must satisfy south <= north and west <= east")
+    if category and category not in PLACE_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid category: {category}. Valid: {list(PLACE_TYPES.keys())}"
+        )
+    if len(tiles_in_viewport(south, west, north, east, zoom)) > MAX_VIEWPORT_TILES:
+        raise HTTPException(status_code=400, detail="Viewport too large for this zoom level")
+    try:
+        service = get_places_service()
+        # Index scans and clustering are CPU work; keep them off the event loop
+        result = await asyncio.to_thread(
+            service.viewport_places, south, west, north, east, zoom, category=category
+        )
+        return ViewportResponse(
+            zoom=zoom,
+            clusters=[MarkerCluster(**c) for c in result["clusters"]],
+            places=[_to_place_response(service, p) for p in result["places"]]
+        )
+    except Exception as e:
+        logger.error(f"Error building viewport: {e}")
+        raise HTTPException(status_code=500, detail=f"Viewport query failed: {str(e)}")
+
+
+MAX_BATCH_DETAILS = 25
+
+
+class BatchDetailRequest(BaseModel):
+    place_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_DETAILS)
+
+
+class BatchDetailItem(BaseModel):
+    place_id: str
+    place: Optional[PlaceResponse] = None
+    error: Optional[str] = None
+
+
+class BatchDetailResponse(BaseModel):
+    count: int
+    results: List[BatchDetailItem]
+
+
+@router.post("/detail/batch")
+@limiter.limit(settings.RATE_LIMIT_EXPENSIVE)
+async def get_place_details_batch(request: Request, body: BatchDetailRequest) -> BatchDetailResponse:
+    """
+    Get details for up to 25 places in one request.
+    
+    Results come back in input order; a place that can't be loaded has
+    `error` set ("not_found" or "upstream_error") instead of failing the batch.
+    """
+    try:
+        service = get_places_service()
+        outcomes = await asyncio.to_thread(service.get_place_details_batch, body.place_ids)
+        results = [
+            BatchDetailItem(
+                place_id=place_id,
+                place=_to_place_response(service, place) if place else None,
+                error=error
+            )
+            for place_id, (place, error) in zip(body.place_ids, outcomes)
+        ]
+        return BatchDetailResponse(count=len(results), results=results)
+    except Exception as e:
+        logger.error(f"Error in batch place details: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch detail failed: {str(e)}")
+
+
+@router.get("/photo/{ref}")
+# Shared scope: per-path limits would give every made-up ref its own allowance
+@limiter.shared_limit(settings.RATE_LIMIT_GLOBAL, scope="photo")
+async def get_photo(
+    request: Request,
+    ref: str,
+    w: int = Query(400, ge=50, le=1600, description="Requested width in pixels")
+) -> Response:
+    """
+    Serve a place photo (or fallback image) from the photo cache.
+    
+    Variants are immutable, so responses carry a strong ETag and a
+    one-year Cache-Control.
+    """
+    try:
+        data = await asyncio.to_thread(get_photo_service().get_photo, ref, w)
+    except Exception as e:
+        logger.error(f"Error fetching photo {ref[:16]}...: {e}")
+        raise HTTPException(status_code=404, detail="Photo not available")
+
+    etag = etag_for(data)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type=content_type(data), headers=headers)
+
+
 @router.get("/categories")
 async def get_categories() -> dict:
     """
@@ -310,4 +524,18 @@ async def get_cache_stats() -> dict:
     Get cache statistics (for debugging).
     """
     cache = get_cache()
-    return cache.get_stats()
+    stats = cache.get_stats()
+    stats["warming"] = get_cache_warmer().last_report
+    stats["autocomplete_index"] = get_city_index().get_stats()
+    stats["enrichment"] = get_detail_enricher().get_stats()
+    stats["photos"] = get_photo_service().get_stats()
+    stats["quota"] = get_quota_manager().get_stats()
+    stats["upstream"] = get_upstream_caller().get_stats()
+    stats["taste_profiles"] = get_taste_profile_store().get_stats()
+
+    autocomplete = stats["namespaces"].get("autocomplete", {})
+    reused = autocomplete.get("prefix_reuse", 0)
+    fetched = autocomplete.get("google_calls", 0)
+    rate = (reused / (reused + fetched) * 100) if reused + fetched > 0 else 0
+    stats["autocomplete_prefix_reuse_rate"] = f"{rate:.1f}%"
+    return stats
@@ -1,13 +1,23 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from backend.core.config import get_settings
+from backend.core.database import get_db
+from backend.core.deps import get_current_user_optional
+from backend.models.db import User
 from backend.models.user_preferance import UserPreference, ActivityType, PriceRange, TravelPace
-from backend.services.places_service import get_places_service
-from backend.services.recommendation_system import get_recommendation_service
+from backend.services.places_service import get_places_service, discover_cache_key
+from backend.services.recommendation_system import get_recommendation_service, preference_key
+from backend.services.cache_service import get_cache
+from backend.services.taste_profile import get_taste_profile_store
 from backend.core.logging import get_logger
 
 logger = get_logger('Odyssey.recommend_api')
 
+CANDIDATE_POOL = 50
+RECOMMEND_LIMIT = 15
+
 router = APIRouter(prefix='/api/recommend', tags=['Recommendation'])
 
 
@@ -33,7 +43,12 @@ class RecommendResponse(BaseModel):
 
 
 @router.post('/')
-async def get_recommendations(request: RecommendRequest) -> RecommendResponse:
+async def get_recommendations(
+    request: RecommendRequest,
+    db: Session = Depends(get_db),
+    # Optional auth: logged-in users get results re-ranked by their search history
+    current_user: Optional[User] = Depends(get_current_user_optional)
+) -> RecommendResponse:
     """Get personalized place recommendations based on preferences."""
     try:
         places_service = get_places_service()
@@ -44,19 +59,34 @@ async def get_recommendations(request: RecommendRequest) -> RecommendResponse:
 
         city_query = request.city
         logger.info(f'Getting recommendations for {city_query}')
-        
-        places = places_service.discover_places(
-            city=city_query,
-            categories=categories,
-            max_results=50
-        )
 
-        # Get recommendations
-        scored = rec_service.recommend(
-            places=places,
-            perferances=request.user_preference,
-            limit=15
-        )
+        # The whole scored pool lives on the discover entry it was scored from,
+        # so it is dropped whenever that city's place set changes
+        cache = get_cache()
+        data_k = discover_cache_key(city_query, categories)
+        variant = f"recommend:{preference_key(request.user_preference)}"
+        scored = cache.get_derived(data_k, variant, counter="recommend")
+        if scored is None:
+            places = places_service.discover_places(
+                city=city_query,
+                categories=categories,
+                max_results=CANDIDATE_POOL
+            )
+
+            # Score every candidate, so personalization can promote any of them
+            scored = rec_service.recommend(
+                places=places,
+                perferances=request.user_preference,
+                limit=CANDIDATE_POOL
+            )
+            cache.set_derived(data_k, variant, scored)
+
+        # Re-rank the shared pool per user (the profile read is a dict lookup), then cut
+        if current_user:
+            profile = get_taste_profile_store().ensure(current_user.id, db)
+            if profile is not None:
+                scored = rec_service.personalize(scored, profile, get_settings().TASTE_WEIGHT)
+        scored = scored[:RECOMMEND_LIMIT]
 
         # Build response
         recommendations = []
@@ -0,0 +1,61 @@
+"""
+Benchmark: per-place construction cost of the Pydantic Place model versus
+the slotted PlaceRecord, on the cached-dict path every cache hit takes.
+
+    python -m backend.benchmarks.place_records [--places 50] [--rounds 2000]
+"""
+
+import argparse
+import timeit
+from typing import Any, Dict, List
+from backend.models.place import Place, PlaceRecord
+
+
+def sample_places(count: int) -> List[Dict[str, Any]]:
+    """Cached place dicts shaped like a discover entry."""
+    return [
+        {
+            "id": f"place_{i}",
+            "name": f"Place {i}",
+            "summary": None,
+            "rating": 4.0 + (i % 10) / 10,
+            "user_rating_total": 100 * i,
+            "address": f"{i} Market St, San Francisco, CA",
+            "coordinates": {"lat": 37.77 + i / 1000, "lng": -122.42 - i / 1000},
+            "photo_reference": f"ref_{i}",
+            "types": ["tourist_attraction", "point_of_interest", "establishment"],
+            "price_level": i % 4,
+            "open_now": True,
+            "opening_hours": None,
+            "open_intervals": [[540, 1020], [1980, 2460]],
+            "vibe_score": 0.0,
+        }
+        for i in range(count)
+    ]
+
+
+def run(places: int, rounds: int) -> Dict[str, float]:
+    """Microseconds per place for each construction path."""
+    data = sample_places(places)
+    records = [PlaceRecord.from_dict(d) for d in data]
+    models = [Place(**d) for d in data]
+    cases = {
+        "Place(**dict)": lambda: [Place(**d) for d in data],
+        "PlaceRecord.from_dict": lambda: [PlaceRecord.from_dict(d) for d in data],
+        "Place.model_dump": lambda: [m.model_dump() for m in models],
+        "PlaceRecord.to_dict": lambda: [r.to_dict() for r in records],
+    }
+    return {
+        name: min(timeit.repeat(fn, number=rounds, repeat=3)) / (rounds * places) * 1e6
+        for name, fn in cases.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark place record construction.")
+    parser.add_argument("--places", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, micros in run(args.places, args.rounds).items():
+        print(f"{name:<24} {micros:8.2f} us/place")
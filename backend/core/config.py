@@ -33,6 +33,59 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     DEFAULT_CITY: str = "san-francisco"
     CACHE_TTL_SECONDS: int = 604800  # 7 days
+    CACHE_SNAPSHOT_PATH: str = "backend/cache/snapshot.bin"  # Empty disables snapshots
+    CACHE_SNAPSHOT_INTERVAL_SECONDS: int = 900  # 15 minutes
+    CACHE_CLEANUP_INTERVAL_SECONDS: int = 600  # Sweep expired entries every 10 minutes
+    CITY_BUNDLE_PATH: str = "backend/data/city_bundle.bin"  # Built by backend.services.city_bundle
+
+    # Predictive cache warming from search history
+    CACHE_WARM_ENABLED: bool = True
+    CACHE_WARM_HOURS: str = "2-6"  # Off-peak local hours (start-end, may wrap midnight)
+    CACHE_WARM_INTERVAL_SECONDS: int = 1800
+    CACHE_WARM_BUDGET: int = 100  # Max Google calls per warming cycle
+    CACHE_WARM_TOP_N: int = 50
+    CACHE_WARM_HISTORY_DAYS: int = 14
+    CACHE_WARM_REFRESH_WITHIN_SECONDS: int = 86400  # Refresh entries expiring within a day
+    
+    # Place catalog freshness per field group
+    CATALOG_BASIC_MAX_AGE_DAYS: int = 90
+    CATALOG_ATMOSPHERE_MAX_AGE_DAYS: int = 7
+    CATALOG_CONTACT_MAX_AGE_DAYS: int = 30
+    
+    # Background detail enrichment (price level, opening hours)
+    ENRICH_ENABLED: bool = True
+    ENRICH_INTERVAL_SECONDS: int = 5
+    ENRICH_BATCH_SIZE: int = 5  # Max Google detail calls per interval
+    ENRICH_MAX_QUEUE: int = 5000
+    
+    # Photo proxy
+    PUBLIC_API_URL: str = "http://localhost:8000"  # Absolute backend URL for photo URLs (matches the frontend default)
+    PHOTO_CACHE_DIR: str = "backend/cache/photos"
+    PHOTO_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Google API quotas (per day, reset at midnight Pacific) and circuit breaker
+    QUOTA_TEXT_SEARCH_PER_DAY: int = 5000
+    QUOTA_DETAILS_PER_DAY: int = 10000
+    QUOTA_AUTOCOMPLETE_PER_DAY: int = 20000
+    QUOTA_PHOTOS_PER_DAY: int = 10000
+    QUOTA_DISTANCE_ELEMENTS_PER_DAY: int = 20000
+    QUOTA_BACKGROUND_SHARE: float = 0.5  # Share of each daily quota background work may use
+    UPSTREAM_BREAKER_FAILURES: int = 5
+    UPSTREAM_BREAKER_COOLDOWN_SECONDS: int = 30
+
+    # Google call timeouts, retries and hedging
+    UPSTREAM_TIMEOUT_SECONDS: int = 8
+    UPSTREAM_MAX_RETRIES: int = 2  # Retryable statuses only, with full-jitter backoff
+    UPSTREAM_RETRY_BASE_SECONDS: float = 0.2
+    HEDGE_ENABLED: bool = True
+    HEDGE_QUANTILE: float = 0.95  # Hedge calls still outstanding at this latency quantile
+    HEDGE_MIN_SAMPLES: int = 20
+    HEDGE_MIN_DELAY_SECONDS: float = 0.05
+
+    # Personalized re-ranking from search history
+    TASTE_HALF_LIFE_DAYS: float = 30.0  # A search counts half as much after this long
+    TASTE_WEIGHT: float = 15.0  # Recommendation points for a place in a user's only category
+    TASTE_SEED_ROWS: int = 200  # History rows replayed to build a profile after a restart
     
     # API limits
     MAX_PLACES_PER_SEARCH: int = 20
@@ -3,12 +3,13 @@ Route Optimization Service
 Uses Google Maps APIs to calculate optimal routes and travel times.
 """
 
-import googlemaps
 from typing import List, Dict, Optional, Tuple
 from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
 import itertools
+from backend.services.cache_service import get_cache, cache_key
+from backend.services.upstream_service import get_upstream_caller, google_client
 
 load_dotenv()
 
@@ -35,18 +36,32 @@ class RouteOptimizer:
         api_key = os.getenv("GOOGLE_MAPS_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_MAPS_API_KEY not found in environment variables")
-        self.client = googlemaps.Client(key=api_key)
+        self.client = google_client(api_key)
+        self.cache = get_cache()
+        self.upstream = get_upstream_caller()
     
     def get_distance_matrix(self, origins: List[str], destinations: List[str]) -> Dict:
         """
         Get distance and duration matrix between multiple origins and destinations.
+        Results are cached in the "routes" namespace.
         """
-        result = self.client.distance_matrix(
+        cache_k = cache_key("routes", "matrix", "|".join(origins), "|".join(destinations))
+        cached = self.cache.get(cache_k)
+        if cached:
+            return cached
+
+        # Google bills distance matrix calls per element
+        result = self.upstream.call(
+            "distance_matrix_elements",
+            self.client.distance_matrix,
+            cost=len(origins) * len(destinations),
             origins=origins,
             destinations=destinations,
             mode="driving",
             units="metric"
         )
+        if result.get("status") == "OK":
+            self.cache.set(cache_k, result)
         return result
     
     def calculate_route_duration(self, locations: List[str]) -> Tuple[int, int]:
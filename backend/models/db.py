@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, JSON
 from sqlalchemy.orm import relationship
 from backend.core.database import Base
 from datetime import datetime
@@ -22,3 +22,36 @@ class SearchHistory(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="searches")
+
+
+class CatalogPlace(Base):
+    """
+    Every place we've fetched from Google, keyed by place_id.
+    Fields are grouped the way Google bills them; each group records
+    when it was last fetched so only stale groups are refreshed.
+    """
+    __tablename__ = "places"
+
+    place_id = Column(String, primary_key=True, index=True)
+    city = Column(String, index=True, nullable=True)  # City it was first discovered in
+
+    # Basic group
+    name = Column(String)
+    address = Column(String, nullable=True)
+    lat = Column(Float, nullable=True)
+    lng = Column(Float, nullable=True)
+    types = Column(JSON, default=list)
+    photo_reference = Column(String, nullable=True)
+    basic_fetched_at = Column(DateTime, nullable=True)
+
+    # Atmosphere group
+    rating = Column(Float, nullable=True)
+    user_ratings_total = Column(Integer, nullable=True)
+    price_level = Column(Integer, nullable=True)
+    atmosphere_fetched_at = Column(DateTime, nullable=True)
+
+    # Contact group
+    opening_hours = Column(JSON, nullable=True)
+    website = Column(String, nullable=True)
+    phone = Column(String, nullable=True)
+    contact_fetched_at = Column(DateTime, nullable=True)
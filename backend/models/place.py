@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 class Coordinates(BaseModel):
     lat: float
@@ -15,6 +15,129 @@ class Place(BaseModel):
     coordinates: Optional[Coordinates] = None
     photo_reference: Optional[str] = None
     types: List[str] = []
+    price_level: Optional[int] = None
+    # Snapshot from the last fetch; only meaningful for recently fetched results
+    open_now: Optional[bool] = None
+    # Google's weekly schedule ("periods" / "weekday_text"), filled in by enrichment
+    opening_hours: Optional[Dict[str, Any]] = None
+    # opening_hours parsed into sorted [start, end) minute-of-week ranges
+    open_intervals: Optional[List[List[int]]] = None
 
     vibe_score: Optional[float] = 0.0
 
+
+
+class LatLng:
+    """Slotted coordinates for PlaceRecord."""
+    __slots__ = ("lat", "lng")
+
+    def __init__(self, lat: float, lng: float):
+        self.lat = lat
+        self.lng = lng
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, LatLng) and self.lat == other.lat and self.lng == other.lng
+
+    def __repr__(self) -> str:
+        return f"LatLng({self.lat}, {self.lng})"
+
+
+PLACE_FIELDS = tuple(Place.model_fields)
+
+
+class PlaceRecord:
+    """
+    Internal place representation: same fields as Place, slotted and
+    unvalidated. Services build these from trusted data (Google results
+    already parsed, cached dicts); Pydantic only runs at the API boundary.
+    `types` may be a shared tuple and must not be mutated.
+    """
+    __slots__ = PLACE_FIELDS
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        summary: Optional[str] = None,
+        rating: Optional[float] = None,
+        user_rating_total: Optional[int] = None,
+        address: Optional[str] = None,
+        coordinates: Optional[LatLng] = None,
+        photo_reference: Optional[str] = None,
+        types: Sequence[str] = (),
+        price_level: Optional[int] = None,
+        open_now: Optional[bool] = None,
+        opening_hours: Optional[Dict[str, Any]] = None,
+        open_intervals: Optional[List[List[int]]] = None,
+        vibe_score: Optional[float] = 0.0,
+    ):
+        self.id = id
+        self.name = name
+        self.summary = summary
+        self.rating = rating
+        self.user_rating_total = user_rating_total
+        self.address = address
+        self.coordinates = coordinates
+        self.photo_reference = photo_reference
+        self.types = types
+        self.price_level = price_level
+        self.open_now = open_now
+        self.opening_hours = opening_hours
+        self.open_intervals = open_intervals
+        self.vibe_score = vibe_score
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlaceRecord":
+        """Build from a dict shaped like Place.model_dump() (no validation)."""
+        record = cls.__new__(cls)
+        get = data.get
+        record.id = data["id"]
+        record.name = data["name"]
+        record.summary = get("summary")
+        record.rating = get("rating")
+        record.user_rating_total = get("user_rating_total")
+        record.address = get("address")
+        coords = get("coordinates")
+        record.coordinates = LatLng(coords["lat"], coords["lng"]) if coords else None
+        record.photo_reference = get("photo_reference")
+        record.types = get("types") or ()
+        record.price_level = get("price_level")
+        record.open_now = get("open_now")
+        record.opening_hours = get("opening_hours")
+        record.open_intervals = get("open_intervals")
+        record.vibe_score = get("vibe_score", 0.0)
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The Place.model_dump() shape, for caching."""
+        coords = self.coordinates
+        return {
+            "id": self.id,
+            "name": self.name,
+            "summary": self.summary,
+            "rating": self.rating,
+            "user_rating_total": self.user_rating_total,
+            "address": self.address,
+            "coordinates": {"lat": coords.lat, "lng": coords.lng} if coords else None,
+            "photo_reference": self.photo_reference,
+            "types": list(self.types),
+            "price_level": self.price_level,
+            "open_now": self.open_now,
+            "opening_hours": self.opening_hours,
+            "open_intervals": self.open_intervals,
+            "vibe_score": self.vibe_score,
+        }
+
+    def to_model(self) -> Place:
+        """Convert to the Pydantic model without re-validating."""
+        coords = self.coordinates
+        data = {name: getattr(self, name) for name in PLACE_FIELDS}
+        data["coordinates"] = Coordinates.model_construct(lat=coords.lat, lng=coords.lng) if coords else None
+        data["types"] = list(self.types)
+        return Place.model_construct(**data)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, PlaceRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"PlaceRecord(id={self.id!r}, name={self.name!r})"
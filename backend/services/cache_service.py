@@ -3,97 +3,690 @@ In-memory cache service for MVP.
 Will be replaced with Redis in production.
 """
 
-from typing import Any, Optional, Dict
+from typing import Any, Callable, Optional, Dict, Iterable, Iterator, List, Set, Tuple
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from pathlib import Path
+import asyncio
 import json
+import os
+import pickle
+import threading
+import time
+import zlib
+import orjson
+from backend.core.config import get_settings
 from backend.core.logging import get_logger
+from backend.services.city_bundle import load_bundle
+from backend.services.place_store import PlaceList, PlaceRecordStore
 
 logger = get_logger('Odyssey.cache')
 
+# Snapshot files start with this marker so we never unpickle an unrelated file
+SNAPSHOT_MAGIC = b"ODYSSEY-CACHE-2\n"
+
+# Per-namespace defaults: (ttl_seconds, max_entries, encode_values).
+# The namespace of a key is its first `cache_key()` segment.
+NAMESPACE_DEFAULTS: Dict[str, Tuple[int, Optional[int], bool]] = {
+    "discover": (604800, 20000, True),    # 7 days
+    "place": (604800, 50000, True),       # 7 days
+    "search": (86400, 20000, True),       # 1 day
+    "autocomplete": (3600, 5000, False),  # 1 hour
+    "routes": (86400, 5000, False),       # 1 day
+    "tiles": (300, 20000, False),         # 5 minutes; new places appear on the map soon
+    "photo": (60, 10000, False),          # Failed photo refs only (negative entries)
+}
+
+# Namespaces whose place lists hold references into the shared place store
+SHARED_PLACE_NAMESPACES = {"discover", "search"}
+
+# Key segment holding the city, for tagging entries promoted from the base layer
+CITY_KEY_SEGMENT = {"discover": 1, "search": 2}
+
+# TTLs for negative entries: empty upstream results vs. upstream errors
+NEGATIVE_EMPTY_TTL = 600   # 10 minutes
+NEGATIVE_ERROR_TTL = 60    # 1 minute
+
+
+class NegativeResult:
+    """
+    Cached marker for a lookup that produced nothing upstream.
+
+    `reason` is "empty" for a successful call with no results, otherwise
+    the exception class name. Kept as its own type so an empty list
+    remains a valid cached value.
+    """
+    __slots__ = ("reason",)
+
+    def __init__(self, reason: str = "empty"):
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"NegativeResult({self.reason!r})"
+
+
+# Preset zlib dictionary shared by all encoded values. Strings that repeat
+# across entries (place types, field names, fallback URLs) are registered
+# here once, so each encoded value only references them.
+_shared_dictionary: bytes = b""
+
+
+def set_shared_dictionary(strings: Iterable[str]) -> None:
+    """
+    Register strings that are common across cached values.
+    Put the most frequent strings last; zlib favours the end of the dictionary.
+    Values encoded earlier keep a reference to the dictionary they used.
+    """
+    global _shared_dictionary
+    _shared_dictionary = "".join(strings).encode("utf-8")[-32768:]
+
+
+class EncodedValue:
+    """A JSON + zlib encoded cache value, decoded lazily on read."""
+    __slots__ = ("data", "raw_size", "zdict")
+
+    def __init__(self, data: bytes, raw_size: int, zdict: bytes):
+        self.data = data
+        self.raw_size = raw_size
+        self.zdict = zdict
+
+    @classmethod
+    def encode(cls, value: Any) -> "EncodedValue":
+        raw = orjson.dumps(value)
+        zdict = _shared_dictionary
+        compressor = zlib.compressobj(6, zdict=zdict) if zdict else zlib.compressobj(6)
+        data = compressor.compress(raw) + compressor.flush()
+        return cls(data, len(raw), zdict)
+
+    def decode(self) -> Any:
+        decompressor = zlib.decompressobj(zdict=self.zdict) if self.zdict else zlib.decompressobj()
+        return orjson.loads(decompressor.decompress(self.data) + decompressor.flush())
+
 
 class CacheEntry:
     """A single cache entry with expiration."""
-    def __init__(self, value: Any, ttl_seconds: int):
+    def __init__(self, value: Any, ttl_seconds: int, tags: Iterable[str] = ()):
         self.value = value
         self.expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
-    
+        self.tags: Tuple[str, ...] = tuple(tags)
+        # Pre-rendered response bodies derived from `value`, keyed by variant.
+        # They live on the entry so they are dropped whenever the value is.
+        self.rendered: Optional[Dict[str, bytes]] = None
+        # Other objects derived from `value` (e.g. a columnar PlaceBatch), same lifetime
+        self.derived: Optional[Dict[str, Any]] = None
+
     def is_expired(self) -> bool:
         return datetime.now() > self.expires_at
 
+    @classmethod
+    def restore(cls, value: Any, expires_at: datetime, tags: Iterable[str] = ()) -> "CacheEntry":
+        """Rebuild an entry with its original expiry (used by snapshot restore)."""
+        entry = cls.__new__(cls)
+        entry.value = value
+        entry.expires_at = expires_at
+        entry.tags = tuple(tags)
+        entry.rendered = None
+        entry.derived = None
+        return entry
+
+
+class CacheNamespace:
+    """Bookkeeping for one keyspace: LRU order, limits and counters."""
+    def __init__(self, name: str, ttl: int, max_entries: Optional[int], encode: bool = False):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.encode = encode
+        self.keys: "OrderedDict[str, None]" = OrderedDict()
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.base_hits = 0
+        self.evictions = 0
+        # Free-form counters recorded by callers via InMemoryCache.count()
+        self.counters: Dict[str, int] = {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total > 0 else 0
+        stats = {
+            "entries": len(self.keys),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "base_hits": self.base_hits,
+            "evictions": self.evictions,
+            "hit_rate": f"{hit_rate:.1f}%"
+        }
+        stats.update(self.counters)
+        # Place lists in shared namespaces are counted under "shared_places"
+        if self.encode and (self.encoded_bytes or self.name not in SHARED_PLACE_NAMESPACES):
+            ratio = (self.raw_bytes / self.encoded_bytes) if self.encoded_bytes else 0
+            stats["raw_bytes"] = self.raw_bytes
+            stats["encoded_bytes"] = self.encoded_bytes
+            stats["compression_ratio"] = f"{ratio:.1f}x"
+        return stats
+
 
 class InMemoryCache:
     """
     Simple in-memory cache with TTL support.
-    Thread-safe for basic usage.
+
+    Keys are grouped into namespaces (by their first segment) with their
+    own TTL default, size limit (LRU eviction) and hit/miss counters.
+    Entries can carry tags so related keys can be dropped together.
+    An optional read-only base layer (the city bundle) answers misses.
+    Place lists in SHARED_PLACE_NAMESPACES reference one shared record per
+    place instead of carrying their own copies.
     """
-    
+
     def __init__(self, default_ttl: int = 604800):  # 7 days default
         self._cache: Dict[str, CacheEntry] = {}
+        self._namespaces: Dict[str, CacheNamespace] = {}
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self._base_layer = None
+        self._base_suppressed: Set[str] = set()  # Base keys deleted or invalidated since attach
+        self.places = PlaceRecordStore(EncodedValue)
         self.default_ttl = default_ttl
         self.hits = 0
         self.misses = 0
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get a value from cache if it exists and hasn't expired."""
-        entry = self._cache.get(key)
-        
+
+    def _namespace(self, key: str) -> CacheNamespace:
+        """Get (or lazily create) the namespace a key belongs to."""
+        name = key.split(":", 1)[0]
+        ns = self._namespaces.get(name)
+        if ns is None:
+            with self._lock:
+                ns = self._namespaces.get(name)
+                if ns is None:
+                    ttl, max_entries, encode = NAMESPACE_DEFAULTS.get(name, (self.default_ttl, None, False))
+                    ns = CacheNamespace(name, ttl, max_entries, encode)
+                    self._namespaces[name] = ns
+        return ns
+
+    def _insert(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry and index it. Caller holds the lock."""
+        if key in self._cache:
+            # Keep records the new list still holds, so a refetch merges into
+            # them instead of losing enriched fields
+            keep = entry.value.ids if isinstance(entry.value, PlaceList) else ()
+            self._remove(key, keep)
+
+        ns = self._namespace(key)
+        self._cache[key] = entry
+        ns.keys[key] = None
+        if isinstance(entry.value, EncodedValue):
+            ns.raw_bytes += entry.value.raw_size
+            ns.encoded_bytes += len(entry.value.data)
+        elif isinstance(entry.value, PlaceList):
+            self.places.acquire(key, entry.value)
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        if ns.max_entries is not None:
+            while len(ns.keys) > ns.max_entries:
+                oldest = next(iter(ns.keys))
+                self._remove(oldest)
+                ns.evictions += 1
+
+    def _remove(self, key: str, keep: Iterable[str] = ()) -> bool:
+        """Drop an entry and its index records. Caller holds the lock."""
+        entry = self._cache.pop(key, None)
         if entry is None:
-            self.misses += 1
+            return False
+
+        ns = self._namespace(key)
+        ns.keys.pop(key, None)
+        if isinstance(entry.value, EncodedValue):
+            ns.raw_bytes -= entry.value.raw_size
+            ns.encoded_bytes -= len(entry.value.data)
+        elif isinstance(entry.value, PlaceList):
+            self.places.release(key, entry.value, keep)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+    def _encode_for(self, key: str, value: Any) -> Any:
+        """Convert `value` to its stored form: a shared PlaceList, an EncodedValue or as-is."""
+        ns = self._namespace(key)
+        if isinstance(value, NegativeResult):
+            return value
+        if ns.name in SHARED_PLACE_NAMESPACES:
+            places = PlaceList.from_value(value)
+            if places is not None:
+                return places
+        if not ns.encode:
+            return value
+        try:
+            return EncodedValue.encode(value)
+        except TypeError:
+            # Not JSON-serializable; keep the plain object
+            return value
+
+    def _plain(self, value: Any) -> Any:
+        """The caller-facing form of a stored value."""
+        if isinstance(value, EncodedValue):
+            return value.decode()
+        if isinstance(value, PlaceList):
+            with self._lock:
+                return self.places.resolve(value)
+        return value
+
+    def attach_base_layer(self, layer) -> None:
+        """
+        Serve misses from a read-only layer with `get(key)` and `in`.
+        Base hits are promoted into the live cache so they can carry
+        rendered bodies, obey namespace limits and be invalidated. Keys
+        deleted or invalidated afterwards are no longer served from the
+        layer until a new one is attached.
+        """
+        with self._lock:
+            self._base_layer = layer
+            self._base_suppressed.clear()
+
+    def _base_value(self, key: str) -> Optional[Any]:
+        """The base layer's value for `key`, unless suppressed. Caller holds the lock."""
+        if self._base_layer is None or key in self._base_suppressed:
             return None
-        
-        if entry.is_expired():
-            del self._cache[key]
-            self.misses += 1
-            logger.debug(f"Cache expired: {key}")
+        return self._base_layer.get(key)
+
+    def _base_tags(self, key: str, value: Any) -> List[str]:
+        """The city and place tags places_service gives the same result when it caches it."""
+        parts = key.split(":")
+        segment = CITY_KEY_SEGMENT.get(parts[0])
+        tags = []
+        if segment is not None and len(parts) > segment:
+            tags.append(city_tag(parts[segment]))
+        places = PlaceList.from_value(value)
+        if places is not None:
+            tags.extend(place_tag(place_id) for place_id in places.ids)
+        return tags
+
+    def _get_from_base(self, key: str, ns: CacheNamespace) -> Optional[Any]:
+        """Look a missed key up in the base layer and promote it. Caller holds the lock."""
+        value = self._base_value(key)
+        if value is None:
             return None
-        
-        self.hits += 1
-        logger.debug(f"Cache hit: {key}")
-        return entry.value
-    
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Store a value in cache with optional custom TTL."""
-        ttl = ttl or self.default_ttl
-        self._cache[key] = CacheEntry(value, ttl)
+        tags = self._base_tags(key, value)
+        self._insert(key, CacheEntry(self._encode_for(key, value), ns.ttl, tags))
+        ns.base_hits += 1
+        return value
+
+    def _drop(self, key: str) -> bool:
+        """Remove a key on purpose: the base layer stops serving it too. Caller holds the lock."""
+        if self._base_layer is not None and key in self._base_layer:
+            self._base_suppressed.add(key)
+        return self._remove(key)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value from cache if it exists and hasn't expired."""
+        with self._lock:
+            entry = self._cache.get(key)
+            ns = self._namespace(key)
+
+            if entry is not None and entry.is_expired():
+                self._remove(key)
+                logger.debug(f"Cache expired: {key}")
+                entry = None
+
+            if entry is None:
+                value = self._get_from_base(key, ns)
+                if value is not None:
+                    self.hits += 1
+                    ns.hits += 1
+                    return value
+                self.misses += 1
+                ns.misses += 1
+                return None
+
+            ns.keys.move_to_end(key)
+            self.hits += 1
+            ns.hits += 1
+            value = entry.value
+            if isinstance(value, NegativeResult):
+                ns.negative_hits += 1
+            elif isinstance(value, PlaceList):
+                value = self.places.resolve(value)
+            logger.debug(f"Cache hit: {key}")
+
+        # Decode outside the lock; the encoded bytes are immutable
+        if isinstance(value, EncodedValue):
+            return value.decode()
+        return value
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """
+        Seconds until `key` expires, or None if it is missing or expired.
+        Does not count as a hit or miss.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            remaining = (entry.expires_at - datetime.now()).total_seconds()
+            return remaining if remaining > 0 else None
+
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        Get a live value (or base-layer value) without touching hit/miss
+        counters or LRU order. Useful for probing related keys.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and not entry.is_expired():
+                value = entry.value
+                if isinstance(value, PlaceList):
+                    value = self.places.resolve(value)
+            else:
+                value = self._base_value(key)
+                if value is None:
+                    return None
+        if isinstance(value, EncodedValue):
+            return value.decode()
+        return value
+
+    def count(self, namespace: str, counter: str, amount: int = 1) -> None:
+        """Increment a custom counter reported in a namespace's stats."""
+        with self._lock:
+            ns = self._namespace(f"{namespace}:")
+            ns.counters[counter] = ns.counters.get(counter, 0) + amount
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        """
+        Store a value in cache.
+
+        TTL defaults to the key's namespace TTL. `tags` register the key
+        for bulk removal via `invalidate_tag`.
+        """
+        ttl = ttl or self._namespace(key).ttl
+        value = self._encode_for(key, value)
+        with self._lock:
+            self._insert(key, CacheEntry(value, ttl, tags))
         logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
-    
+
+    def set_negative(
+        self,
+        key: str,
+        reason: str = "empty",
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = ()
+    ) -> None:
+        """
+        Remember that `key` produced no result upstream.
+
+        Empty results default to NEGATIVE_EMPTY_TTL, errors (any other
+        reason, usually the exception class name) to NEGATIVE_ERROR_TTL.
+        """
+        if ttl is None:
+            ttl = NEGATIVE_EMPTY_TTL if reason == "empty" else NEGATIVE_ERROR_TTL
+        self.set(key, NegativeResult(reason), ttl=ttl, tags=tags)
+
+    def get_rendered(self, key: str, variant: str = "") -> Optional[bytes]:
+        """
+        Get a pre-rendered response body attached to a live entry.
+        Returns None (without counting a miss) if there is nothing rendered yet.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry.rendered is None or entry.is_expired():
+                return None
+
+            body = entry.rendered.get(variant)
+            if body is not None:
+                self.hits += 1
+                self._namespace(key).hits += 1
+                logger.debug(f"Rendered cache hit: {key} [{variant}]")
+            return body
+
+    def set_rendered(self, key: str, body: bytes, variant: str = "") -> bool:
+        """
+        Attach a rendered response body to the live entry for `key`.
+        Returns False if the underlying entry is missing or expired.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry.is_expired():
+                return False
+
+            if entry.rendered is None:
+                entry.rendered = {}
+            entry.rendered[variant] = body
+            return True
+
+    def get_derived(self, key: str, name: str, counter: Optional[str] = None) -> Optional[Any]:
+        """
+        Get an object derived from a live entry's value (counted as a hit).
+        Returns None, without counting a miss, if nothing is attached.
+        With `counter`, the lookup is counted as a hit or miss of that
+        namespace instead (e.g. "recommend" for scored variants), so it
+        doesn't inflate the hit rate of the entry's own namespace.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            value = None
+            if entry is not None and entry.derived is not None and not entry.is_expired():
+                value = entry.derived.get(name)
+
+            if counter is not None:
+                stats = self._namespace(f"{counter}:")
+                if value is not None:
+                    stats.hits += 1
+                else:
+                    stats.misses += 1
+            elif value is not None:
+                self.hits += 1
+                self._namespace(key).hits += 1
+            if value is not None:
+                self._namespace(key).keys.move_to_end(key)
+            return value
+
+    def set_derived(self, key: str, name: str, value: Any) -> bool:
+        """
+        Attach an object derived from the live entry's value; it is dropped
+        whenever the value changes. Returns False if the entry is missing or expired.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry.is_expired():
+                return False
+
+            if entry.derived is None:
+                entry.derived = {}
+            entry.derived[name] = value
+            return True
+
     def delete(self, key: str) -> bool:
         """Remove a key from cache. Returns True if key existed."""
-        if key in self._cache:
-            del self._cache[key]
-            return True
-        return False
-    
+        with self._lock:
+            return self._drop(key)
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Remove every entry carrying `tag`. Returns count of removed entries."""
+        with self._lock:
+            keys = list(self._tags.get(tag, ()))
+            for key in keys:
+                self._drop(key)
+
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cache entries tagged '{tag}'")
+        return len(keys)
+
+    def update_tagged(self, tag: str, fn: Callable[[Any], Any]) -> int:
+        """
+        Replace the value of every live entry carrying `tag` with `fn(value)`,
+        keeping its expiry and tags. Rendered bodies are dropped. Negative
+        entries and shared place lists (see `update_place`) are skipped.
+        Returns the number of entries updated.
+        """
+        updated = 0
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                entry = self._cache[key]
+                if entry.is_expired() or isinstance(entry.value, (NegativeResult, PlaceList)):
+                    continue
+                value = entry.value.decode() if isinstance(entry.value, EncodedValue) else entry.value
+                new_value = self._encode_for(key, fn(value))
+                self._insert(key, CacheEntry.restore(new_value, entry.expires_at, entry.tags))
+                updated += 1
+        return updated
+
+    def update_place(self, place_id: str, fields: Dict[str, Any]) -> int:
+        """
+        Merge `fields` into the shared record of a place, updating every
+        place list that references it in one write. Their rendered bodies
+        and derived objects are dropped. Returns the number of entries affected.
+        """
+        with self._lock:
+            keys = self.places.update(place_id, fields)
+            for key in keys:
+                self._cache[key].rendered = None
+                self._cache[key].derived = None
+        return len(keys)
+
     def clear(self) -> None:
         """Clear all cached entries."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._tags.clear()
+            self.places.clear()
+            for ns in self._namespaces.values():
+                ns.keys.clear()
         logger.info("Cache cleared")
-    
+
+    def items(self, namespaces: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Any]]:
+        """Yield live (key, value) pairs, skipping negative entries."""
+        wanted = set(namespaces) if namespaces is not None else None
+        with self._lock:
+            entries = list(self._cache.items())
+        for key, entry in entries:
+            if entry.is_expired() or isinstance(entry.value, NegativeResult):
+                continue
+            if wanted is not None and key.split(":", 1)[0] not in wanted:
+                continue
+            yield key, self._plain(entry.value)
+
     def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
+        """Get cache statistics, overall and per namespace."""
         total = self.hits + self.misses
         hit_rate = (self.hits / total * 100) if total > 0 else 0
+        with self._lock:
+            shared_places = self.places.get_stats()
         return {
             "entries": len(self._cache),
+            "base_layer_entries": len(self._base_layer) if self._base_layer is not None else 0,
+            "base_layer_suppressed": len(self._base_suppressed),
             "hits": self.hits,
             "misses": self.misses,
-            "hit_rate": f"{hit_rate:.1f}%"
+            "hit_rate": f"{hit_rate:.1f}%",
+            "shared_places": shared_places,
+            "namespaces": {
+                name: ns.get_stats() for name, ns in sorted(self._namespaces.items())
+            }
         }
-    
+
     def cleanup_expired(self) -> int:
         """Remove all expired entries. Returns count of removed entries."""
-        expired_keys = [
-            key for key, entry in self._cache.items() 
-            if entry.is_expired()
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-        
+        with self._lock:
+            expired_keys = [
+                key for key, entry in self._cache.items()
+                if entry.is_expired()
+            ]
+            for key in expired_keys:
+                self._remove(key)
+
         if expired_keys:
             logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
-        
+
         return len(expired_keys)
 
+    def save_snapshot(self, path: str) -> int:
+        """
+        Write all live entries to a binary snapshot file.
+
+        Entries are streamed as one pickle record per key behind a magic
+        header, so the file can be restored record by record. The file is
+        written to a temp path and renamed, so a crash never leaves a
+        half-written snapshot behind. Returns the number of entries written.
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+
+        with self._lock:
+            items = list(self._cache.items())
+
+        written = 0
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            for key, entry in items:
+                if entry.is_expired():
+                    continue
+                # Stored decoded so a changed shared dictionary can't break restores
+                value = self._plain(entry.value)
+                record = (key, entry.expires_at.timestamp(), entry.tags, value)
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+                written += 1
+        os.replace(tmp_path, target)
+
+        logger.info(f"Cache snapshot saved: {written} entries -> {target}")
+        return written
+
+    def load_snapshot(self, path: str) -> Dict[str, Any]:
+        """
+        Restore entries from a snapshot written by `save_snapshot`.
+
+        Records are read one at a time, expired ones are skipped, and keys
+        that were already set since startup are left alone (they are newer).
+        Returns a report with loaded/skipped counts and elapsed seconds.
+        """
+        start = time.perf_counter()
+        loaded = 0
+        skipped = 0
+
+        target = Path(path)
+        if target.exists():
+            with open(target, "rb") as f:
+                if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                    logger.warning(f"Ignoring cache snapshot with unknown format: {target}")
+                else:
+                    now = datetime.now()
+                    while True:
+                        try:
+                            key, expires_ts, tags, value = pickle.load(f)
+                        except EOFError:
+                            break
+                        except Exception as e:
+                            logger.error(f"Cache snapshot truncated or corrupt: {e}")
+                            break
+
+                        expires_at = datetime.fromtimestamp(expires_ts)
+                        if expires_at <= now or key in self._cache:
+                            skipped += 1
+                            continue
+                        entry = CacheEntry.restore(self._encode_for(key, value), expires_at, tags)
+                        with self._lock:
+                            if key in self._cache:
+                                skipped += 1
+                                continue
+                            self._insert(key, entry)
+                        loaded += 1
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Cache snapshot restored: {loaded} entries loaded, "
+            f"{skipped} skipped in {elapsed:.3f}s"
+        )
+        return {"loaded": loaded, "skipped": skipped, "seconds": round(elapsed, 3)}
+
 
 # Singleton cache instance
 _cache: Optional[InMemoryCache] = None
@@ -104,9 +697,49 @@ def get_cache() -> InMemoryCache:
     global _cache
     if _cache is None:
         _cache = InMemoryCache()
+        # Mapping the bundle is cheap, so do it here rather than in the
+        # lifespan; serverless entry points may never run the lifespan.
+        bundle = load_bundle(get_settings().CITY_BUNDLE_PATH)
+        if bundle is not None:
+            _cache.attach_base_layer(bundle)
     return _cache
 
 
+async def snapshot_periodically(cache: InMemoryCache, path: str, interval_seconds: int) -> None:
+    """Background task: snapshot the cache every `interval_seconds` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(cache.save_snapshot, path)
+        except Exception as e:
+            logger.error(f"Periodic cache snapshot failed: {e}")
+
+
+async def cleanup_periodically(cache: InMemoryCache, interval_seconds: int) -> None:
+    """Background task: drop expired entries (and the shared records only they held) until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(cache.cleanup_expired)
+        except Exception as e:
+            logger.error(f"Periodic cache cleanup failed: {e}")
+
+
 def cache_key(*parts: str) -> str:
     """Generate a cache key from multiple parts."""
     return ":".join(str(p).lower().replace(" ", "_") for p in parts)
+
+
+def cache_tag(kind: str, value: str) -> str:
+    """Generate an invalidation tag, e.g. cache_tag("city", "San Francisco, CA")."""
+    return cache_key(kind, value)
+
+
+def city_tag(city: str) -> str:
+    """Invalidation tag shared by every cached result for a city."""
+    return cache_tag("city", city)
+
+
+def place_tag(place_id: str) -> str:
+    """Invalidation tag shared by every cached result containing a place."""
+    return cache_tag("place_id", place_id)
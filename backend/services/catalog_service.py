@@ -0,0 +1,181 @@
+"""
+Place Catalog Service - Persistent store of every place fetched from Google.
+
+Records keep Google's field names and are grouped the way Google bills
+them (basic / atmosphere / contact). Each group has its own fetched-at
+timestamp, so a read-through only requests the groups that are stale.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session
+from backend.core.config import get_settings
+from backend.core.database import SessionLocal
+from backend.core.logging import get_logger
+from backend.models.db import CatalogPlace
+
+logger = get_logger('Odyssey.catalog')
+
+# Google Places fields requested for each group
+FIELD_GROUPS: Dict[str, List[str]] = {
+    "basic": ["name", "formatted_address", "geometry", "types", "photos"],
+    "atmosphere": ["rating", "user_ratings_total", "price_level"],
+    "contact": ["opening_hours", "website", "formatted_phone_number"],
+}
+
+# Groups present in text-search results (discover/search)
+SEARCH_GROUPS = ("basic", "atmosphere")
+
+
+def _apply_group(record: CatalogPlace, group: str, data: Dict[str, Any], now: datetime) -> None:
+    """Copy one field group from a Google result onto a record."""
+    if group == "basic":
+        location = data.get("geometry", {}).get("location", {})
+        photos = data.get("photos") or []
+        record.name = data.get("name", "")
+        record.address = data.get("formatted_address") or data.get("vicinity")
+        record.lat = location.get("lat")
+        record.lng = location.get("lng")
+        record.types = data.get("types", [])
+        record.photo_reference = photos[0].get("photo_reference") if photos else None
+        record.basic_fetched_at = now
+    elif group == "atmosphere":
+        record.rating = data.get("rating")
+        record.user_ratings_total = data.get("user_ratings_total")
+        record.price_level = data.get("price_level")
+        record.atmosphere_fetched_at = now
+    elif group == "contact":
+        hours = data.get("opening_hours")
+        # open_now is only true at fetch time; keep the weekly schedule
+        record.opening_hours = {k: v for k, v in hours.items() if k != "open_now"} if hours else None
+        record.website = data.get("website")
+        record.phone = data.get("formatted_phone_number")
+        record.contact_fetched_at = now
+
+
+def record_to_result(record: CatalogPlace) -> Dict[str, Any]:
+    """Rebuild a Google-shaped result dict from the groups a record has."""
+    data: Dict[str, Any] = {"place_id": record.place_id}
+    if record.basic_fetched_at:
+        data["name"] = record.name
+        data["formatted_address"] = record.address
+        if record.lat is not None and record.lng is not None:
+            data["geometry"] = {"location": {"lat": record.lat, "lng": record.lng}}
+        data["types"] = record.types or []
+        if record.photo_reference:
+            data["photos"] = [{"photo_reference": record.photo_reference}]
+    if record.atmosphere_fetched_at:
+        data["rating"] = record.rating
+        data["user_ratings_total"] = record.user_ratings_total
+        data["price_level"] = record.price_level
+    if record.contact_fetched_at:
+        data["opening_hours"] = record.opening_hours
+        data["website"] = record.website
+        data["formatted_phone_number"] = record.phone
+    return {k: v for k, v in data.items() if v is not None}
+
+
+class PlaceCatalog:
+    """Read-through/write-through access to the `places` table."""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        settings = get_settings()
+        self.max_age = {
+            "basic": timedelta(days=settings.CATALOG_BASIC_MAX_AGE_DAYS),
+            "atmosphere": timedelta(days=settings.CATALOG_ATMOSPHERE_MAX_AGE_DAYS),
+            "contact": timedelta(days=settings.CATALOG_CONTACT_MAX_AGE_DAYS),
+        }
+
+    def upsert_results(
+        self,
+        results: Iterable[Dict[str, Any]],
+        groups: Iterable[str] = SEARCH_GROUPS,
+        city: Optional[str] = None
+    ) -> int:
+        """
+        Bulk upsert Google results, refreshing only the given field groups.
+        Returns the number of rows written. Never raises; catalog writes
+        must not fail the request that produced the data.
+        """
+        by_id = {r["place_id"]: r for r in results if r.get("place_id")}
+        if not by_id:
+            return 0
+
+        groups = tuple(groups)
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            existing = {
+                record.place_id: record
+                for record in db.query(CatalogPlace).filter(CatalogPlace.place_id.in_(list(by_id)))
+            }
+            for place_id, data in by_id.items():
+                record = existing.get(place_id)
+                if record is None:
+                    record = CatalogPlace(place_id=place_id, city=city)
+                    db.add(record)
+                for group in groups:
+                    _apply_group(record, group, data, now)
+            db.commit()
+            return len(by_id)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to upsert {len(by_id)} places into catalog: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def get(self, place_id: str) -> Optional[CatalogPlace]:
+        """Load one catalog record (detached), or None."""
+        db = self.session_factory()
+        try:
+            record = db.get(CatalogPlace, place_id)
+            if record is not None:
+                db.expunge(record)
+            return record
+        except Exception as e:
+            logger.error(f"Failed to read place {place_id} from catalog: {e}")
+            return None
+        finally:
+            db.close()
+
+    def stale_groups(self, record: Optional[CatalogPlace], now: Optional[datetime] = None) -> List[str]:
+        """Field groups that are missing or older than their max age."""
+        if record is None:
+            return list(FIELD_GROUPS)
+        now = now or datetime.utcnow()
+        stale = []
+        for group in FIELD_GROUPS:
+            fetched_at = getattr(record, f"{group}_fetched_at")
+            if fetched_at is None or now - fetched_at > self.max_age[group]:
+                stale.append(group)
+        return stale
+
+    def places_in_city(self, city: str) -> List[Dict[str, Any]]:
+        """Google-shaped results for every catalog place first seen in `city`."""
+        db = self.session_factory()
+        try:
+            return [record_to_result(r) for r in db.query(CatalogPlace).filter(CatalogPlace.city == city)]
+        finally:
+            db.close()
+
+    def all_results(self) -> List[Dict[str, Any]]:
+        """Google-shaped results for every catalog place."""
+        db = self.session_factory()
+        try:
+            return [record_to_result(r) for r in db.query(CatalogPlace)]
+        finally:
+            db.close()
+
+
+# Singleton instance
+_catalog: Optional[PlaceCatalog] = None
+
+
+def get_place_catalog() -> PlaceCatalog:
+    """Get the singleton PlaceCatalog instance."""
+    global _catalog
+    if _catalog is None:
+        _catalog = PlaceCatalog()
+    return _catalog
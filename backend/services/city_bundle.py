@@ -0,0 +1,153 @@
+"""
+City Bundle - Offline-built, memory-mapped discover/autocomplete data.
+
+The bundle is one file: a magic header, a JSON index of cache keys to
+(offset, length), then zlib-compressed JSON values. It is mapped read-only
+and served as a base layer beneath the live cache, so cold instances answer
+common discover calls without Google.
+
+Build it with:
+    python -m backend.services.city_bundle --output backend/data/city_bundle.bin
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+import orjson
+from backend.core.logging import get_logger
+
+logger = get_logger('Odyssey.bundle')
+
+BUNDLE_MAGIC = b"ODYSSEY-BUNDLE-1\n"
+DEFAULT_CITIES_FILE = "frontend/public/data/california-cities.json"
+
+
+def write_bundle(path: str, entries: Iterable[Tuple[str, Any]]) -> int:
+    """Write (cache_key, value) pairs to a bundle file. Returns entry count."""
+    index: Dict[str, Tuple[int, int]] = {}
+    blobs = []
+    offset = 0
+    for key, value in entries:
+        blob = zlib.compress(orjson.dumps(value), 9)
+        index[key] = (offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+
+    index_bytes = orjson.dumps(index)
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(struct.pack("<I", len(index_bytes)))
+        f.write(index_bytes)
+        for blob in blobs:
+            f.write(blob)
+    return len(index)
+
+
+class CityBundle:
+    """
+    Read-only view of a bundle file.
+    Only the index is parsed up front; values are decoded on lookup
+    straight from the memory map.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            self.close()
+            raise ValueError(f"Not a city bundle: {path}")
+
+        header_end = len(BUNDLE_MAGIC) + 4
+        (index_len,) = struct.unpack("<I", self._mmap[len(BUNDLE_MAGIC):header_end])
+        self._index: Dict[str, list] = orjson.loads(self._mmap[header_end:header_end + index_len])
+        self._data_start = header_end + index_len
+
+    def get(self, key: str) -> Optional[Any]:
+        """Decode the value for `key`, or None if the bundle doesn't have it."""
+        location = self._index.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        start = self._data_start + offset
+        return orjson.loads(zlib.decompress(self._mmap[start:start + length]))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+
+def load_bundle(path: str) -> Optional[CityBundle]:
+    """Open a bundle if the file exists; log and return None otherwise."""
+    if not path or not Path(path).exists():
+        return None
+    start = time.perf_counter()
+    try:
+        bundle = CityBundle(path)
+    except Exception as e:
+        logger.error(f"Failed to open city bundle {path}: {e}")
+        return None
+    logger.info(
+        f"City bundle mapped: {len(bundle)} entries from {path} "
+        f"in {time.perf_counter() - start:.3f}s"
+    )
+    return bundle
+
+
+def build_city_bundle(output: str, cities_file: str = DEFAULT_CITIES_FILE) -> int:
+    """
+    Precompute discover results for every listed city and category, plus
+    autocomplete results for the prefixes of each city name that the local
+    city index can't answer, and write them to `output`. Calls Google; run
+    offline. Returns entry count.
+    """
+    # Imported here: cache_service loads this module, so top-level imports would be circular
+    from backend.services.cache_service import InMemoryCache
+    from backend.services.places_service import PlacesService, PLACE_TYPES, normalize_city
+
+    with open(cities_file, encoding="utf-8") as f:
+        cities = [c["name"] for c in json.load(f)["cities"]]
+
+    service = PlacesService()
+    service.cache = InMemoryCache()
+
+    for name in cities:
+        city = normalize_city(name)
+        for category in PLACE_TYPES:
+            service.discover_places(city, [category])
+        lowered = name.lower()
+        for i in range(1, len(lowered) + 1):
+            service.autocomplete_cities(lowered[:i])
+        logger.info(f"Bundled {city}")
+
+    entries = list(service.cache.items(namespaces=("discover", "autocomplete")))
+    count = write_bundle(output, entries)
+    logger.info(f"Wrote {count} bundle entries to {output}")
+    return count
+
+
+if __name__ == "__main__":
+    from backend.core.config import get_settings
+    from backend.core.logging import configure_logging
+
+    parser = argparse.ArgumentParser(description="Build the offline city bundle.")
+    parser.add_argument("--output", default=get_settings().CITY_BUNDLE_PATH)
+    parser.add_argument("--cities", default=DEFAULT_CITIES_FILE)
+    args = parser.parse_args()
+
+    configure_logging()
+    build_city_bundle(args.output, args.cities)
@@ -0,0 +1,228 @@
+"""
+City Index - In-process autocomplete for California cities.
+
+Names are normalized and stored in a sorted array; a prefix query is a
+binary search for the matching range. Every word start is indexed, so
+"tahoe" finds "South Lake Tahoe". Matches rank featured destinations
+first, then by population.
+
+The bundled list doesn't cover every incorporated place, so only a
+prefix with a full page of exact matches is resolved locally. Fewer
+matches may be missing cities ("la" has more than the bundled La
+cities), so the caller merges them with Google's answer. A prefix with
+no exact match is never "corrected": "oja" must reach Google to find
+Ojai, not Oakland. Typo-tolerant matches (one edit) are offered
+separately through suggest(), for the caller to add last.
+
+Data: backend/data/california_places.csv (name,population; approximate
+2020 census figures) plus the featured destinations listed in
+frontend/public/data/california-cities.json.
+"""
+
+import csv
+import json
+import re
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from backend.core.logging import get_logger
+
+logger = get_logger('Odyssey.city_index')
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PLACES_FILE = REPO_ROOT / "backend" / "data" / "california_places.csv"
+FEATURED_FILE = REPO_ROOT / "frontend" / "public" / "data" / "california-cities.json"
+
+# Typo tolerance only kicks in once the prefix is this long
+MIN_FUZZY_LENGTH = 3
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^a-z0-9]+", " ", text.lower())
+    return text.strip()
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """
+    True if `a` and `b` differ by at most one insert, delete, substitution
+    or swap of adjacent characters.
+    """
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = j = edits = 0
+    while i < len(a) and j < len(b):
+        if a[i] != b[j]:
+            edits += 1
+            if edits > 1:
+                return False
+            if len(a) == len(b):
+                if a[i + 1:i + 2] == b[j:j + 1] and a[i:i + 1] == b[j + 1:j + 2]:
+                    # Adjacent swap ("sna" vs "san") counts as one edit
+                    i += 1
+                    j += 1
+                i += 1
+            j += 1
+        else:
+            i += 1
+            j += 1
+    return edits + (len(b) - j) <= 1
+
+
+class CityIndex:
+    """Sorted-array prefix index over city names."""
+
+    def __init__(self, cities: Iterable[Tuple[str, int, bool]]):
+        """`cities` yields (name, population, featured) tuples."""
+        # Merge duplicates (a featured city is usually also in the census list)
+        merged: Dict[str, Tuple[str, int, bool]] = {}
+        for name, population, featured in cities:
+            norm = normalize_name(name)
+            if not norm:
+                continue
+            if norm in merged:
+                _, known_population, known_featured = merged[norm]
+                population = max(population, known_population)
+                featured = featured or known_featured
+            merged[norm] = (name, population, featured)
+
+        self._cities: List[Tuple[str, int, bool]] = []
+        keys: List[Tuple[str, int]] = []
+        for norm, city in merged.items():
+            city_id = len(self._cities)
+            self._cities.append(city)
+
+            # Index the full name and every later word start
+            words = norm.split(" ")
+            for i in range(len(words)):
+                keys.append((" ".join(words[i:]), city_id))
+
+        keys.sort()
+        self._keys = [k for k, _ in keys]
+        self._ids = [city_id for _, city_id in keys]
+        self._prefix_cache: Dict[int, Dict[str, List[int]]] = {}
+        self.local_hits = 0
+        self.fallbacks = 0
+
+    def __len__(self) -> int:
+        return len(self._cities)
+
+    def _exact(self, prefix: str) -> List[int]:
+        start = bisect_left(self._keys, prefix)
+        ids = []
+        for i in range(start, len(self._keys)):
+            if not self._keys[i].startswith(prefix):
+                break
+            ids.append(self._ids[i])
+        return ids
+
+    def _prefixes_of_length(self, length: int) -> Dict[str, List[int]]:
+        """Distinct key prefixes of one length, built lazily and memoized."""
+        table = self._prefix_cache.get(length)
+        if table is None:
+            table = {}
+            for key, city_id in zip(self._keys, self._ids):
+                if len(key) >= length:
+                    table.setdefault(key[:length], []).append(city_id)
+            self._prefix_cache[length] = table
+        return table
+
+    def _fuzzy(self, prefix: str) -> List[int]:
+        ids: List[int] = []
+        for length in (len(prefix) - 1, len(prefix), len(prefix) + 1):
+            for candidate, city_ids in self._prefixes_of_length(length).items():
+                if _within_one_edit(prefix, candidate):
+                    ids.extend(city_ids)
+        return ids
+
+    def search(self, query: str, max_results: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        Autocomplete a city prefix. Returns exact prefix matches in the
+        same shape as Google autocomplete, or None if there are none. Fewer
+        than `max_results` matches is a partial answer (see module docstring)
+        and is counted as a fallback.
+        """
+        prefix = normalize_name(query)
+        if not prefix:
+            return None
+
+        ids = self._exact(prefix)
+        if not ids:
+            self.fallbacks += 1
+            return None
+
+        results = self._ranked(ids, max_results)
+        if len(results) < max_results:
+            self.fallbacks += 1
+        else:
+            self.local_hits += 1
+        return results
+
+    def suggest(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Typo-tolerant matches (one edit) for a prefix search() couldn't
+        resolve. These are guesses, so callers list them after Google's results.
+        """
+        prefix = normalize_name(query)
+        if len(prefix) < MIN_FUZZY_LENGTH:
+            return []
+        return self._ranked(self._fuzzy(prefix), max_results)
+
+    def _ranked(self, ids: List[int], max_results: int) -> List[Dict[str, Any]]:
+        ranked = sorted(set(ids), key=lambda i: (self._cities[i][2], self._cities[i][1]), reverse=True)
+        return [self._to_result(i) for i in ranked[:max_results]]
+
+    def _to_result(self, city_id: int) -> Dict[str, Any]:
+        name = self._cities[city_id][0]
+        return {
+            "name": name,
+            "place_id": f"local:{normalize_name(name).replace(' ', '-')}",
+            "description": "CA, USA",
+            "full_description": f"{name}, CA, USA",
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.local_hits + self.fallbacks
+        rate = (self.local_hits / total * 100) if total > 0 else 0
+        return {
+            "cities": len(self._cities),
+            "local_hits": self.local_hits,
+            "google_fallbacks": self.fallbacks,
+            "local_rate": f"{rate:.1f}%"
+        }
+
+
+def load_city_index(
+    places_file: Path = PLACES_FILE,
+    featured_file: Path = FEATURED_FILE
+) -> CityIndex:
+    """Build the index from the bundled data files (missing files are skipped)."""
+    cities: List[Tuple[str, int, bool]] = []
+
+    if featured_file.exists():
+        with open(featured_file, encoding="utf-8") as f:
+            cities.extend((c["name"], 0, True) for c in json.load(f)["cities"])
+
+    if places_file.exists():
+        with open(places_file, encoding="utf-8", newline="") as f:
+            cities.extend((row["name"], int(row["population"]), False) for row in csv.DictReader(f))
+
+    index = CityIndex(cities)
+    logger.info(f"City index loaded with {len(index)} cities")
+    return index
+
+
+# Singleton instance
+_index: Optional[CityIndex] = None
+
+
+def get_city_index() -> CityIndex:
+    """Get the singleton CityIndex instance."""
+    global _index
+    if _index is None:
+        _index = load_city_index()
+    return _index
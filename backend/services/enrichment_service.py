@@ -0,0 +1,129 @@
+"""
+Detail Enrichment Service - Fills in price level and opening hours in the background.
+
+Discover and search results don't include a place's weekly opening hours
+(and sometimes not its price level). Instead of fetching details inline,
+every fetched place is queued here and a background task fetches details
+at a fixed rate, most popular places first, merging the fields into the
+cached results that contain the place.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+from backend.models.place import PlaceRecord
+from backend.services.quota_service import background_priority, UpstreamUnavailable
+
+logger = get_logger('Odyssey.enrichment')
+
+
+class DetailEnricher:
+    """
+    Deduplicated priority queue of place_ids awaiting detail enrichment.
+    Priority is popularity (review count); ties keep arrival order.
+    """
+
+    def __init__(self, max_queue: Optional[int] = None):
+        self.settings = get_settings()
+        self.max_queue = max_queue or self.settings.ENRICH_MAX_QUEUE
+        self._heap: List[Tuple[int, int, str]] = []  # (-popularity, seq, place_id)
+        self._queued: Set[str] = set()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.enriched = 0
+        self.google_calls = 0
+        self.failures = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def enqueue(self, places: Iterable[PlaceRecord]) -> int:
+        """Queue places for enrichment. Returns how many were newly queued."""
+        added = 0
+        with self._lock:
+            for place in places:
+                if not place.id or place.id in self._queued:
+                    continue
+                if len(self._heap) >= self.max_queue:
+                    self.dropped += 1
+                    continue
+                popularity = place.user_rating_total or 0
+                heapq.heappush(self._heap, (-popularity, next(self._seq), place.id))
+                self._queued.add(place.id)
+                added += 1
+        return added
+
+    def pop_batch(self, size: int) -> List[str]:
+        """Take up to `size` of the most popular queued place_ids."""
+        with self._lock:
+            batch = []
+            while self._heap and len(batch) < size:
+                _, _, place_id = heapq.heappop(self._heap)
+                self._queued.discard(place_id)
+                batch.append(place_id)
+            return batch
+
+    def process_batch(self, service: Any, size: Optional[int] = None) -> int:
+        """Enrich one batch through `service.enrich_place`. Returns Google calls made."""
+        calls = 0
+        batch = self.pop_batch(size or self.settings.ENRICH_BATCH_SIZE)
+        with background_priority():
+            for i, place_id in enumerate(batch):
+                try:
+                    if service.enrich_place(place_id):
+                        calls += 1
+                    self.enriched += 1
+                except UpstreamUnavailable:
+                    # Out of background budget: put the rest back and try next interval
+                    self._requeue(batch[i:])
+                    break
+                except Exception as e:
+                    self.failures += 1
+                    logger.error(f"Failed to enrich {place_id}: {e}")
+        self.google_calls += calls
+        return calls
+
+    def _requeue(self, place_ids: List[str]) -> None:
+        """Return place_ids to the front of the queue."""
+        with self._lock:
+            for place_id in place_ids:
+                if place_id not in self._queued:
+                    heapq.heappush(self._heap, (-(2 ** 62), next(self._seq), place_id))
+                    self._queued.add(place_id)
+
+    async def run_periodically(self, get_service: Callable[[], Any]) -> None:
+        """Background task: process one batch every interval."""
+        while True:
+            await asyncio.sleep(self.settings.ENRICH_INTERVAL_SECONDS)
+            if not self._heap:
+                continue
+            try:
+                await asyncio.to_thread(self.process_batch, get_service())
+            except Exception as e:
+                logger.error(f"Enrichment batch failed: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._heap),
+            "enriched": self.enriched,
+            "google_calls": self.google_calls,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
+
+
+# Singleton instance
+_enricher: Optional[DetailEnricher] = None
+
+
+def get_detail_enricher() -> DetailEnricher:
+    """Get the singleton DetailEnricher instance."""
+    global _enricher
+    if _enricher is None:
+        _enricher = DetailEnricher()
+    return _enricher
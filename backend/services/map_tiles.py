@@ -0,0 +1,89 @@
+"""
+Map Tiles - Web-Mercator tile math and per-tile marker clustering.
+
+A viewport is split into the standard z/x/y slippy-map tiles. Each tile is
+divided into a CLUSTER_GRID x CLUSTER_GRID grid; a grid cell holding one
+place returns that place, a cell holding several returns one cluster
+(centroid + count). A tile therefore never carries more than
+CLUSTER_GRID**2 markers, however dense the city.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+from backend.models.place import PlaceRecord
+
+CLUSTER_GRID = 8
+# At or past this zoom every place is returned individually
+MAX_CLUSTER_ZOOM = 17
+MAX_ZOOM = 20
+MAX_LAT = 85.05112878
+
+
+def _tile_fraction(lat: float, lng: float, zoom: int) -> Tuple[float, float]:
+    """Fractional tile coordinates of a point."""
+    n = 2 ** zoom
+    lat = max(min(lat, MAX_LAT), -MAX_LAT)
+    x = (lng + 180.0) / 360.0 * n
+    lat_rad = math.radians(lat)
+    y = (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n
+    return x, y
+
+
+def tile_for(lat: float, lng: float, zoom: int) -> Tuple[int, int]:
+    """The (x, y) tile containing a point."""
+    n = 2 ** zoom
+    x, y = _tile_fraction(lat, lng, zoom)
+    return min(int(x), n - 1), min(int(y), n - 1)
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(south, west, north, east) of a tile."""
+    n = 2 ** zoom
+    west = x / n * 360.0 - 180.0
+    east = (x + 1) / n * 360.0 - 180.0
+    north = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    south = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return south, west, north, east
+
+
+def tiles_in_viewport(
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    zoom: int
+) -> List[Tuple[int, int]]:
+    """Every tile overlapping a bounding box."""
+    min_x, min_y = tile_for(north, west, zoom)
+    max_x, max_y = tile_for(south, east, zoom)
+    return [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+
+def cluster_tile(places: Iterable[PlaceRecord], zoom: int, x: int, y: int) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group a tile's places into grid cells.
+    Returns {"clusters": [{lat, lng, count}], "places": [place dicts]}.
+    """
+    cells: Dict[Tuple[int, int], List[PlaceRecord]] = {}
+    for place in places:
+        fx, fy = _tile_fraction(place.coordinates.lat, place.coordinates.lng, zoom)
+        if not (x <= fx < x + 1 and y <= fy < y + 1):
+            continue  # On a shared edge; the neighbouring tile owns it
+        if zoom >= MAX_CLUSTER_ZOOM:
+            key = (id(place), 0)
+        else:
+            key = (int((fx - x) * CLUSTER_GRID), int((fy - y) * CLUSTER_GRID))
+        cells.setdefault(key, []).append(place)
+
+    clusters = []
+    singles = []
+    for members in cells.values():
+        if len(members) == 1:
+            singles.append(members[0].to_dict())
+            continue
+        clusters.append({
+            "lat": sum(p.coordinates.lat for p in members) / len(members),
+            "lng": sum(p.coordinates.lng for p in members) / len(members),
+            "count": len(members),
+        })
+    return {"clusters": clusters, "places": singles}
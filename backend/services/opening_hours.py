@@ -0,0 +1,120 @@
+"""
+Opening Hours - Weekly interval representation and vectorized "open at T" checks.
+
+Google's opening_hours.periods are parsed once into sorted, merged
+[start, end) minute-of-week ranges (Sunday 00:00 = 0, matching Google's
+day numbering). OpenHoursIndex flattens the ranges of a whole candidate
+list into NumPy arrays so one comparison answers "open at T" for every
+place at once.
+
+Times are local to the place; every city we serve is in California, so
+aware datetimes are converted to Pacific time and naive ones are taken
+as already local.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+import numpy as np
+from backend.models.place import PlaceRecord
+
+PLACES_TIMEZONE = ZoneInfo("America/Los_Angeles")
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def _minute(point: Dict[str, Any]) -> int:
+    """Minute of week for a Google {"day": 0-6, "time": "HHMM"} point."""
+    hhmm = point.get("time", "0000")
+    return point["day"] * MINUTES_PER_DAY + int(hhmm[:2]) * 60 + int(hhmm[2:])
+
+
+def parse_periods(periods: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Convert Google periods into sorted, non-overlapping [start, end)
+    minute-of-week ranges. A period without a close is open around the
+    clock; ranges that cross Saturday midnight are split in two.
+    """
+    ranges = []
+    for period in periods:
+        if "open" not in period:
+            continue
+        if "close" not in period:
+            return [[0, MINUTES_PER_WEEK]]
+        start, end = _minute(period["open"]), _minute(period["close"])
+        if end > start:
+            ranges.append([start, end])
+        else:
+            ranges.append([start, MINUTES_PER_WEEK])
+            if end > 0:
+                ranges.append([0, end])
+
+    ranges.sort()
+    merged: List[List[int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def minute_of_week(when: datetime) -> int:
+    """Minute of week (Sunday 00:00 = 0) for a local or aware datetime."""
+    if when.tzinfo is not None:
+        when = when.astimezone(PLACES_TIMEZONE)
+    day = (when.weekday() + 1) % 7  # Python weeks start on Monday, Google's on Sunday
+    return day * MINUTES_PER_DAY + when.hour * 60 + when.minute
+
+
+def local_now() -> datetime:
+    return datetime.now(PLACES_TIMEZONE)
+
+
+class OpenHoursIndex:
+    """Open-interval arrays for a list of places, queried as a whole."""
+
+    def __init__(self, places: List[PlaceRecord]):
+        starts: List[int] = []
+        ends: List[int] = []
+        owners: List[int] = []
+        self.known = np.zeros(len(places), dtype=bool)
+        for i, place in enumerate(places):
+            if place.open_intervals is None:
+                continue
+            self.known[i] = True
+            for start, end in place.open_intervals:
+                starts.append(start)
+                ends.append(end)
+                owners.append(i)
+        self._starts = np.asarray(starts, dtype=np.int32)
+        self._ends = np.asarray(ends, dtype=np.int32)
+        self._owners = np.asarray(owners, dtype=np.intp)
+
+    def open_mask(self, when: datetime) -> np.ndarray:
+        """Boolean mask of places open at `when` (False where hours are unknown)."""
+        minute = minute_of_week(when)
+        hits = (self._starts <= minute) & (minute < self._ends)
+        mask = np.zeros(len(self.known), dtype=bool)
+        mask[self._owners[hits]] = True
+        return mask
+
+
+def filter_open(
+    places: List[PlaceRecord],
+    when: Optional[datetime] = None,
+    fallback_to_flag: bool = False
+) -> List[PlaceRecord]:
+    """
+    Keep places open at `when` (default: now). Places without a weekly
+    schedule are dropped, unless `fallback_to_flag` is set, in which case
+    their fetch-time `open_now` flag decides.
+    """
+    if not places:
+        return []
+    index = OpenHoursIndex(places)
+    keep = index.open_mask(when or local_now())
+    if fallback_to_flag:
+        flags = np.fromiter((bool(p.open_now) for p in places), dtype=bool, count=len(places))
+        keep = np.where(index.known, keep, flags)
+    return [p for p, k in zip(places, keep) if k]
@@ -0,0 +1,222 @@
+"""
+Photo Service - Proxies place photos through a size-bounded disk cache.
+
+Each photo is fetched from Google once, at the largest served width, and
+smaller variants are resized locally with Pillow (if it is missing, a
+warning is logged and each variant is fetched at its own width). Files
+are evicted least recently used once the cache exceeds
+PHOTO_CACHE_MAX_BYTES. Browsers get strong ETags and immutable
+Cache-Control, so repeat views cost nothing.
+Refs that fail to fetch are remembered briefly as negative cache entries,
+so a bad or made-up ref doesn't reach Google on every request.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+import httpx
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+from backend.services.places_service import (
+    get_places_service,
+    DEFAULT_FALLBACK_IMAGE,
+    FALLBACK_IMAGES,
+    FALLBACK_PHOTO_PREFIX,
+)
+from backend.services.cache_service import get_cache, cache_key, NegativeResult
+from backend.services.quota_service import UpstreamUnavailable
+from backend.services.upstream_service import get_upstream_caller
+
+logger = get_logger('Odyssey.photos')
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is in requirements; without it every width is a separate Google fetch
+    Image = None
+    logger.warning("Pillow is not installed; photo variants will be fetched from Google one width at a time")
+
+PHOTO_WIDTHS = (200, 400, 800)
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class PhotoUnavailable(Exception):
+    """A photo ref that recently failed to fetch."""
+
+    def __init__(self, ref: str, reason: str):
+        super().__init__(f"Photo {ref[:16]}... unavailable ({reason})")
+        self.reason = reason
+
+
+def snap_width(width: int) -> int:
+    """Round a requested width up to a served variant."""
+    for candidate in PHOTO_WIDTHS:
+        if width <= candidate:
+            return candidate
+    return PHOTO_WIDTHS[-1]
+
+
+def content_type(data: bytes) -> str:
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+
+def etag_for(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+class PhotoDiskCache:
+    """Directory of photo variants with LRU eviction by total size."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.total_bytes = sum(f.stat().st_size for f in self.directory.glob("*/*") if f.is_file())
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, ref: str, width: int) -> Path:
+        digest = hashlib.sha256(ref.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}-w{width}"
+
+    def get(self, ref: str, width: int) -> Optional[bytes]:
+        path = self._path(ref, width)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        os.utime(path)  # Mark as recently used
+        self.hits += 1
+        return data
+
+    def put(self, ref: str, width: int, data: bytes) -> None:
+        path = self._path(ref, width)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self.total_bytes += len(data)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used files until under 90% of the limit. Caller holds the lock."""
+        files = sorted(
+            (f for f in self.directory.glob("*/*") if f.is_file() and f.suffix != ".tmp"),
+            key=lambda f: f.stat().st_mtime
+        )
+        target = self.max_bytes * 0.9
+        for f in files:
+            if self.total_bytes <= target:
+                break
+            size = f.stat().st_size
+            f.unlink(missing_ok=True)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class PhotoService:
+    """Serves Google and fallback photos from the disk cache."""
+
+    def __init__(self, cache: PhotoDiskCache):
+        self.cache = cache
+        self.negative_cache = get_cache()
+        self.upstream_fetches = 0
+        # Striped locks; reentrant because a variant may build from the largest one
+        self._locks = [threading.RLock() for _ in range(64)]
+
+    def get_photo(self, ref: str, width: int) -> bytes:
+        """Bytes of the photo variant for `ref` at a served width."""
+        width = snap_width(width)
+        data = self.cache.get(ref, width)
+        if data is not None:
+            return data
+
+        failure_k = cache_key("photo", ref)
+        # One fetch per variant even when many cards request it at once
+        with self._locks[hash((ref, width)) % len(self._locks)]:
+            data = self.cache.get(ref, width)
+            if data is None:
+                failed = self.negative_cache.get(failure_k)
+                if isinstance(failed, NegativeResult):
+                    raise PhotoUnavailable(ref, failed.reason)
+                try:
+                    data = self._build_variant(ref, width)
+                except (UpstreamUnavailable, PhotoUnavailable):
+                    raise  # Our quota, or already remembered
+                except Exception as e:
+                    self.negative_cache.set_negative(failure_k, type(e).__name__)
+                    raise
+                self.cache.put(ref, width, data)
+        return data
+
+    def _build_variant(self, ref: str, width: int) -> bytes:
+        largest = PHOTO_WIDTHS[-1]
+        if width == largest:
+            return self._fetch_upstream(ref, width)
+        if Image is not None:
+            return resize(self.get_photo(ref, largest), width)
+        if ref.startswith(FALLBACK_PHOTO_PREFIX):
+            return self.get_photo(ref, largest)  # Stock images are already small
+        return self._fetch_upstream(ref, width)
+
+    def _fetch_upstream(self, ref: str, width: int) -> bytes:
+        self.upstream_fetches += 1
+        if ref.startswith(FALLBACK_PHOTO_PREFIX):
+            kind = ref[len(FALLBACK_PHOTO_PREFIX):]
+            url = FALLBACK_IMAGES.get(kind, DEFAULT_FALLBACK_IMAGE)
+            response = httpx.get(url, follow_redirects=True, timeout=10)
+            response.raise_for_status()
+            return response.content
+        client = get_places_service().client
+        chunks = get_upstream_caller().call("place_photo", client.places_photo, photo_reference=ref, max_width=width)
+        return b"".join(chunks)
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = self.cache.get_stats()
+        stats["upstream_fetches"] = self.upstream_fetches
+        return stats
+
+
+def resize(data: bytes, width: int) -> bytes:
+    """Downscale an image to `width` (never upscales). Requires Pillow."""
+    with Image.open(io.BytesIO(data)) as img:
+        if img.width <= width:
+            return data
+        height = round(img.height * width / img.width)
+        resized = img.convert("RGB").resize((width, height), Image.LANCZOS)
+        out = io.BytesIO()
+        resized.save(out, format="JPEG", quality=82, optimize=True)
+        return out.getvalue()
+
+
+# Singleton instance
+_photo_service: Optional[PhotoService] = None
+
+
+def get_photo_service() -> PhotoService:
+    """Get the singleton PhotoService instance."""
+    global _photo_service
+    if _photo_service is None:
+        settings = get_settings()
+        _photo_service = PhotoService(PhotoDiskCache(settings.PHOTO_CACHE_DIR, settings.PHOTO_CACHE_MAX_BYTES))
+    return _photo_service
@@ -0,0 +1,155 @@
+"""
+Place Batch - Columnar view of a place result set for vectorized work.
+
+A PlaceBatch holds one NumPy array per scored or filtered attribute
+(rating, review count, coordinates, a price-level bitmask and an
+activity bitmask), built once per result set and cached next to it.
+Filters and sorts run as array operations and return index arrays;
+PlaceRecords are only materialized for the indices a caller asks for.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+from backend.models.place import PlaceRecord
+from backend.models.user_preferance import ActivityType
+
+# Map Google place types to our activity types
+TYPE_TO_ACTIVITY = {
+    "park": ActivityType.OUTDOOR,
+    "natural_feature": ActivityType.OUTDOOR,
+    "campground": ActivityType.OUTDOOR,
+    "hiking_area": ActivityType.OUTDOOR,
+    "museum": ActivityType.CULTURAL,
+    "art_gallery": ActivityType.CULTURAL,
+    "library": ActivityType.CULTURAL,
+    "restaurant": ActivityType.FOOD,
+    "cafe": ActivityType.FOOD,
+    "bakery": ActivityType.FOOD,
+    "bar": ActivityType.NIGHTLIFE,
+    "night_club": ActivityType.NIGHTLIFE,
+    "shopping_mall": ActivityType.SHOPPING,
+    "store": ActivityType.SHOPPING,
+    "spa": ActivityType.RELAXATION,
+    "tourist_attraction": ActivityType.PHOTOGRAPHY,
+    "point_of_interest": ActivityType.ADVENTURE,
+}
+
+# One bit per ActivityType, in declaration order
+ACTIVITY_BITS: Dict[ActivityType, int] = {activity: 1 << i for i, activity in enumerate(ActivityType)}
+_TYPE_BITS: Dict[str, int] = {t: ACTIVITY_BITS[a] for t, a in TYPE_TO_ACTIVITY.items()}
+
+
+def activity_mask(types: Iterable[str]) -> int:
+    """Bitmask of the activities a place's Google types map to."""
+    mask = 0
+    for t in types:
+        mask |= _TYPE_BITS.get(t, 0)
+    return mask
+
+
+def activities_mask(activities: Iterable[ActivityType]) -> int:
+    """Bitmask of a set of activities (e.g. a user's preferences)."""
+    mask = 0
+    for activity in activities:
+        mask |= ACTIVITY_BITS[activity]
+    return mask
+
+
+def price_range_mask(low: int, high: int) -> int:
+    """Bitmask matching Google price levels low..high inclusive."""
+    return sum(1 << level for level in range(low, high + 1))
+
+
+class PlaceBatch:
+    """Columnar arrays over a list of places; see module docstring."""
+
+    def __init__(self, source: Sequence[Union[Dict[str, Any], PlaceRecord]], fetched_at: Optional[float] = None):
+        self._source = source
+        self._records: List[Optional[PlaceRecord]] = [None] * len(source)
+        self.fetched_at = fetched_at
+
+        count = len(source)
+        if source and isinstance(source[0], PlaceRecord):
+            self._records = list(source)
+            rows = [(p.rating, p.user_rating_total, p.coordinates, p.price_level, p.types, p.open_intervals)
+                    for p in source]
+            coords = [(c.lat, c.lng) if c else (np.nan, np.nan) for _, _, c, _, _, _ in rows]
+        else:
+            rows = [(d.get("rating"), d.get("user_rating_total"), d.get("coordinates"), d.get("price_level"),
+                     d.get("types") or (), d.get("open_intervals")) for d in source]
+            coords = [(c["lat"], c["lng"]) if c else (np.nan, np.nan) for _, _, c, _, _, _ in rows]
+
+        self.rating = np.fromiter((r[0] or 0.0 for r in rows), dtype=np.float64, count=count)
+        self.reviews = np.fromiter((r[1] or 0 for r in rows), dtype=np.int64, count=count)
+        latlng = np.asarray(coords, dtype=np.float64).reshape(count, 2)
+        self.lat = latlng[:, 0]
+        self.lng = latlng[:, 1]
+        # Bit `level` set for a known price level; 0 when unknown
+        self.price_mask = np.fromiter(
+            (1 << r[3] if r[3] is not None else 0 for r in rows), dtype=np.uint8, count=count
+        )
+        self.activity_mask = np.fromiter((activity_mask(r[4]) for r in rows), dtype=np.uint32, count=count)
+        self.has_hours = np.fromiter((r[5] is not None for r in rows), dtype=bool, count=count)
+
+    @classmethod
+    def from_records(cls, records: Sequence[PlaceRecord]) -> "PlaceBatch":
+        return cls(list(records))
+
+    @classmethod
+    def from_dicts(cls, places: Sequence[Dict[str, Any]], fetched_at: Optional[float] = None) -> "PlaceBatch":
+        return cls(places, fetched_at)
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def popularity(self) -> np.ndarray:
+        """Rating weighted by review count (the discover sort key)."""
+        return self.rating * (1 + self.reviews / 10000)
+
+    def by_popularity(self) -> np.ndarray:
+        """Indices in descending popularity; ties keep their original order."""
+        return np.argsort(-self.popularity(), kind="stable")
+
+    def filter_mask(
+        self,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        min_rating: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Boolean mask of places passing the price and rating filters. Like
+        Google's own price filter, unknown price levels fail a price bound.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if min_price is not None or max_price is not None:
+            low = min_price if min_price is not None else 0
+            high = max_price if max_price is not None else 4
+            keep &= (self.price_mask & price_range_mask(low, high)) != 0
+        if min_rating:
+            keep &= self.rating >= min_rating
+        return keep
+
+    def take(self, indices: Iterable[int]) -> "PlaceBatch":
+        """A new batch of the given rows, in the given order."""
+        indices = np.asarray(list(indices) if not isinstance(indices, np.ndarray) else indices, dtype=np.intp)
+        subset = PlaceBatch.__new__(PlaceBatch)
+        subset._source = [self._source[i] for i in indices]
+        subset._records = [self._records[i] for i in indices]
+        subset.fetched_at = self.fetched_at
+        for name in ("rating", "reviews", "lat", "lng", "price_mask", "activity_mask", "has_hours"):
+            setattr(subset, name, getattr(self, name)[indices])
+        return subset
+
+    def record(self, index: int) -> PlaceRecord:
+        """Materialize one row (memoized)."""
+        record = self._records[index]
+        if record is None:
+            record = PlaceRecord.from_dict(self._source[index])
+            self._records[index] = record
+        return record
+
+    def records(self, indices: Optional[Iterable[int]] = None) -> List[PlaceRecord]:
+        """Materialize the given rows (default: all) in order."""
+        if indices is None:
+            indices = range(len(self))
+        return [self.record(int(i)) for i in indices]
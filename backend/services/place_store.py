@@ -0,0 +1,142 @@
+"""
+Place Store - One shared record per place for every cached place list.
+
+A popular place appears in the discover entry of every category mix and
+in every search that returns it. Instead of each entry holding its own
+copy, list entries hold a PlaceList of place_ids and the records live
+here once, each encoded with the cache's codec (EncodedValue: JSON + zlib
+with the shared dictionary) so the lists keep their compression.
+Records are reference counted by the cache keys that hold them and are
+dropped with the last one, and updating a place is a single write.
+
+The store has no lock of its own; InMemoryCache calls it under its lock.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class PlaceList:
+    """
+    Cache value for a list of places held by reference.
+
+    `extras` keeps the other keys of a wrapped list such as
+    {"fetched_at": ..., "places": [...]}. `pending` holds the records to
+    write into the store on insert and is cleared once they are written.
+    """
+    __slots__ = ("ids", "extras", "pending")
+
+    def __init__(self, ids: Tuple[str, ...], extras: Optional[Dict[str, Any]], pending: Optional[List[Dict[str, Any]]]):
+        self.ids = ids
+        self.extras = extras
+        self.pending = pending
+
+    @classmethod
+    def from_value(cls, value: Any) -> Optional["PlaceList"]:
+        """Wrap a place list (or {"places": [...], ...}), or None if `value` isn't one."""
+        extras = None
+        places = value
+        if isinstance(value, dict) and isinstance(value.get("places"), list):
+            extras = {k: v for k, v in value.items() if k != "places"}
+            places = value["places"]
+        if not isinstance(places, list) or not places:
+            return None
+        if not all(isinstance(p, dict) and isinstance(p.get("id"), str) for p in places):
+            return None
+        return cls(tuple(p["id"] for p in places), extras, places)
+
+
+class PlaceRecordStore:
+    """Reference-counted place records keyed by place_id; see module docstring."""
+
+    def __init__(self, codec: Any):
+        # `codec` has encode(value) -> encoded, and encoded has decode(), raw_size and data
+        self.codec = codec
+        self._records: Dict[str, Any] = {}
+        self._holders: Dict[str, Set[str]] = {}  # place_id -> cache keys referencing it
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _get(self, place_id: str) -> Optional[Dict[str, Any]]:
+        encoded = self._records.get(place_id)
+        return encoded.decode() if encoded is not None else None
+
+    def _put(self, place_id: str, record: Dict[str, Any]) -> None:
+        self._drop(place_id)
+        encoded = self.codec.encode(record)
+        self._records[place_id] = encoded
+        self.raw_bytes += encoded.raw_size
+        self.encoded_bytes += len(encoded.data)
+
+    def _drop(self, place_id: str) -> None:
+        encoded = self._records.pop(place_id, None)
+        if encoded is not None:
+            self.raw_bytes -= encoded.raw_size
+            self.encoded_bytes -= len(encoded.data)
+
+    def acquire(self, key: str, places: PlaceList) -> None:
+        """
+        Write a list's pending records and reference them from `key`. Newer
+        values win, but a None never erases a known value (e.g. enriched hours).
+        """
+        for record in places.pending or ():
+            existing = self._get(record["id"])
+            if existing is not None:
+                record = {**record, **{k: v for k, v in existing.items() if record.get(k) is None}}
+            self._put(record["id"], record)
+        places.pending = None
+        for place_id in places.ids:
+            self._holders.setdefault(place_id, set()).add(key)
+
+    def release(self, key: str, places: PlaceList, keep: Iterable[str] = ()) -> None:
+        """
+        Drop `key`'s references, except to the ids in `keep` (those the value
+        replacing it still holds); records nobody references any more are freed.
+        """
+        keep = set(keep)
+        for place_id in places.ids:
+            if place_id in keep:
+                continue
+            holders = self._holders.get(place_id)
+            if holders is None:
+                continue
+            holders.discard(key)
+            if not holders:
+                del self._holders[place_id]
+                self._drop(place_id)
+
+    def resolve(self, places: PlaceList) -> Any:
+        """Rebuild the original value. Records are decoded fresh, so callers may mutate them."""
+        records = [self._records[place_id].decode() for place_id in places.ids if place_id in self._records]
+        if places.extras is None:
+            return records
+        return {**places.extras, "places": records}
+
+    def update(self, place_id: str, fields: Dict[str, Any]) -> Iterable[str]:
+        """Merge `fields` into a shared record. Returns the keys whose value changed."""
+        record = self._get(place_id)
+        if record is None:
+            return ()
+        record.update(fields)
+        self._put(place_id, record)
+        return tuple(self._holders.get(place_id, ()))
+
+    def clear(self) -> None:
+        self._records.clear()
+        self._holders.clear()
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        references = sum(len(h) for h in self._holders.values())
+        ratio = (self.raw_bytes / self.encoded_bytes) if self.encoded_bytes else 0
+        return {
+            "records": len(self._records),
+            "references": references,
+            "sharing_ratio": f"{references / len(self._records):.1f}x" if self._records else "0.0x",
+            "raw_bytes": self.raw_bytes,
+            "encoded_bytes": self.encoded_bytes,
+            "compression_ratio": f"{ratio:.1f}x",
+        }
@@ -4,11 +4,33 @@ Fetches POIs for California cities with caching.
 """
 
 import googlemaps
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import quote
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
 from backend.core.config import get_settings
 from backend.core.logging import get_logger
-from backend.services.cache_service import get_cache, cache_key
-from backend.models.place import Place, Coordinates
+from backend.services.cache_service import (
+    get_cache,
+    cache_key,
+    city_tag,
+    place_tag,
+    set_shared_dictionary,
+    NegativeResult,
+)
+from backend.services.catalog_service import FIELD_GROUPS, get_place_catalog, record_to_result
+from backend.services.city_index import get_city_index, normalize_name
+from backend.services.spatial_index import get_spatial_index
+from backend.services.enrichment_service import get_detail_enricher
+from backend.services.opening_hours import filter_open, parse_periods
+from backend.services.place_batch import PlaceBatch
+from backend.services.quota_service import UpstreamUnavailable
+from backend.services.upstream_service import get_upstream_caller, google_client
+from backend.services.map_tiles import cluster_tile, tile_bounds, tiles_in_viewport
+from backend.models.place import PLACE_FIELDS, PlaceRecord, LatLng
 
 logger = get_logger('Odyssey.places')
 
@@ -34,6 +56,141 @@ FALLBACK_IMAGES = {
     "museum": "https://images.unsplash.com/photo-1566127444979-b3d2b654e3d7?w=600",
     "tourist_attraction": "https://images.unsplash.com/photo-1533105079780-92b9be482077?w=600",
 }
+DEFAULT_FALLBACK_IMAGE = "https://images.unsplash.com/photo-1477959858617-67f85cf4f1df?w=600"
+
+# Photo proxy refs for fallback images: "fallback-park", "fallback-default", ...
+FALLBACK_PHOTO_PREFIX = "fallback-"
+
+# Strings repeated in every cached place dict; the cache's encoder shares
+# them across entries instead of storing them per place.
+set_shared_dictionary(
+    [f'"FALLBACK:{url}"' for url in [DEFAULT_FALLBACK_IMAGE, *FALLBACK_IMAGES.values()]]
+    + [f'"{t}",' for types in PLACE_TYPES.values() for t in types]
+    + ['"establishment",', '"food",', '"point_of_interest",', '"tourist_attraction",']
+    + [f'"{field}":' for field in PLACE_FIELDS]
+)
+
+
+# Google text searches per discover miss (one per place type)
+MAX_TYPES_PER_DISCOVER = 3
+
+# How old a cached search may be before its `open_now` flags are refetched
+OPEN_NOW_MAX_AGE_SECONDS = 900
+
+# Google returns at most this many autocomplete predictions per call
+GOOGLE_AUTOCOMPLETE_LIMIT = 5
+
+# Concurrent Google detail calls per batch request
+BATCH_DETAIL_CONCURRENCY = 6
+
+
+def canonical_categories(categories: Optional[List[str]]) -> List[str]:
+    """Sorted, de-duplicated categories; None means the default discover set."""
+    if not categories:
+        return ["attractions", "restaurants"]
+    return sorted(set(categories))
+
+
+def types_for_categories(categories: List[str]) -> List[str]:
+    """
+    Pick the place types to search for a set of categories.
+    Takes types round-robin so every category is represented before any
+    category contributes a second type, capped at MAX_TYPES_PER_DISCOVER.
+    """
+    pools = [PLACE_TYPES.get(c, []) for c in categories]
+    types: List[str] = []
+    for i in range(max((len(pool) for pool in pools), default=0)):
+        for pool in pools:
+            if i < len(pool) and pool[i] not in types:
+                types.append(pool[i])
+    return types[:MAX_TYPES_PER_DISCOVER]
+
+
+def discover_cache_key(city: str, categories: Optional[List[str]]) -> str:
+    """Cache key for a merged discover result set (category order is ignored)."""
+    return cache_key("discover", city, ",".join(canonical_categories(categories)))
+
+
+def discover_type_cache_key(city: str, place_type: str) -> str:
+    """Cache key for the base result set of one place type in a city."""
+    return cache_key("discover", city, "type", place_type)
+
+
+def search_cache_key(query: str, city: str, place_type: Optional[str] = None) -> str:
+    """Cache key for a search base result set (price/open/rating filters are local)."""
+    return cache_key("search", query, city, place_type)
+
+
+def tile_cache_key(zoom: int, x: int, y: int, category: Optional[str] = None) -> str:
+    """Cache key for one clustered map tile."""
+    return cache_key("tiles", zoom, x, y, category or "all")
+
+
+def place_cache_key(place_id: str) -> str:
+    """Cache key for a single place's details."""
+    return cache_key("place", place_id)
+
+
+def _matches_prefix(city: Dict[str, Any], prefix: str) -> bool:
+    """True if any word of the city's full description starts with `prefix`."""
+    text = normalize_name(city.get("full_description") or city.get("name", ""))
+    return text.startswith(prefix) or f" {prefix}" in f" {text}"
+
+
+def filter_places(
+    places: Union[List[PlaceRecord], PlaceBatch],
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    open_now: Optional[bool] = None,
+    min_rating: Optional[float] = None,
+    open_at: Optional[datetime] = None
+) -> List[PlaceRecord]:
+    """
+    Apply search filters locally. Like Google's own price filter, places
+    without a price level are excluded once a price bound is given.
+    Openness uses a place's weekly schedule when known; `open_now` falls
+    back to the fetch-time flag, `open_at` drops places with no schedule.
+    Price and rating run on the columnar batch; only survivors are materialized.
+    """
+    batch = places if isinstance(places, PlaceBatch) else PlaceBatch.from_records(places)
+    keep = batch.filter_mask(min_price, max_price, min_rating)
+    result = batch.records(np.flatnonzero(keep))
+    if open_now:
+        result = filter_open(result, fallback_to_flag=True)
+    if open_at:
+        result = filter_open(result, open_at)
+    return result
+
+
+def normalize_city(city: str) -> str:
+    """Add the state suffix if not present ("Fresno" -> "Fresno, CA")."""
+    return city if "," in city else f"{city}, CA"
+
+
+def _result_tags(city: str, places: List[PlaceRecord]) -> List[str]:
+    """Tags for a cached place list: its city plus every place in it."""
+    return [city_tag(city)] + [place_tag(p.id) for p in places]
+
+
+def _weekly_hours(hours: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Google opening_hours without the fetch-time open_now flag (None if no schedule)."""
+    if not hours or "periods" not in hours:
+        return None
+    return {k: v for k, v in hours.items() if k != "open_now"}
+
+
+def _merge_place_fields(value: Any, place_id: str, fields: Dict[str, Any]) -> Any:
+    """Apply enriched fields to one place inside any cached place value."""
+    if isinstance(value, dict) and "places" in value:
+        places = value["places"]
+    elif isinstance(value, list):
+        places = value
+    else:
+        places = [value]
+    for p in places:
+        if isinstance(p, dict) and p.get("id") == place_id:
+            p.update(fields)
+    return value
 
 
 class PlacesService:
@@ -48,8 +205,16 @@ class PlacesService:
         if not api_key:
             raise ValueError("No Google API key configured")
         
-        self.client = googlemaps.Client(key=api_key)
+        # Retries and hedging happen in the upstream caller, not inside the client
+        self.client = google_client(api_key)
         self.cache = get_cache()
+        self.catalog = get_place_catalog()
+        self.spatial_index = get_spatial_index()
+        self.enricher = get_detail_enricher()
+        self.upstream = get_upstream_caller()
+        # Single-flight: place_id -> Future of the detail fetch in progress
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
         self.settings = settings
     
     def discover_places(
@@ -57,108 +222,314 @@ class PlacesService:
         city: str, 
         categories: Optional[List[str]] = None,
         max_results: int = 20
-    ) -> List[Place]:
+    ) -> List[PlaceRecord]:
         """
         Discover places in a city, optionally filtered by categories.
         
+        Results are assembled from per-type base sets, so any category
+        combination reuses the types already fetched for that city.
+        
         Args:
             city: City name (e.g., "San Francisco, CA")
             categories: List of category keys from PLACE_TYPES
             max_results: Maximum number of places to return
         
         Returns:
-            List of Place objects
+            List of PlaceRecord objects
         """
+        categories = canonical_categories(categories)
+
         # Check cache first
-        cache_k = cache_key("discover", city, str(categories))
-        cached = self.cache.get(cache_k)
-        if cached:
+        cache_k = discover_cache_key(city, categories)
+        cached = self._cached_batch(cache_k)
+        if isinstance(cached, NegativeResult):
+            logger.info(f"Negative cache hit for {city} ({cached.reason})")
+            return []
+        if cached is not None:
             logger.info(f"Returning cached places for {city}")
-            return [Place(**p) for p in cached]
-        
-        # Determine which place types to search
-        if categories:
-            place_types = []
-            for cat in categories:
-                place_types.extend(PLACE_TYPES.get(cat, []))
-        else:
-            # Default: search attractions and restaurants
-            place_types = PLACE_TYPES["attractions"] + PLACE_TYPES["restaurants"]
+            return cached.records(range(min(max_results, len(cached))))
         
-        # Search for places
+        # Merge the base set of every place type for these categories
         all_places = []
         seen_ids = set()
+        errors = []
+        degraded = False
         
-        for place_type in place_types[:3]:  # Limit to 3 types to save API calls
+        for place_type in types_for_categories(categories):
             try:
-                results = self.client.places(
-                    query=f"{place_type} in {city}",
-                    type=place_type
-                )
-                
-                for result in results.get("results", [])[:max_results]:
-                    place_id = result.get("place_id")
-                    if place_id and place_id not in seen_ids:
-                        seen_ids.add(place_id)
-                        place = self._parse_place(result)
-                        if place:
-                            all_places.append(place)
-                            
+                type_places = self._get_type_places(city, place_type)
+            except UpstreamUnavailable:
+                # Google is off limits right now; fall back to cataloged places
+                type_places = self._catalog_type_places(city, place_type)
+                degraded = True
             except Exception as e:
-                logger.error(f"Error searching {place_type}: {e}")
+                errors.append(e)
                 continue
+
+            for place in type_places:
+                if place.id not in seen_ids:
+                    seen_ids.add(place.id)
+                    all_places.append(place)
         
         # Sort by rating and popularity
-        all_places.sort(
-            key=lambda p: (p.rating or 0) * (1 + (p.user_rating_total or 0) / 10000),
-            reverse=True
-        )
-        
-        # Limit results
-        all_places = all_places[:max_results]
+        batch = PlaceBatch.from_records(all_places)
+        all_places = batch.records(batch.by_popularity())
+
+        if degraded:
+            # Partial, catalog-backed answer: serve it but don't cache it
+            return all_places[:max_results]
+
+        if not all_places:
+            # Remember the miss briefly so junk cities don't hit Google every time
+            reason = type(errors[-1]).__name__ if errors else "empty"
+            self.cache.set_negative(cache_k, reason, tags=[city_tag(city)])
+            logger.info(f"No places found for {city} ({reason})")
+            return []
         
-        # Cache the results
-        self.cache.set(cache_k, [p.model_dump() for p in all_places])
+        # Cache the full merged list; max_results is applied on the way out
+        self.cache.set(
+            cache_k,
+            [p.to_dict() for p in all_places],
+            tags=_result_tags(city, all_places)
+        )
         logger.info(f"Cached {len(all_places)} places for {city}")
         
-        return all_places
+        return all_places[:max_results]
+
+    def _get_type_places(self, city: str, place_type: str) -> List[PlaceRecord]:
+        """
+        Get the base result set for one place type in a city.
+        Only goes to Google when the base set isn't cached. Raises on
+        upstream errors (after recording a negative entry).
+        """
+        cached = self._cached_batch(discover_type_cache_key(city, place_type))
+        if isinstance(cached, NegativeResult):
+            return []
+        if cached is not None:
+            return cached.records()
+        return self._fetch_type_places(city, place_type)
+
+    def _cached_batch(self, cache_k: str) -> Any:
+        """
+        The cached place list under `cache_k` as a PlaceBatch (built on first
+        use and kept on the entry), a NegativeResult, or None on a miss.
+        """
+        batch = self.cache.get_derived(cache_k, "batch")
+        if batch is not None:
+            return batch
+        cached = self.cache.get(cache_k)
+        if cached is None or isinstance(cached, NegativeResult):
+            return cached
+        if isinstance(cached, dict):
+            batch = PlaceBatch.from_dicts(cached["places"], fetched_at=cached.get("fetched_at"))
+        else:
+            batch = PlaceBatch.from_dicts(cached)
+        self.cache.set_derived(cache_k, "batch", batch)
+        return batch
+
+    def _catalog_type_places(self, city: str, place_type: str) -> List[PlaceRecord]:
+        """Cataloged places of one type in a city (used when Google is unavailable)."""
+        results = [r for r in self.catalog.places_in_city(city) if place_type in r.get("types", [])]
+        return [p for p in map(self._parse_place, results) if p and p.id]
+
+    def _fetch_type_places(self, city: str, place_type: str) -> List[PlaceRecord]:
+        """Fetch one place type's base set from Google and cache it."""
+        cache_k = discover_type_cache_key(city, place_type)
+        try:
+            results = self.upstream.call(
+                "text_search",
+                self.client.places,
+                query=f"{place_type} in {city}",
+                type=place_type
+            )
+        except UpstreamUnavailable:
+            raise
+        except Exception as e:
+            logger.error(f"Error searching {place_type}: {e}")
+            self.cache.set_negative(cache_k, type(e).__name__, tags=[city_tag(city)])
+            raise
+
+        self.catalog.upsert_results(results.get("results", []), city=city)
+        places = []
+        for result in results.get("results", []):
+            place = self._parse_place(result)
+            if place and place.id:
+                places.append(place)
+        self.spatial_index.add_many(places)
+        self.enricher.enqueue(places)
+
+        if places:
+            self.cache.set(cache_k, [p.to_dict() for p in places], tags=_result_tags(city, places))
+        else:
+            self.cache.set_negative(cache_k, tags=[city_tag(city)])
+        return places
+    
+    def warm_discover(
+        self,
+        city: str,
+        categories: Optional[List[str]],
+        refresh_within: int,
+        budget: int
+    ) -> int:
+        """
+        Refresh a discover result ahead of expiry.
+
+        Refetches the base sets that are missing or expire within
+        `refresh_within` seconds, spending at most `budget` Google calls,
+        then rebuilds the merged entry if every base set is available.
+        Returns the number of Google calls made.
+        """
+        categories = canonical_categories(categories)
+        calls = 0
+        complete = True
+        refreshed = False
+
+        for place_type in types_for_categories(categories):
+            remaining = self.cache.expires_in(discover_type_cache_key(city, place_type))
+            if remaining is not None and remaining > refresh_within:
+                continue
+            if calls >= budget:
+                complete = False
+                continue
+            calls += 1
+            try:
+                self._fetch_type_places(city, place_type)
+                refreshed = True
+            except Exception:
+                complete = False
+
+        merged_k = discover_cache_key(city, categories)
+        merged_remaining = self.cache.expires_in(merged_k)
+        stale = merged_remaining is None or merged_remaining <= refresh_within
+        if complete and (refreshed or stale):
+            # All base sets are cached now, so this rebuild makes no Google calls
+            self.cache.delete(merged_k)
+            self.discover_places(city, categories)
+
+        return calls
     
-    def get_place_details(self, place_id: str) -> Optional[Place]:
+    def get_place_details(self, place_id: str) -> Optional[PlaceRecord]:
         """
         Get detailed information about a specific place.
         
+        Concurrent calls for the same place share one fetch.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(place_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[place_id] = future
+        if not owner:
+            return future.result()
+
+        try:
+            place = self._load_place_details(place_id)
+            future.set_result(place)
+            return place
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(place_id, None)
+
+    def get_place_details_batch(self, place_ids: List[str]) -> List[Tuple[Optional[PlaceRecord], Optional[str]]]:
+        """
+        Details for many places, as (place, error) pairs in input order.
+        
+        Cached places are answered immediately; misses are fetched
+        concurrently, at most BATCH_DETAIL_CONCURRENCY at a time.
+        Errors are "not_found" or "upstream_error".
+        """
+        unique = list(dict.fromkeys(place_ids))
+        results: Dict[str, Tuple[Optional[PlaceRecord], Optional[str]]] = {}
+        misses = []
+        for place_id in unique:
+            cached = self.cache.get(place_cache_key(place_id))
+            if cached is None:
+                misses.append(place_id)
+            else:
+                results[place_id] = self._detail_outcome(place_id, cached)
+
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(BATCH_DETAIL_CONCURRENCY, len(misses))) as pool:
+                fetched = list(pool.map(self._fetch_detail_outcome, misses))
+            results.update(zip(misses, fetched))
+
+        return [results[place_id] for place_id in place_ids]
+
+    def _fetch_detail_outcome(self, place_id: str) -> Tuple[Optional[PlaceRecord], Optional[str]]:
+        try:
+            place = self.get_place_details(place_id)
+        except Exception as e:
+            logger.error(f"Batch detail fetch failed for {place_id}: {e}")
+            return None, "upstream_error"
+        if place:
+            return place, None
+        return self._detail_outcome(place_id, self.cache.peek(place_cache_key(place_id)))
+
+    def _detail_outcome(self, place_id: str, cached: Any) -> Tuple[Optional[PlaceRecord], Optional[str]]:
+        """Turn a cached detail value into a (place, error) pair."""
+        if isinstance(cached, NegativeResult):
+            return None, "not_found" if cached.reason == "empty" else "upstream_error"
+        if cached is None:
+            return None, "upstream_error"
+        return PlaceRecord.from_dict(cached), None
+
+    def _load_place_details(self, place_id: str) -> Optional[PlaceRecord]:
+        """
+        Load details from the cache, then the place catalog, then Google.
+        
+        Only catalog field groups that are missing or stale are requested
+        from Google, and the response is merged into the catalog record.
+        
         Args:
             place_id: Google Place ID
         
         Returns:
-            Place object with full details
+            PlaceRecord object with full details
         """
         # Check cache
-        cache_k = cache_key("place", place_id)
+        cache_k = place_cache_key(place_id)
         cached = self.cache.get(cache_k)
-        if cached:
-            return Place(**cached)
+        if isinstance(cached, NegativeResult):
+            return None
+        if cached is not None:
+            return PlaceRecord.from_dict(cached)
+        
+        record = self.catalog.get(place_id)
+        stale = self.catalog.stale_groups(record)
+        place_data = record_to_result(record) if record else {}
         
         try:
-            result = self.client.place(
-                place_id=place_id,
-                fields=[
-                    "place_id", "name", "formatted_address", "geometry",
-                    "rating", "user_ratings_total", "types", "photos",
-                    "opening_hours", "price_level", "website", "formatted_phone_number"
-                ]
-            )
+            if stale:
+                fields = ["place_id"] + [f for group in stale for f in FIELD_GROUPS[group]]
+                result = self.upstream.call("place_details", self.client.place, place_id=place_id, fields=fields)
+                fresh = result.get("result", {})
+                if fresh:
+                    self.catalog.upsert_results([fresh], groups=stale)
+                    place_data.update(fresh)
+                else:
+                    place_data = {}
             
-            place_data = result.get("result", {})
-            place = self._parse_place_details(place_data)
+            place = self._parse_place_details(place_data) if place_data else None
             
             if place:
-                self.cache.set(cache_k, place.model_dump())
+                self.cache.set(cache_k, place.to_dict(), tags=[place_tag(place_id)])
+                self.spatial_index.add(place)
+            else:
+                self.cache.set_negative(cache_k, tags=[place_tag(place_id)])
             
             return place
             
         except Exception as e:
             logger.error(f"Error fetching place details for {place_id}: {e}")
+            if record:
+                # Serve the stale catalog copy rather than nothing
+                return self._parse_place_details(record_to_result(record))
+            if not isinstance(e, UpstreamUnavailable):
+                self.cache.set_negative(cache_k, type(e).__name__, tags=[place_tag(place_id)])
             return None
     
     def search_places(
@@ -169,59 +540,178 @@ class PlacesService:
         min_price: Optional[int] = None,
         max_price: Optional[int] = None,
         open_now: Optional[bool] = None,
-        min_rating: Optional[float] = None
-    ) -> List[Place]:
+        min_rating: Optional[float] = None,
+        open_at: Optional[datetime] = None
+    ) -> List[PlaceRecord]:
         """
         Search for places matching a query in a city with optional filters.
-        """
-        # Include filters in cache key
-        cache_k = cache_key("search", query, city, place_type, min_price, max_price, open_now)
-        cached = self.cache.get(cache_k)
-        if cached:
-            places = [Place(**p) for p in cached]
-            # Apply post-fetch rating filter on cached results
-            if min_rating:
-                places = [p for p in places if (p.rating or 0) >= min_rating]
-            return places
         
+        One base result set is cached per (query, city, type); price, open
+        and rating filters are applied locally so filter variations don't
+        refetch. `open_now` only trusts a base set fetched recently, unless
+        every place in it has a weekly schedule.
+        """
+        cache_k = search_cache_key(query, city, place_type)
+        cached = self._cached_batch(cache_k)
+        if isinstance(cached, NegativeResult):
+            return []
+
+        fresh_enough = cached is not None and (
+            not open_now
+            or time.time() - cached.fetched_at <= OPEN_NOW_MAX_AGE_SECONDS
+            or cached.has_hours.all()
+        )
+        if fresh_enough:
+            places = cached
+        else:
+            try:
+                places = self._fetch_search(cache_k, query, city, place_type)
+            except UpstreamUnavailable:
+                # Google is off limits right now; serve the stale base set or
+                # cataloged places (uncached) rather than "no results"
+                places = cached if cached is not None else self._catalog_search_places(query, city, place_type)
+
+        return filter_places(places, min_price, max_price, open_now, min_rating, open_at)
+
+    def _fetch_search(
+        self,
+        cache_k: str,
+        query: str,
+        city: str,
+        place_type: Optional[str]
+    ) -> List[PlaceRecord]:
+        """Run an unfiltered text search against Google and cache the base set."""
         try:
-            # Build arguments for Google Places API
             search_query = f"{query} in {city}"
             kwargs = {'query': search_query}
-            
             if place_type:
                 kwargs['type'] = place_type
-            if min_price is not None:
-                kwargs['min_price'] = min_price
-            if max_price is not None:
-                kwargs['max_price'] = max_price
-            if open_now:
-                kwargs['open_now'] = True
                 
-            results = self.client.places(**kwargs)
+            results = self.upstream.call("text_search", self.client.places, **kwargs)
+            self.catalog.upsert_results(results.get("results", [])[:20], city=city)
             places = []
             
             for result in results.get("results", [])[:20]:
                 place = self._parse_place(result)
                 if place:
-                    # Filter by rating manually as API doesn't support it directly in text search?
-                    # Actually API doesn't, so we filter here.
-                    if min_rating and (place.rating or 0) < min_rating:
-                        continue
                     places.append(place)
+            self.spatial_index.add_many(places)
+            self.enricher.enqueue(places)
             
-            # Cache the RAW results (before rating filter? No, cache the valid ones? 
-            # Better to cache the API response result, but we parse first.
-            # Let's cache the parsed list.
-            self.cache.set(cache_k, [p.model_dump() for p in places])
+            if places:
+                self.cache.set(
+                    cache_k,
+                    {"fetched_at": time.time(), "places": [p.to_dict() for p in places]},
+                    tags=_result_tags(city, places)
+                )
+            else:
+                self.cache.set_negative(cache_k, tags=[city_tag(city)])
             
             return places
             
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
             logger.error(f"Error searching '{query}' in {city}: {e}")
+            self.cache.set_negative(cache_k, type(e).__name__, tags=[city_tag(city)])
             return []
+
+    def _catalog_search_places(self, query: str, city: str, place_type: Optional[str]) -> List[PlaceRecord]:
+        """Cataloged places in a city matching a text query (used when Google is unavailable)."""
+        if place_type:
+            candidates = self._catalog_type_places(city, place_type)
+        else:
+            candidates = [p for p in map(self._parse_place, self.catalog.places_in_city(city)) if p and p.id]
+        words = query.lower().split()
+        matches = [
+            p for p in candidates
+            if any(w in p.name.lower() or any(w in t.replace("_", " ") for t in p.types) for w in words)
+        ]
+        batch = PlaceBatch.from_records(matches)
+        return batch.records(batch.by_popularity())[:20]
     
-    def _parse_place(self, data: Dict[str, Any]) -> Optional[Place]:
+    def enrich_place(self, place_id: str) -> bool:
+        """
+        Fill in a place's price level and opening hours and merge them into
+        every cached result containing it. Google is only called when the
+        catalog's atmosphere/contact groups are stale. Returns True if it
+        called Google.
+        """
+        record = self.catalog.get(place_id)
+        stale = [g for g in self.catalog.stale_groups(record) if g in ("atmosphere", "contact")]
+        place_data = record_to_result(record) if record else {"place_id": place_id}
+
+        if stale:
+            fields = ["place_id"] + [f for group in stale for f in FIELD_GROUPS[group]]
+            fresh = self.upstream.call(
+                "place_details", self.client.place, place_id=place_id, fields=fields
+            ).get("result", {})
+            if not fresh:
+                return True
+            self.catalog.upsert_results([fresh], groups=stale)
+            place_data.update(fresh)
+
+        hours = _weekly_hours(place_data.get("opening_hours"))
+        enriched = {
+            "price_level": place_data.get("price_level"),
+            "opening_hours": hours,
+            "open_intervals": parse_periods(hours["periods"]) if hours else None,
+        }
+        # One write covers every cached place list; detail entries hold their own copy
+        self.cache.update_place(place_id, enriched)
+        self.cache.update_tagged(place_tag(place_id), lambda v: _merge_place_fields(v, place_id, enriched))
+        return bool(stale)
+
+    def nearby_places(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        category: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Tuple[PlaceRecord, float]]:
+        """
+        Known places within `radius_m` of a point, nearest first.
+        Answered from the local spatial index; never calls Google.
+        """
+        types = set(PLACE_TYPES[category]) if category else None
+        return self.spatial_index.nearby(lat, lng, radius_m, types=types, limit=limit)
+
+    def viewport_places(
+        self,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        zoom: int,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Clustered markers for a map viewport, assembled from per-tile
+        results so panning reuses tiles already computed. Never calls Google.
+        """
+        types = set(PLACE_TYPES[category]) if category else None
+        clusters: List[Dict[str, Any]] = []
+        places: List[PlaceRecord] = []
+        for x, y in tiles_in_viewport(south, west, north, east, zoom):
+            cache_k = tile_cache_key(zoom, x, y, category)
+            tile = self.cache.get(cache_k)
+            if tile is None:
+                tile_places = self.spatial_index.within(*tile_bounds(zoom, x, y), types=types)
+                tile = cluster_tile(tile_places, zoom, x, y)
+                self.cache.set(cache_k, tile)
+            clusters.extend(tile["clusters"])
+            places.extend(PlaceRecord.from_dict(p) for p in tile["places"])
+        return {"clusters": clusters, "places": places}
+
+    def seed_spatial_index(self) -> int:
+        """Load every cataloged place into the spatial index. Returns the count."""
+        places = [p for p in map(self._parse_place, self.catalog.all_results()) if p and p.id]
+        self.spatial_index.add_many(places)
+        logger.info(f"Spatial index seeded with {len(places)} cataloged places")
+        return len(places)
+
+    def _parse_place(self, data: Dict[str, Any]) -> Optional[PlaceRecord]:
         """Parse a place from API response."""
         try:
             location = data.get("geometry", {}).get("location", {})
@@ -248,13 +738,14 @@ class PlacesService:
                         break
                 # Default generic fallback if no specific type match
                 if not photo_ref:
-                    photo_ref = "FALLBACK:https://images.unsplash.com/photo-1477959858617-67f85cf4f1df?w=600"
+                    photo_ref = f"FALLBACK:{DEFAULT_FALLBACK_IMAGE}"
 
-            return Place(
+            hours = _weekly_hours(data.get("opening_hours"))
+            return PlaceRecord(
                 id=data.get("place_id", ""),
                 name=data.get("name", ""),
                 address=data.get("formatted_address") or data.get("vicinity", ""),
-                coordinates=Coordinates(
+                coordinates=LatLng(
                     lat=location.get("lat", 0),
                     lng=location.get("lng", 0)
                 ) if location else None,
@@ -262,12 +753,16 @@ class PlacesService:
                 user_rating_total=data.get("user_ratings_total"),
                 types=data.get("types", []),
                 photo_reference=photo_ref,
+                price_level=data.get("price_level"),
+                open_now=(data.get("opening_hours") or {}).get("open_now"),
+                opening_hours=hours,
+                open_intervals=parse_periods(hours["periods"]) if hours else None,
             )
         except Exception as e:
             logger.error(f"Error parsing place: {e}")
             return None
     
-    def _parse_place_details(self, data: Dict[str, Any]) -> Optional[Place]:
+    def _parse_place_details(self, data: Dict[str, Any]) -> Optional[PlaceRecord]:
         """Parse detailed place from API response."""
         place = self._parse_place(data)
         if place:
@@ -296,7 +791,12 @@ class PlacesService:
     
     def autocomplete_cities(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
-        Autocomplete California cities using Google Places API.
+        Autocomplete California cities.
+        
+        Answers from the local city index when it has a full page of
+        matches. The bundled list is incomplete, so otherwise its matches
+        come first, then Google Places autocomplete results, then local
+        typo-tolerant matches.
         
         Args:
             query: Partial city name to search for
@@ -305,15 +805,47 @@ class PlacesService:
         Returns:
             List of city suggestions with name, place_id, and description
         """
-        cache_k = cache_key("autocomplete_city", query.lower())
+        index = get_city_index()
+        local = index.search(query, max_results) or []
+        if len(local) >= max_results:
+            return local
+
+        cities: List[Dict[str, Any]] = []
+        seen = set()
+        for source in (local, self._google_autocomplete(query, max_results), index.suggest(query, max_results)):
+            for city in source:
+                name = normalize_name(city["name"])
+                if name not in seen:
+                    seen.add(name)
+                    cities.append(city)
+            if len(cities) >= max_results:
+                break
+        return cities[:max_results]
+
+    def _google_autocomplete(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """California cities from Google autocomplete, cached per lowercased query."""
+        lowered = query.lower()
+        cache_k = cache_key("autocomplete", lowered)
         cached = self.cache.get(cache_k)
-        if cached:
+        if isinstance(cached, NegativeResult):
+            return []
+        if cached is not None:
             logger.debug(f"Returning cached autocomplete for '{query}'")
-            return cached
+            return cached["cities"][:max_results]
+
+        # A complete result for a shorter prefix contains every answer for this query
+        narrowed = self._narrow_autocomplete(lowered)
+        if narrowed is not None:
+            self.cache.count("autocomplete", "prefix_reuse")
+            self.cache.set(cache_k, {"cities": narrowed, "complete": True})
+            return narrowed[:max_results]
         
         try:
             # Use places_autocomplete with California restriction
-            results = self.client.places_autocomplete(
+            self.cache.count("autocomplete", "google_calls")
+            results = self.upstream.call(
+                "autocomplete",
+                self.client.places_autocomplete,
                 input_text=query,
                 types="(cities)",
                 components={"country": "us"},
@@ -339,20 +871,58 @@ class PlacesService:
                         "full_description": description
                     })
             
-            # Cache for 1 hour (autocomplete results don't change often)
-            self.cache.set(cache_k, cities, ttl=3600)
+            # Fewer predictions than either limit means nothing was cut off,
+            # so longer queries can be answered by filtering this list
+            complete = len(results) < min(max_results, GOOGLE_AUTOCOMPLETE_LIMIT)
+
+            # Autocomplete namespace TTL is 1 hour (results don't change often)
+            if not cities and complete:
+                self.cache.set_negative(cache_k)
+            else:
+                self.cache.set(cache_k, {"cities": cities, "complete": complete})
             logger.info(f"Autocomplete '{query}' returned {len(cities)} California cities")
             
             return cities
             
         except Exception as e:
             logger.error(f"Error in city autocomplete for '{query}': {e}")
+            if not isinstance(e, UpstreamUnavailable):
+                self.cache.set_negative(cache_k, type(e).__name__)
             return []
+
+    def _narrow_autocomplete(self, lowered: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a query from the longest cached prefix whose result list is
+        complete. Returns None if no such prefix is cached.
+        """
+        prefix = normalize_name(lowered)
+        for end in range(len(lowered) - 1, 0, -1):
+            cached = self.cache.peek(cache_key("autocomplete", lowered[:end]))
+            if cached is None:
+                continue
+            if isinstance(cached, NegativeResult):
+                if cached.reason == "empty":
+                    return []
+                continue  # An upstream error says nothing about the results
+            if cached["complete"]:
+                return [c for c in cached["cities"] if _matches_prefix(c, prefix)]
+        return None
     
+    def invalidate_city(self, city: str) -> int:
+        """Drop every cached discover/search result for a city."""
+        return self.cache.invalidate_tag(city_tag(city))
+
+    def invalidate_place(self, place_id: str) -> int:
+        """Drop a place's details and every cached list that contains it."""
+        return self.cache.invalidate_tag(place_tag(place_id))
+
     def get_photo_url(self, photo_reference: str, max_width: int = 400) -> str:
         """
         Get a URL for a place photo.
         
+        Photos (including fallback images) are served by our own caching
+        proxy, so the API key never reaches the browser.
+        
         Args:
             photo_reference: Photo reference from Places API
             max_width: Maximum width of the image
@@ -361,16 +931,12 @@ class PlacesService:
             URL string for the photo
         """
         if photo_reference.startswith("FALLBACK:"):
-            return photo_reference.replace("FALLBACK:", "")
+            url = photo_reference[len("FALLBACK:"):]
+            kind = next((t for t, u in FALLBACK_IMAGES.items() if u == url), "default")
+            photo_reference = f"{FALLBACK_PHOTO_PREFIX}{kind}"
 
-        settings = get_settings()
-        api_key = settings.GOOGLE_MAPS_API_KEY
-        return (
-            f"https://maps.googleapis.com/maps/api/place/photo"
-            f"?maxwidth={max_width}"
-            f"&photo_reference={photo_reference}"
-            f"&key={api_key}"
-        )
+        base = get_settings().PUBLIC_API_URL.rstrip("/")
+        return f"{base}/api/places/photo/{quote(photo_reference, safe='')}?w={max_width}"
 
 
 # Singleton instance
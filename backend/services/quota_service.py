@@ -0,0 +1,267 @@
+"""
+Quota Service - Central budget for every Google API call.
+
+Each Google API gets a token bucket (short-term rate) and a daily budget
+(reset at midnight Pacific, when Google's quotas reset). Calls carry a
+priority: background work (cache warming, enrichment) may only draw on
+the upper half of a bucket and a share of the daily budget, so a burst of
+warming can never starve interactive requests. A circuit breaker per API
+stops calling Google after repeated failures; callers catch
+UpstreamUnavailable and fall back to cached or cataloged data.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+import googlemaps
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+
+logger = get_logger('Odyssey.quota')
+
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# Short-term rate per API: (tokens per second, burst capacity)
+API_RATES: Dict[str, Tuple[float, float]] = {
+    "text_search": (10, 20),
+    "place_details": (10, 20),
+    "autocomplete": (20, 40),
+    "place_photo": (20, 40),
+    "distance_matrix_elements": (100, 200),
+}
+
+# Background calls need the bucket at least this full, and stop at this share of the daily budget
+BACKGROUND_MIN_BUCKET_FRACTION = 0.5
+
+# Google statuses that mean Google itself is degraded (counted by the breaker)
+DEGRADED_STATUSES = {"UNKNOWN_ERROR", "OVER_QUERY_LIMIT", "OVER_DAILY_LIMIT"}
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("upstream_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def background_priority():
+    """Run the enclosed Google calls at background priority."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """Priority of Google calls made from the current context."""
+    return _priority.get()
+
+
+class UpstreamUnavailable(Exception):
+    """A Google call was refused locally (rate, budget or open circuit)."""
+    def __init__(self, api: str, reason: str):
+        super().__init__(f"{api}: {reason}")
+        self.api = api
+        self.reason = reason
+
+
+def _is_degraded(error: Exception) -> bool:
+    """Failures that say Google is unhealthy, as opposed to a bad request."""
+    if isinstance(error, googlemaps.exceptions.ApiError):
+        return error.status in DEGRADED_STATUSES
+    return True
+
+
+class TokenBucket:
+    """Classic token bucket; refills continuously up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, cost: float, keep: float = 0) -> bool:
+        """Take `cost` tokens if that leaves at least `keep` in the bucket."""
+        self._refill()
+        if self.tokens - cost < keep:
+            return False
+        self.tokens -= cost
+        return True
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; lets one trial call through after a cooldown."""
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            return "half_open"
+        return "open"
+
+    def available(self) -> bool:
+        """Whether a call may go through now (doesn't claim the half-open trial)."""
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self.trial_in_flight)
+
+    def begin(self) -> None:
+        """Note an admitted call; in half-open state it becomes the trial."""
+        if self.state == "half_open":
+            self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class ApiBudget:
+    """Bucket, daily budget, breaker and counters for one Google API."""
+
+    def __init__(self, name: str, rate: float, capacity: float, daily_limit: int, breaker: CircuitBreaker):
+        self.name = name
+        self.bucket = TokenBucket(rate, capacity)
+        self.daily_limit = daily_limit
+        self.breaker = breaker
+        self.used_today = 0
+        self.calls = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.denied = {"rate_limited": 0, "budget_exhausted": 0, "circuit_open": 0}
+
+
+class QuotaManager:
+    """Admission control for Google calls; see module docstring."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.background_share = settings.QUOTA_BACKGROUND_SHARE
+        daily = {
+            "text_search": settings.QUOTA_TEXT_SEARCH_PER_DAY,
+            "place_details": settings.QUOTA_DETAILS_PER_DAY,
+            "autocomplete": settings.QUOTA_AUTOCOMPLETE_PER_DAY,
+            "place_photo": settings.QUOTA_PHOTOS_PER_DAY,
+            "distance_matrix_elements": settings.QUOTA_DISTANCE_ELEMENTS_PER_DAY,
+        }
+        self.apis = {
+            name: ApiBudget(
+                name, rate, capacity, daily[name],
+                CircuitBreaker(settings.UPSTREAM_BREAKER_FAILURES, settings.UPSTREAM_BREAKER_COOLDOWN_SECONDS)
+            )
+            for name, (rate, capacity) in API_RATES.items()
+        }
+        self._day = self._today()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+    def _roll_day(self) -> None:
+        """Reset daily usage at midnight Pacific. Caller holds the lock."""
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            for budget in self.apis.values():
+                budget.used_today = 0
+
+    def acquire(self, api: str, cost: int = 1) -> None:
+        """Admit a call or raise UpstreamUnavailable."""
+        priority = _priority.get()
+        with self._lock:
+            self._roll_day()
+            budget = self.apis[api]
+            background = priority == BACKGROUND
+
+            limit = budget.daily_limit * (self.background_share if background else 1)
+            if budget.used_today + cost > limit:
+                reason = "budget_exhausted"
+            elif not budget.breaker.available():
+                reason = "circuit_open"
+            elif not budget.bucket.try_take(
+                cost, keep=budget.bucket.capacity * BACKGROUND_MIN_BUCKET_FRACTION if background else 0
+            ):
+                reason = "rate_limited"
+            else:
+                budget.breaker.begin()
+                budget.used_today += cost
+                budget.calls[priority] += 1
+                return
+            budget.denied[reason] += 1
+
+        logger.warning(f"Refused {priority} {api} call: {reason}")
+        raise UpstreamUnavailable(api, reason)
+
+    def record(self, api: str, error: Optional[Exception] = None) -> None:
+        """Feed a call's outcome to the API's circuit breaker."""
+        with self._lock:
+            breaker = self.apis[api].breaker
+            if error is None or not _is_degraded(error):
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+                if breaker.state == "open":
+                    logger.error(f"Circuit open for {api} after {breaker.failures} failures")
+
+    def call(self, api: str, fn: Callable[..., Any], *args: Any, cost: int = 1, **kwargs: Any) -> Any:
+        """Run `fn(*args, **kwargs)` under the API's budget and breaker."""
+        self.acquire(api, cost)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.record(api, e)
+            raise
+        self.record(api)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Live budget usage per API."""
+        with self._lock:
+            self._roll_day()
+            stats = {}
+            for name, budget in self.apis.items():
+                budget.bucket._refill()
+                stats[name] = {
+                    "used_today": budget.used_today,
+                    "daily_limit": budget.daily_limit,
+                    "remaining_today": max(0, budget.daily_limit - budget.used_today),
+                    "tokens": round(budget.bucket.tokens, 1),
+                    "circuit": budget.breaker.state,
+                    "calls": dict(budget.calls),
+                    "denied": dict(budget.denied),
+                }
+            return {"day": self._day, "apis": stats}
+
+
+# Singleton instance
+_quota: Optional[QuotaManager] = None
+
+
+def get_quota_manager() -> QuotaManager:
+    """Get the singleton QuotaManager instance."""
+    global _quota
+    if _quota is None:
+        _quota = QuotaManager()
+    return _quota
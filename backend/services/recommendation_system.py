@@ -1,34 +1,21 @@
 """
 Recommendation Service - Rule-based scoring for places.
 """
-import math
-from typing import List, Dict, Any
+import hashlib
+from typing import List, Dict, Any, Union
+import numpy as np
 from backend.models.user_preferance import UserPreference, ActivityType, PriceRange
-from backend.models.place import Place
+from backend.models.place import PlaceRecord
+from backend.services.place_batch import (
+    PlaceBatch,
+    TYPE_TO_ACTIVITY,
+    activities_mask,
+    price_range_mask,
+)
+from backend.services.taste_profile import TasteProfile
 from backend.core.logging import get_logger
 logger = get_logger('Odyssey.recommendations')
 
-# Map Google place types to our activity types
-TYPE_TO_ACTIVITY = {
-    "park": ActivityType.OUTDOOR,
-    "natural_feature": ActivityType.OUTDOOR,
-    "campground": ActivityType.OUTDOOR,
-    "hiking_area": ActivityType.OUTDOOR,
-    "museum": ActivityType.CULTURAL,
-    "art_gallery": ActivityType.CULTURAL,
-    "library": ActivityType.CULTURAL,
-    "restaurant": ActivityType.FOOD,
-    "cafe": ActivityType.FOOD,
-    "bakery": ActivityType.FOOD,
-    "bar": ActivityType.NIGHTLIFE,
-    "night_club": ActivityType.NIGHTLIFE,
-    "shopping_mall": ActivityType.SHOPPING,
-    "store": ActivityType.SHOPPING,
-    "spa": ActivityType.RELAXATION,
-    "tourist_attraction": ActivityType.PHOTOGRAPHY,
-    "point_of_interest": ActivityType.ADVENTURE,
-}
-
 # Price level mapping (Google uses 0-4)
 PRICE_LEVEL_MAP = {
     PriceRange.FREE: 0,
@@ -38,71 +25,118 @@ PRICE_LEVEL_MAP = {
     PriceRange.LUXURY: 4,
 }
 
+# Number of set bits for every possible activity mask
+ACTIVITY_POPCOUNT = np.array([bin(m).count("1") for m in range(1 << len(ActivityType))], dtype=np.int64)
+
+def preference_key(preference: UserPreference) -> str:
+    """
+    Canonical hash of the preference fields that affect scoring (activities
+    and price range). Activity order, duplicates and every other field are
+    ignored, so equivalent quiz answers share cached results.
+    """
+    activities = sorted({a.value for a in preference.activities})
+    canonical = f"{','.join(activities)}|{preference.price_range.value}"
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
 class RecommendationService:
     """
     Rule-based recommendation engine.
-    Scores places based on user preferences.
+    Scores places based on user preferences, a whole candidate batch at once.
     """
 
-    def recommend(self, places: List[Place], perferances: UserPreference, limit: int = 15) -> List[Dict[str, Any]]:
+    def recommend(
+        self,
+        places: Union[List[PlaceRecord], PlaceBatch],
+        perferances: UserPreference,
+        limit: int = 15
+    ) -> List[Dict[str, Any]]:
         """
         Recommend places based on user preferences.
         
         Returns list of places with scores and reasoning.
         """
-        scored_places = []
-
-        for place in places:
-            score, reason = self._calculate_score(place, perferances)
-            scored_places.append({
-                'place': place,
-                'score': score,
-                'reasons': reason
-            })
-        
-        # Sort by score descending
-        scored_places.sort(key=lambda x: x['score'], reverse=True)
+        batch = places if isinstance(places, PlaceBatch) else PlaceBatch.from_records(places)
+        if not len(batch):
+            return []
+        scores = self.score_batch(batch, perferances)
+        top = top_k(scores, limit)
 
-        # Return top N results
-        return scored_places[:limit]
+        # Materialize records and build reasons only for what we return
+        return [
+            {
+                'place': batch.record(i),
+                'score': float(scores[i]),
+                'reasons': self._reasons(batch.record(i), perferances)
+            }
+            for i in top
+        ]
 
-    def _calculate_score(self, place: Place, preference: UserPreference) -> tuple[float, List[str]]:
-        """
-        Calculate a recommendation score for a place
-        """
-        score = 0.0
-        reasons = []
+    def score_batch(self, batch: PlaceBatch, preference: UserPreference) -> np.ndarray:
+        """Recommendation score of every place in the batch."""
+        wanted = activities_mask(preference.activities)
+        matches = ACTIVITY_POPCOUNT[batch.activity_mask & wanted]
 
         # 1. Base score from Google rating (0-5 -> 0-25 points)
-        if place.rating:
-            rating_score = place.rating * 5
-            score += rating_score
-            if place.rating >= 4.5:
-                reasons.append(f'Highly rated place with {place.rating} rating') 
+        scores = batch.rating * 5
 
         # 2. Activity match bonus (20 points per match)
-        place_activities = self._get_activities(place.types)        
-        matching = set(place_activities) & set(preference.activities)
-        score += len(matching) * 20
-        for activity in matching:
-            reasons.append(f'Matches activity your interests: {activity.value}')
-        
+        scores += matches * 20
+
         # 3. Popularity bonus (log scale, max +15)
-        if place.user_rating_total:
-            pop_score = min(15, math.log(place.user_rating_total + 1) * 2)
-            score += pop_score
-            if place.user_rating_total > 1000:
-                reasons.append("Very popular spot")
-        
+        scores += np.minimum(15, np.log1p(batch.reviews) * 2)
+
         # 4. Price alignment (+10 if within budget, -10 if over)
-        # Note: We don't have price_level in our current Place model
-        # This would need to be added from place details
-        
+        # price_level comes from search results or background enrichment
+        known = batch.price_mask != 0
+        within = (batch.price_mask & price_range_mask(0, PRICE_LEVEL_MAP[preference.price_range])) != 0
+        scores += np.where(known, np.where(within, 10, -10), 0)
+
         # 5. Penalty for no matching activities (-15)
-        if not matching and preference.activities:
-            score -= 15
-        
-        return score, reasons
+        if preference.activities:
+            scores -= np.where(matches == 0, 15, 0)
+
+        return scores
+
+    def personalize(
+        self,
+        scored: List[Dict[str, Any]],
+        profile: TasteProfile,
+        weight: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-rank scored results for one user: each place gains `weight` times
+        the user's affinity for its category. Returns new items, best first;
+        `scored` (usually shared through the cache) is left untouched.
+        """
+        personalized = []
+        for item in scored:
+            affinity = profile.place_affinity(item['place'].types)
+            if affinity > 0:
+                item = {
+                    **item,
+                    'score': item['score'] + weight * affinity,
+                    'reasons': item['reasons'] + ['Similar to places you often search for'],
+                }
+            personalized.append(item)
+        # Stable, so equal scores keep their original order
+        personalized.sort(key=lambda item: item['score'], reverse=True)
+        return personalized
+
+    def _reasons(self, place: PlaceRecord, preference: UserPreference) -> List[str]:
+        """Human-readable reasons for one place's score."""
+        reasons = []
+        if place.rating and place.rating >= 4.5:
+            reasons.append(f'Highly rated place with {place.rating} rating')
+        matching = set(self._get_activities(place.types)) & set(preference.activities)
+        for activity in ActivityType:
+            if activity in matching:
+                reasons.append(f'Matches activity your interests: {activity.value}')
+        if place.user_rating_total and place.user_rating_total > 1000:
+            reasons.append("Very popular spot")
+        if place.price_level is not None and place.price_level <= PRICE_LEVEL_MAP[preference.price_range]:
+            reasons.append("Within your budget")
+        return reasons
 
     def _get_activities(self, types: List[str]) -> List[ActivityType]:
         """Map Google place types to our activity types."""
@@ -113,6 +147,24 @@ class RecommendationService:
                 if activity not in activities:
                     activities.append(activity)
         return activities
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first. Uses argpartition rather
+    than a full sort; ties keep their original order, as a stable sort would.
+    """
+    n = len(scores)
+    if k < n:
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        candidates = np.concatenate([above, ties])
+    else:
+        candidates = np.arange(n)
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
 # Singleton
 _service = None
 def get_recommendation_service() -> RecommendationService:
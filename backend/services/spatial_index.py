@@ -0,0 +1,141 @@
+"""
+Spatial Index - In-memory grid over every known place's coordinates.
+
+Places are bucketed into fixed lat/lng cells (about 1 km at California
+latitudes). A radius query only visits the cells overlapping the circle's
+bounding box, then filters by exact great-circle distance.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from backend.core.logging import get_logger
+from backend.models.place import PlaceRecord
+
+logger = get_logger('Odyssey.spatial')
+
+CELL_DEGREES = 0.01
+EARTH_RADIUS_M = 6_371_000
+METERS_PER_DEGREE_LAT = 111_320
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in meters."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return (math.floor(lat / CELL_DEGREES), math.floor(lng / CELL_DEGREES))
+
+
+class SpatialIndex:
+    """Grid-bucketed place index, safe to update from request threads."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._places: Dict[str, PlaceRecord] = {}
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._place_cells: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    def add(self, place: PlaceRecord) -> None:
+        """Insert or move a place. Places without coordinates are ignored."""
+        if not place.id or not place.coordinates:
+            return
+        cell = _cell(place.coordinates.lat, place.coordinates.lng)
+        with self._lock:
+            old_cell = self._place_cells.get(place.id)
+            if old_cell is not None and old_cell != cell:
+                self._cells[old_cell].discard(place.id)
+            self._places[place.id] = place
+            self._place_cells[place.id] = cell
+            self._cells.setdefault(cell, set()).add(place.id)
+
+    def add_many(self, places: Iterable[PlaceRecord]) -> None:
+        for place in places:
+            self.add(place)
+
+    def remove(self, place_id: str) -> None:
+        with self._lock:
+            cell = self._place_cells.pop(place_id, None)
+            self._places.pop(place_id, None)
+            if cell is not None:
+                self._cells[cell].discard(place_id)
+
+    def within(
+        self,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        types: Optional[Set[str]] = None
+    ) -> List[PlaceRecord]:
+        """
+        Places inside a bounding box, optionally limited to some types. Boxes
+        spanning more cells than are populated (low map zooms) scan the
+        populated cells instead, so the cost never exceeds the index size.
+        """
+        (min_row, min_col), (max_row, max_col) = _cell(south, west), _cell(north, east)
+        span = (max_row - min_row + 1) * (max_col - min_col + 1)
+        found = []
+        with self._lock:
+            if span > len(self._cells):
+                cells = [ids for (row, col), ids in self._cells.items()
+                         if min_row <= row <= max_row and min_col <= col <= max_col]
+            else:
+                cells = [self._cells.get((row, col), ())
+                         for row in range(min_row, max_row + 1)
+                         for col in range(min_col, max_col + 1)]
+            for ids in cells:
+                for place_id in ids:
+                    place = self._places[place_id]
+                    c = place.coordinates
+                    if not (south <= c.lat <= north and west <= c.lng <= east):
+                        continue
+                    if types and not types.intersection(place.types):
+                        continue
+                    found.append(place)
+        return found
+
+    def nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        types: Optional[Set[str]] = None,
+        limit: int = 20
+    ) -> List[Tuple[PlaceRecord, float]]:
+        """(place, distance in meters) pairs within `radius_m`, nearest first."""
+        d_lat = radius_m / METERS_PER_DEGREE_LAT
+        d_lng = d_lat / max(math.cos(math.radians(lat)), 1e-6)
+        candidates = self.within(lat - d_lat, lng - d_lng, lat + d_lat, lng + d_lng, types)
+
+        results = []
+        for place in candidates:
+            distance = haversine_m(lat, lng, place.coordinates.lat, place.coordinates.lng)
+            if distance <= radius_m:
+                results.append((place, distance))
+        results.sort(key=lambda r: r[1])
+        return results[:limit]
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"places": len(self._places), "cells": sum(1 for ids in self._cells.values() if ids)}
+
+
+# Singleton instance
+_index: Optional[SpatialIndex] = None
+
+
+def get_spatial_index() -> SpatialIndex:
+    """Get the singleton SpatialIndex instance."""
+    global _index
+    if _index is None:
+        _index = SpatialIndex()
+    return _index
@@ -0,0 +1,178 @@
+"""
+Taste Profile Service - Per-user category and city affinities from search history.
+
+Each authenticated discover adds one observation to the user's profile:
+the city searched and the categories picked. Counts decay exponentially
+(TASTE_HALF_LIFE_DAYS), so recent searches outweigh old ones. Updates
+are incremental; decaying is one multiply per key the profile already
+holds, and the full history is never recomputed. Affinities are
+ratios of decayed counts to decayed searches, so reads don't need to
+apply any decay.
+
+Profiles live in memory. After a restart, a user's profile is rebuilt
+once, on first use, by replaying their latest TASTE_SEED_ROWS history
+rows through the same update.
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy.orm import Session
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+from backend.models.db import SearchHistory
+from backend.services.places_service import PLACE_TYPES, normalize_city
+
+logger = get_logger('Odyssey.taste')
+
+EPOCH = datetime(1970, 1, 1)
+
+# Google place type -> discover categories it belongs to
+TYPE_TO_CATEGORIES: Dict[str, List[str]] = {}
+for _category, _types in PLACE_TYPES.items():
+    for _t in _types:
+        TYPE_TO_CATEGORIES.setdefault(_t, []).append(_category)
+
+
+def history_categories(query: Optional[str]) -> List[str]:
+    """Categories stored in a SearchHistory query ("outdoor,culture")."""
+    return [c for c in (query or "").split(",") if c in PLACE_TYPES]
+
+
+class TasteProfile:
+    """Recency-decayed search counts for one user; see module docstring."""
+    __slots__ = ("categories", "cities", "searches", "updated_at")
+
+    def __init__(self):
+        self.categories: Dict[str, float] = {}
+        self.cities: Dict[str, float] = {}
+        self.searches = 0.0        # Decayed number of searches
+        self.updated_at = 0.0      # Seconds since epoch the counts are decayed to
+
+    def record(self, city: str, categories: Iterable[str], at: float, half_life: float) -> None:
+        """Add one search at time `at` (seconds since epoch)."""
+        weight = 1.0
+        if at >= self.updated_at:
+            decay = 0.5 ** ((at - self.updated_at) / half_life) if self.searches else 1.0
+            if decay < 1.0:
+                for counts in (self.categories, self.cities):
+                    for key in counts:
+                        counts[key] *= decay
+                self.searches *= decay
+            self.updated_at = at
+        else:
+            # Out of order: weigh the older search as of `updated_at`
+            weight = 0.5 ** ((self.updated_at - at) / half_life)
+
+        self.searches += weight
+        self.cities[city] = self.cities.get(city, 0.0) + weight
+        for category in set(categories):
+            self.categories[category] = self.categories.get(category, 0.0) + weight
+
+    def category_affinity(self, category: str) -> float:
+        """Share of (decayed) searches that included `category`, 0..1."""
+        return self.categories.get(category, 0.0) / self.searches if self.searches else 0.0
+
+    def city_affinity(self, city: str) -> float:
+        """Share of (decayed) searches made in `city`, 0..1."""
+        return self.cities.get(city, 0.0) / self.searches if self.searches else 0.0
+
+    def place_affinity(self, types: Iterable[str]) -> float:
+        """Highest affinity among the categories a place's Google types belong to."""
+        best = 0.0
+        for t in types:
+            for category in TYPE_TO_CATEGORIES.get(t, ()):
+                best = max(best, self.category_affinity(category))
+        return best
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "searches": round(self.searches, 2),
+            "categories": {c: round(self.category_affinity(c), 3) for c in self.categories},
+            "cities": {c: round(self.city_affinity(c), 3) for c in self.cities},
+        }
+
+
+class TasteProfileStore:
+    """In-memory profiles keyed by user id; see module docstring."""
+
+    def __init__(self, half_life_days: Optional[float] = None, seed_rows: Optional[int] = None):
+        settings = get_settings()
+        days = half_life_days if half_life_days is not None else settings.TASTE_HALF_LIFE_DAYS
+        self.half_life = days * 86400
+        self.seed_rows = seed_rows if seed_rows is not None else settings.TASTE_SEED_ROWS
+        self._profiles: Dict[int, TasteProfile] = {}
+        self._seeded: Set[int] = set()
+        self._lock = threading.Lock()
+        self.seeds = 0
+        self.updates = 0
+
+    def get(self, user_id: int) -> Optional[TasteProfile]:
+        """The user's profile, or None if they have no searches (no DB access)."""
+        return self._profiles.get(user_id)
+
+    def ensure(self, user_id: int, db: Session) -> Optional[TasteProfile]:
+        """Like get(), but first rebuilds the profile from history if this process hasn't yet."""
+        if user_id not in self._seeded:
+            self._seed(user_id, db)
+        return self._profiles.get(user_id)
+
+    def record(self, user_id: int, city: str, categories: Iterable[str], at: Optional[datetime] = None) -> None:
+        """Apply one newly written history row to the user's profile."""
+        seconds = ((at or datetime.utcnow()) - EPOCH).total_seconds()
+        with self._lock:
+            profile = self._profiles.get(user_id)
+            if profile is None:
+                profile = self._profiles[user_id] = TasteProfile()
+            profile.record(normalize_city(city), categories, seconds, self.half_life)
+            self.updates += 1
+
+    def _seed(self, user_id: int, db: Session) -> None:
+        try:
+            rows = (
+                db.query(SearchHistory.city, SearchHistory.query, SearchHistory.timestamp)
+                .filter(SearchHistory.user_id == user_id)
+                .order_by(SearchHistory.timestamp.desc())
+                .limit(self.seed_rows)
+                .all()
+            )
+        except Exception as e:
+            logger.error(f"Failed to load search history for user {user_id}: {e}")
+            return
+
+        profile = TasteProfile()
+        for city, query, timestamp in reversed(rows):
+            if city and timestamp:
+                profile.record(normalize_city(city), history_categories(query),
+                               (timestamp - EPOCH).total_seconds(), self.half_life)
+        with self._lock:
+            if user_id in self._seeded:
+                return  # Another request got here first
+            if profile.searches:
+                self._profiles[user_id] = profile
+            self._seeded.add(user_id)
+            self.seeds += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+            self._seeded.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "profiles": len(self._profiles),
+            "seeded_from_history": self.seeds,
+            "incremental_updates": self.updates,
+        }
+
+
+# Singleton instance
+_store: Optional[TasteProfileStore] = None
+
+
+def get_taste_profile_store() -> TasteProfileStore:
+    """Get the singleton TasteProfileStore instance."""
+    global _store
+    if _store is None:
+        _store = TasteProfileStore()
+    return _store
@@ -0,0 +1,266 @@
+"""
+Upstream Service - Hedged, retried Google calls with per-endpoint latency histograms.
+
+Every Google call runs on a small thread pool. Once an endpoint has
+enough latency samples, an interactive call still outstanding at the
+endpoint's p95 gets a hedged duplicate, and whichever response arrives
+first wins. Retryable failures (timeouts, transport errors, 5xx,
+UNKNOWN_ERROR) are retried with full-jitter backoff; everything else is
+raised immediately. Each attempt, hedges included, is admitted and
+charged by the QuotaManager, so hedging can never overspend a budget.
+
+Stats compare the latency of single attempts with the latency callers
+actually observed, next to the number of extra calls hedging cost.
+"""
+
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+import googlemaps
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+from backend.services.quota_service import (
+    get_quota_manager,
+    current_priority,
+    QuotaManager,
+    UpstreamUnavailable,
+    INTERACTIVE,
+)
+
+logger = get_logger('Odyssey.upstream')
+
+# Log-spaced latency buckets (upper bounds, seconds): 5 ms .. ~40 s
+LATENCY_BUCKETS: List[float] = [0.005 * 1.25 ** i for i in range(41)]
+
+# Halve all counts once this many samples accumulate, so quantiles track recent latency
+HISTOGRAM_DECAY_AT = 2000
+
+RETRYABLE_STATUSES = {"UNKNOWN_ERROR"}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Failures worth retrying: timeouts, transport errors, 5xx and UNKNOWN_ERROR."""
+    if isinstance(error, googlemaps.exceptions.HTTPError):  # Subclass of TransportError
+        return str(error.status_code).startswith("5")
+    if isinstance(error, (googlemaps.exceptions.Timeout, googlemaps.exceptions.TransportError)):
+        return True
+    if isinstance(error, googlemaps.exceptions.ApiError):
+        return error.status in RETRYABLE_STATUSES
+    return False
+
+
+def google_client(key: str) -> googlemaps.Client:
+    """
+    A googlemaps client that makes exactly one HTTP request per call.
+
+    UpstreamCaller owns retries, hedging and quota accounting, so the
+    client's own retry loops are turned off: retry_over_query_limit=False
+    for quota errors, and a wrapper on `_request` for 5xx responses, which
+    the client otherwise retries internally until `retry_timeout` runs
+    out. `retry_timeout` itself must stay positive, as the client checks
+    it before the first attempt.
+    """
+    settings = get_settings()
+    client = googlemaps.Client(
+        key=key,
+        timeout=settings.UPSTREAM_TIMEOUT_SECONDS,
+        retry_timeout=settings.UPSTREAM_TIMEOUT_SECONDS,
+        retry_over_query_limit=False
+    )
+
+    last_status = threading.local()
+
+    def remember_status(response, *args, **kwargs):
+        last_status.code = response.status_code
+
+    client.session.hooks["response"].append(remember_status)
+    request = client._request
+
+    def single_attempt(url, params, first_request_time=None, retry_counter=0, *args, **kwargs):
+        if retry_counter:
+            # The client only re-enters itself to retry a 5xx; report it instead
+            raise googlemaps.exceptions.HTTPError(getattr(last_status, "code", 503))
+        return request(url, params, first_request_time, retry_counter, *args, **kwargs)
+
+    client._request = single_attempt
+    return client
+
+
+class LatencyHistogram:
+    """Bucketed latency counts with decay; quantiles resolve to a bucket bound."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+        with self._lock:
+            self.counts[index] += 1
+            self.total += 1
+            if self.total >= HISTOGRAM_DECAY_AT:
+                self.counts = [c // 2 for c in self.counts]
+                self.total = sum(self.counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding quantile `q`, or None without samples."""
+        with self._lock:
+            if not self.total:
+                return None
+            target = q * self.total
+            seen = 0
+            for i, count in enumerate(self.counts):
+                seen += count
+                if seen >= target and count:
+                    return LATENCY_BUCKETS[min(i, len(LATENCY_BUCKETS) - 1)]
+            return LATENCY_BUCKETS[-1]
+
+    def summary(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 1)
+        return {
+            "samples": self.total,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+        }
+
+
+class EndpointStats:
+    """Latency histograms and counters for one Google endpoint."""
+
+    def __init__(self):
+        self.attempts = LatencyHistogram()   # Each individual Google request
+        self.observed = LatencyHistogram()   # What the caller waited, hedging included
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+        self.errors = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "retries": self.retries,
+            "errors": self.errors,
+            "extra_call_ratio": round((self.hedges + self.retries) / self.calls, 3) if self.calls else 0.0,
+            "attempt_latency": self.attempts.summary(),
+            "observed_latency": self.observed.summary(),
+        }
+
+
+class UpstreamCaller:
+    """Runs Google calls with quota admission, hedging and retries; see module docstring."""
+
+    def __init__(self, quota: Optional[QuotaManager] = None, max_workers: int = 32):
+        self.settings = get_settings()
+        self.quota = quota or get_quota_manager()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upstream")
+
+    def _stats(self, api: str) -> EndpointStats:
+        with self._lock:
+            if api not in self.endpoints:
+                self.endpoints[api] = EndpointStats()
+            return self.endpoints[api]
+
+    def hedge_delay(self, api: str) -> Optional[float]:
+        """Seconds to wait before hedging `api`, or None if hedging is off for it."""
+        if not self.settings.HEDGE_ENABLED or current_priority() != INTERACTIVE:
+            return None
+        histogram = self._stats(api).attempts
+        if histogram.total < self.settings.HEDGE_MIN_SAMPLES:
+            return None
+        return max(self.settings.HEDGE_MIN_DELAY_SECONDS, histogram.quantile(self.settings.HEDGE_QUANTILE))
+
+    def call(self, api: str, fn: Callable[..., Any], *args: Any, cost: int = 1, **kwargs: Any) -> Any:
+        """Call `fn(*args, **kwargs)` against Google endpoint `api`."""
+        stats = self._stats(api)
+        stats.calls += 1
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                result = self._hedged(api, stats, fn, args, kwargs, cost)
+                stats.observed.record(time.perf_counter() - start)
+                return result
+            except UpstreamUnavailable:
+                raise
+            except Exception as e:
+                if attempt >= self.settings.UPSTREAM_MAX_RETRIES or not is_retryable(e):
+                    stats.errors += 1
+                    raise
+                attempt += 1
+                stats.retries += 1
+                backoff = random.uniform(0, self.settings.UPSTREAM_RETRY_BASE_SECONDS * 2 ** attempt)
+                logger.warning(f"Retrying {api} in {backoff:.2f}s after {type(e).__name__} (attempt {attempt})")
+                time.sleep(backoff)
+
+    def _submit(self, api: str, stats: EndpointStats, fn: Callable[..., Any], args, kwargs, cost: int) -> Future:
+        """Admit one attempt against the quota (may raise UpstreamUnavailable) and start it."""
+        self.quota.acquire(api, cost)
+
+        def attempt():
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self.quota.record(api, e)
+                raise
+            stats.attempts.record(time.perf_counter() - started)
+            self.quota.record(api)
+            return result
+        # Copy the context so the worker runs at the caller's priority
+        return self._executor.submit(contextvars.copy_context().run, attempt)
+
+    def _hedged(self, api: str, stats: EndpointStats, fn: Callable[..., Any], args, kwargs, cost: int) -> Any:
+        primary = self._submit(api, stats, fn, args, kwargs, cost)
+        delay = self.hedge_delay(api)
+        if delay is None:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        try:
+            hedge = self._submit(api, stats, fn, args, kwargs, cost)
+        except UpstreamUnavailable:
+            return primary.result()  # Don't hedge what the budget can't afford
+        stats.hedges += 1
+
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        stats.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = dict(self.endpoints)
+        return {api: stats.to_dict() for api, stats in endpoints.items()}
+
+
+# Singleton instance
+_upstream: Optional[UpstreamCaller] = None
+
+
+def get_upstream_caller() -> UpstreamCaller:
+    """Get the singleton UpstreamCaller instance."""
+    global _upstream
+    if _upstream is None:
+        _upstream = UpstreamCaller()
+    return _upstream
@@ -0,0 +1,137 @@
+"""
+Cache Warming Service - Refreshes popular discover results before they expire.
+Ranks (city, categories) pairs from recent SearchHistory and spends a
+bounded number of Google calls per cycle during off-peak hours.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from backend.core.config import get_settings
+from backend.core.database import SessionLocal
+from backend.core.logging import get_logger
+from backend.models.db import SearchHistory
+from backend.services.places_service import (
+    get_places_service,
+    canonical_categories,
+    normalize_city,
+    PLACE_TYPES,
+)
+from backend.services.quota_service import background_priority
+
+logger = get_logger('Odyssey.warming')
+
+WarmTarget = Tuple[str, List[str], int]  # (city, categories, searches)
+
+
+def rank_warm_targets(db: Session, since: datetime, limit: int = 50) -> List[WarmTarget]:
+    """
+    Aggregate search history since `since` into (city, categories) pairs,
+    most searched first. Categories are canonicalized so different orders
+    of the same selection count together.
+    """
+    rows = (
+        db.query(SearchHistory.city, SearchHistory.query, func.count(SearchHistory.id))
+        .filter(SearchHistory.timestamp >= since)
+        .group_by(SearchHistory.city, SearchHistory.query)
+        .all()
+    )
+
+    counts: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+    for city, query, count in rows:
+        if not city:
+            continue
+        categories = [c for c in (query or "").split(",") if c in PLACE_TYPES]
+        key = (normalize_city(city), tuple(canonical_categories(categories)))
+        counts[key] = counts.get(key, 0) + count
+
+    ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+    return [(city, list(categories), count) for (city, categories), count in ranked[:limit]]
+
+
+def in_warm_window(hours: str, now: Optional[datetime] = None) -> bool:
+    """Check whether the local hour falls in a "start-end" window (may wrap midnight)."""
+    start, end = (int(h) for h in hours.split("-"))
+    hour = (now or datetime.now()).hour
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+class CacheWarmer:
+    """
+    Refreshes the most searched discover results ahead of expiry.
+    Each cycle stops once its Google-call budget is spent.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    def run_cycle(self, db: Session, budget: Optional[int] = None) -> Dict[str, Any]:
+        """Warm the top-ranked targets. Returns a report of the cycle."""
+        start = time.perf_counter()
+        budget = self.settings.CACHE_WARM_BUDGET if budget is None else budget
+        since = datetime.utcnow() - timedelta(days=self.settings.CACHE_WARM_HISTORY_DAYS)
+        targets = rank_warm_targets(db, since, self.settings.CACHE_WARM_TOP_N)
+
+        service = get_places_service()
+        calls = 0
+        warmed = 0
+        with background_priority():
+            for city, categories, _ in targets:
+                if calls >= budget:
+                    break
+                used = service.warm_discover(
+                    city,
+                    categories,
+                    refresh_within=self.settings.CACHE_WARM_REFRESH_WITHIN_SECONDS,
+                    budget=budget - calls
+                )
+                calls += used
+                if used:
+                    warmed += 1
+
+        self.last_report = {
+            "finished_at": datetime.utcnow().isoformat(),
+            "targets": len(targets),
+            "warmed": warmed,
+            "google_calls": calls,
+            "budget": budget,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        logger.info(f"Cache warming cycle: {self.last_report}")
+        return self.last_report
+
+    def _run_cycle_with_session(self) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            return self.run_cycle(db)
+        finally:
+            db.close()
+
+    async def run_periodically(self) -> None:
+        """Background task: run a cycle every interval during off-peak hours."""
+        while True:
+            await asyncio.sleep(self.settings.CACHE_WARM_INTERVAL_SECONDS)
+            if not in_warm_window(self.settings.CACHE_WARM_HOURS):
+                continue
+            try:
+                await asyncio.to_thread(self._run_cycle_with_session)
+            except Exception as e:
+                logger.error(f"Cache warming cycle failed: {e}")
+
+
+# Singleton instance
+_warmer: Optional[CacheWarmer] = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get the singleton CacheWarmer instance."""
+    global _warmer
+    if _warmer is None:
+        _warmer = CacheWarmer()
+    return _warmer
@@ -75,8 +75,8 @@ def test_image_fallback():
         }
         place_park = service._parse_place(data_park)
         url_park = service.get_photo_url(place_park.photo_reference)
-        assert "unsplash.com" in url_park
-        assert url_park == FALLBACK_IMAGES["park"]
+        assert place_park.photo_reference == f"FALLBACK:{FALLBACK_IMAGES['park']}"
+        assert url_park.endswith("/api/places/photo/fallback-park?w=400")
         
         # Case 2: No photo ref, unknown type
         data_unknown = {
@@ -86,7 +86,7 @@ def test_image_fallback():
         }
         place_unknown = service._parse_place(data_unknown)
         url_unknown = service.get_photo_url(place_unknown.photo_reference)
-        assert "unsplash.com" in url_unknown
+        assert url_unknown.endswith("/api/places/photo/fallback-default?w=400")
         
         print("Image fallback logic verified!")
 
@@ -0,0 +1,325 @@
+"""Tests for the in-memory cache service."""
+import pickle
+import pytest
+from datetime import datetime, timedelta
+from backend.services.cache_service import (
+    InMemoryCache,
+    EncodedValue,
+    NAMESPACE_DEFAULTS,
+    NegativeResult,
+    SNAPSHOT_MAGIC,
+)
+from backend.services.place_store import PlaceList
+
+
+class TestCacheSnapshots:
+    """Tests for snapshot persistence across restarts."""
+
+    def test_snapshot_roundtrip(self, tmp_path):
+        """Test that live entries survive a save/load cycle."""
+        path = tmp_path / "snapshot.bin"
+        cache = InMemoryCache()
+        cache.set("discover:san_francisco", [{"id": "abc", "name": "Golden Gate Park"}])
+        cache.set("place:abc", {"id": "abc"}, ttl=60)
+
+        assert cache.save_snapshot(str(path)) == 2
+
+        restored = InMemoryCache()
+        report = restored.load_snapshot(str(path))
+
+        assert report["loaded"] == 2
+        assert restored.get("discover:san_francisco")[0]["name"] == "Golden Gate Park"
+        assert restored.get("place:abc") == {"id": "abc"}
+
+    def test_snapshot_skips_expired_entries(self, tmp_path):
+        """Test that entries expired by restore time are not loaded."""
+        path = tmp_path / "snapshot.bin"
+        now = datetime.now()
+        with open(path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            pickle.dump(("fresh", (now + timedelta(hours=1)).timestamp(), (), 1), f)
+            pickle.dump(("stale", (now - timedelta(seconds=1)).timestamp(), (), 2), f)
+
+        restored = InMemoryCache()
+        report = restored.load_snapshot(str(path))
+
+        assert report["loaded"] == 1
+        assert report["skipped"] == 1
+        assert restored.get("fresh") == 1
+        assert restored.get("stale") is None
+
+    def test_load_missing_snapshot(self, tmp_path):
+        """Test that a missing snapshot file is a no-op."""
+        report = InMemoryCache().load_snapshot(str(tmp_path / "missing.bin"))
+        assert report["loaded"] == 0
+
+
+class TestRenderedBodies:
+    """Tests for pre-rendered response bodies attached to entries."""
+
+    def test_rendered_body_served_while_entry_lives(self):
+        """Test that a rendered body is returned for its live entry."""
+        cache = InMemoryCache()
+        cache.set("place:abc", {"id": "abc"})
+
+        assert cache.set_rendered("place:abc", b'{"id":"abc"}')
+        assert cache.get_rendered("place:abc") == b'{"id":"abc"}'
+
+    def test_rendered_body_dropped_with_entry(self):
+        """Test that overwriting or deleting the entry invalidates its body."""
+        cache = InMemoryCache()
+        cache.set("place:abc", {"id": "abc"})
+        cache.set_rendered("place:abc", b"old")
+
+        cache.set("place:abc", {"id": "abc", "name": "New"})
+        assert cache.get_rendered("place:abc") is None
+
+        cache.set_rendered("place:abc", b"new")
+        cache.delete("place:abc")
+        assert cache.get_rendered("place:abc") is None
+
+    def test_set_rendered_requires_entry(self):
+        """Test that bodies are not stored without underlying data."""
+        cache = InMemoryCache()
+        assert not cache.set_rendered("missing", b"{}")
+
+
+class TestNamespacesAndTags:
+    """Tests for namespaced stats, size limits and tag invalidation."""
+
+    def test_namespace_stats_are_separate(self):
+        """Test that hits and misses are counted per key namespace."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [1])
+        cache.get("discover:sf")
+        cache.get("autocomplete:san")
+
+        stats = cache.get_stats()["namespaces"]
+        assert stats["discover"]["hits"] == 1
+        assert stats["discover"]["misses"] == 0
+        assert stats["autocomplete"]["misses"] == 1
+        assert stats["autocomplete"]["ttl"] == 3600
+
+    def test_namespace_evicts_least_recently_used(self, monkeypatch):
+        """Test that a full namespace evicts its LRU entry only."""
+        monkeypatch.setitem(NAMESPACE_DEFAULTS, "search", (60, 2, False))
+        cache = InMemoryCache()
+        cache.set("search:a", 1)
+        cache.set("search:b", 2)
+        cache.set("place:x", 3)
+        cache.get("search:a")
+        cache.set("search:c", 4)
+
+        assert cache.get("search:b") is None
+        assert cache.get("search:a") == 1
+        assert cache.get("place:x") == 3
+        assert cache.get_stats()["namespaces"]["search"]["evictions"] == 1
+
+    def test_invalidate_tag(self):
+        """Test that a tag drops all of its entries and nothing else."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [1], tags=["city:sf", "place_id:abc"])
+        cache.set("search:sf", [2], tags=["city:sf"])
+        cache.set("discover:la", [3], tags=["city:la", "place_id:abc"])
+
+        assert cache.invalidate_tag("city:sf") == 2
+        assert cache.get("discover:sf") is None
+        assert cache.get("discover:la") == [3]
+
+        assert cache.invalidate_tag("place_id:abc") == 1
+        assert cache.invalidate_tag("city:sf") == 0
+
+    def test_update_tagged_keeps_expiry_and_drops_bodies(self):
+        """Test that tagged entries are rewritten in place."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [1], ttl=60, tags=["place_id:abc"])
+        cache.set_rendered("discover:sf", b"[1]")
+        cache.set_negative("place:abc", tags=["place_id:abc"])
+
+        assert cache.update_tagged("place_id:abc", lambda v: v + [2]) == 1
+        assert cache.get("discover:sf") == [1, 2]
+        assert cache.get_rendered("discover:sf") is None
+        assert 0 < cache.expires_in("discover:sf") <= 60
+        assert isinstance(cache.get("place:abc"), NegativeResult)
+
+    def test_negative_entries_are_counted(self):
+        """Test that negative entries are returned as markers and counted."""
+        cache = InMemoryCache()
+        cache.set_negative("search:zzz")
+
+        assert isinstance(cache.get("search:zzz"), NegativeResult)
+        assert cache.get_stats()["namespaces"]["search"]["negative_hits"] == 1
+
+
+class TestEncodedValues:
+    """Tests for compressed value encoding in place namespaces."""
+
+    def test_encoded_namespace_roundtrip(self):
+        """Test that encoded values decode to equal objects."""
+        cache = InMemoryCache()
+        place = {"id": "abc", "name": "Cafe", "types": ["cafe", "food"], "reviews": ["Great"] * 30}
+        cache.set("place:abc", place)
+
+        assert isinstance(cache._cache["place:abc"].value, EncodedValue)
+        assert cache.get("place:abc") == place
+
+    def test_compression_ratio_reported(self):
+        """Test that encoded namespaces report their compression ratio."""
+        cache = InMemoryCache()
+        cache.set("place:abc", {"id": "abc", "reviews": [{"text": "Great coffee"}] * 30})
+
+        stats = cache.get_stats()["namespaces"]["place"]
+        assert stats["encoded_bytes"] < stats["raw_bytes"]
+        assert stats["compression_ratio"].endswith("x")
+
+        cache.delete("place:abc")
+        assert cache.get_stats()["namespaces"]["place"]["raw_bytes"] == 0
+
+    def test_unencoded_namespace_keeps_objects(self):
+        """Test that namespaces without encoding store values as-is."""
+        cache = InMemoryCache()
+        cities = [{"name": "San Francisco"}]
+        cache.set("autocomplete:san", cities)
+        assert cache.get("autocomplete:san") is cities
+
+
+class TestSharedPlaces:
+    """Tests for place lists sharing one record per place."""
+
+    def test_lists_share_one_record(self):
+        """Test that a place in several lists is stored once, encoded."""
+        cache = InMemoryCache()
+        bridge = {"id": "ggb", "name": "Golden Gate Bridge", "types": ["tourist_attraction"]}
+        cache.set("discover:sf", [bridge, {"id": "p2", "name": "Park", "types": ["park"]}])
+        cache.set("search:bridge", {"fetched_at": 1.0, "places": [dict(bridge)]})
+
+        assert isinstance(cache._cache["discover:sf"].value, PlaceList)
+        cached = cache.get("search:bridge")
+        assert cached["fetched_at"] == 1.0
+        assert cached["places"][0]["name"] == "Golden Gate Bridge"
+        assert cache.get_stats()["shared_places"]["records"] == 2
+        assert cache.get_stats()["shared_places"]["references"] == 3
+        assert isinstance(cache.places._records["ggb"], EncodedValue)
+
+    def test_shared_records_are_compressed(self):
+        """Test that shared records keep discover/search compression, reported under shared_places."""
+        cache = InMemoryCache()
+        places = [{
+            "id": f"p{i}",
+            "name": f"Place {i}",
+            "types": ["tourist_attraction", "point_of_interest", "establishment"],
+            "description": "A popular destination in San Francisco, California. " * 3,
+        } for i in range(20)]
+        cache.set("discover:sf", places)
+
+        stats = cache.get_stats()
+        assert stats["shared_places"]["encoded_bytes"] < stats["shared_places"]["raw_bytes"]
+        assert stats["shared_places"]["compression_ratio"] != "0.0x"
+        assert "compression_ratio" not in stats["namespaces"]["discover"]
+        assert cache.get("discover:sf") == places
+
+    def test_cleanup_frees_records_of_expired_lists(self):
+        """Test that the periodic sweep releases records held only by expired lists."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [{"id": "p1", "name": "A"}], ttl=-1)
+        cache.set("search:sf:park", [{"id": "p2", "name": "B"}])
+
+        assert cache.cleanup_expired() == 1
+        assert cache.get_stats()["shared_places"]["records"] == 1
+        assert cache.get("search:sf:park")[0]["name"] == "B"
+
+    def test_single_key_refetch_keeps_enriched_fields(self):
+        """Test that re-setting the only list holding a place keeps its enriched hours."""
+        cache = InMemoryCache()
+        cache.set("discover:sf:a", [{"id": "p1", "name": "A"}, {"id": "p2", "name": "B"}])
+        hours = {"open_now": True, "weekday_text": ["Monday: 9 AM - 5 PM"]}
+        cache.update_place("p1", {"opening_hours": hours, "price_level": 2})
+
+        cache.set("discover:sf:a", [{"id": "p1", "name": "A2", "opening_hours": None}])
+        place = cache.get("discover:sf:a")[0]
+        assert place["name"] == "A2"
+        assert place["opening_hours"] == hours
+        assert place["price_level"] == 2
+        assert len(cache.places) == 1
+        assert cache.get_stats()["shared_places"]["references"] == 1
+
+    def test_records_freed_with_last_reference(self):
+        """Test that a record lives exactly as long as some entry references it."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [{"id": "a", "name": "A"}])
+        cache.set("search:a", [{"id": "a", "name": "A"}])
+
+        cache.delete("discover:sf")
+        assert len(cache.places) == 1
+        cache.delete("search:a")
+        assert len(cache.places) == 0
+
+    def test_update_place_is_one_write(self):
+        """Test that updating a place changes every list holding it and drops rendered bodies."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [{"id": "a", "name": "A", "price_level": None}])
+        cache.set("search:a", [{"id": "a", "name": "A", "price_level": None}])
+        cache.set_rendered("discover:sf", b"[]")
+
+        assert cache.update_place("a", {"price_level": 2}) == 2
+        assert cache.get("discover:sf")[0]["price_level"] == 2
+        assert cache.get("search:a")[0]["price_level"] == 2
+        assert cache.get_rendered("discover:sf") is None
+
+    def test_refetch_keeps_enriched_fields(self):
+        """Test that a newer copy without a value does not erase a known one."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [{"id": "a", "name": "A", "price_level": None}])
+        cache.update_place("a", {"price_level": 3})
+        cache.set("search:a", [{"id": "a", "name": "A v2", "price_level": None}])
+
+        assert cache.get("discover:sf")[0] == {"id": "a", "name": "A v2", "price_level": 3}
+
+    def test_resolved_records_are_copies(self):
+        """Test that mutating a returned place does not change the shared record."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [{"id": "a", "name": "A"}])
+        cache.get("discover:sf")[0]["name"] = "changed"
+        assert cache.get("discover:sf")[0]["name"] == "A"
+
+    def test_snapshot_restores_shared_lists(self, tmp_path):
+        """Test that snapshots store resolved lists and restore them as shared."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [{"id": "a", "name": "A"}])
+        cache.save_snapshot(str(tmp_path / "snap.bin"))
+
+        restored = InMemoryCache()
+        restored.load_snapshot(str(tmp_path / "snap.bin"))
+        assert restored.get("discover:sf") == [{"id": "a", "name": "A"}]
+        assert len(restored.places) == 1
+
+
+class TestDerivedObjects:
+    """Tests for objects derived from cached values."""
+
+    def test_derived_dropped_when_value_changes(self):
+        """Test that a derived object lives only as long as its value."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [{"id": "a", "name": "A", "price_level": None}])
+        assert cache.set_derived("discover:sf", "batch", object())
+        assert cache.get_derived("discover:sf", "batch") is not None
+
+        cache.update_place("a", {"price_level": 1})
+        assert cache.get_derived("discover:sf", "batch") is None
+
+        cache.set_derived("discover:sf", "batch", object())
+        cache.set("discover:sf", [{"id": "a", "name": "A"}])
+        assert cache.get_derived("discover:sf", "batch") is None
+        assert not cache.set_derived("missing", "batch", object())
+
+    def test_variant_lookups_use_their_own_counter(self):
+        """Test that counted variant lookups don't touch the parent namespace's hit rate."""
+        cache = InMemoryCache()
+        cache.set("discover:sf", [{"id": "a", "name": "A"}])
+        assert cache.get_derived("discover:sf", "recommend:k", counter="recommend") is None
+        cache.set_derived("discover:sf", "recommend:k", ["scored"])
+        assert cache.get_derived("discover:sf", "recommend:k", counter="recommend") == ["scored"]
+
+        namespaces = cache.get_stats()["namespaces"]
+        assert (namespaces["discover"]["hits"], namespaces["discover"]["misses"]) == (0, 0)
+        assert (namespaces["recommend"]["hits"], namespaces["recommend"]["misses"]) == (1, 1)
@@ -0,0 +1,100 @@
+"""Tests for the offline city bundle."""
+import pytest
+from unittest.mock import patch, MagicMock
+from backend.services.cache_service import InMemoryCache
+from backend.services.places_service import PlacesService
+from backend.services.city_bundle import CityBundle, write_bundle, load_bundle
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    path = tmp_path / "bundle.bin"
+    write_bundle(str(path), [
+        ("discover:fresno,_ca:type:cafe", [{"id": "a", "name": "Cafe"}]),
+        ("autocomplete:fre", [{"name": "Fresno"}]),
+    ])
+    b = CityBundle(str(path))
+    yield b
+    b.close()
+
+
+def _places_service(cache):
+    """A PlacesService (mocked Google client) over `cache`."""
+    with patch("backend.services.places_service.get_settings") as mock_settings, \
+         patch("backend.services.places_service.googlemaps.Client"):
+        mock_settings.return_value = MagicMock(GOOGLE_MAPS_API_KEY="test-key")
+        service = PlacesService()
+    service.cache = cache
+    return service
+
+
+class TestCityBundle:
+    """Tests for reading bundle files."""
+
+    def test_lookup_decodes_values(self, bundle):
+        """Test that bundled values decode from the memory map."""
+        assert len(bundle) == 2
+        assert bundle.get("autocomplete:fre") == [{"name": "Fresno"}]
+        assert bundle.get("autocomplete:xyz") is None
+
+    def test_load_missing_bundle(self, tmp_path):
+        """Test that a missing bundle file is skipped."""
+        assert load_bundle(str(tmp_path / "missing.bin")) is None
+
+    def test_rejects_unrelated_file(self, tmp_path):
+        """Test that files without the bundle header are rejected."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a bundle at all")
+        assert load_bundle(str(path)) is None
+
+
+class TestBaseLayer:
+    """Tests for the bundle as a base layer beneath the live cache."""
+
+    def test_miss_served_from_base_layer(self, bundle):
+        """Test that live-cache misses fall through to the bundle."""
+        cache = InMemoryCache()
+        cache.attach_base_layer(bundle)
+
+        assert cache.get("discover:fresno,_ca:type:cafe")[0]["name"] == "Cafe"
+        assert cache.get("discover:oakland,_ca:type:cafe") is None
+
+        stats = cache.get_stats()["namespaces"]["discover"]
+        assert stats["base_hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_live_entries_override_base_layer(self, bundle):
+        """Test that fresher live data wins over bundled data."""
+        cache = InMemoryCache()
+        cache.attach_base_layer(bundle)
+        cache.set("autocomplete:fre", [{"name": "Fresno (live)"}])
+
+        assert cache.get("autocomplete:fre") == [{"name": "Fresno (live)"}]
+
+    def test_promoted_entries_carry_city_and_place_tags(self, bundle):
+        """Test that city and place invalidation drop entries promoted from the bundle."""
+        cache = InMemoryCache()
+        cache.attach_base_layer(bundle)
+        cache.get("discover:fresno,_ca:type:cafe")
+
+        assert _places_service(cache).invalidate_city("Fresno, CA") == 1
+        assert cache.get("discover:fresno,_ca:type:cafe") is None
+
+    def test_invalidated_keys_not_served_until_new_bundle(self, bundle):
+        """Test that a deleted or invalidated key isn't promoted again from the stale bundle."""
+        cache = InMemoryCache()
+        cache.attach_base_layer(bundle)
+        cache.get("discover:fresno,_ca:type:cafe")
+        cache.get("autocomplete:fre")
+
+        assert _places_service(cache).invalidate_place("a") == 1
+        cache.delete("autocomplete:fre")
+        assert cache.get("discover:fresno,_ca:type:cafe") is None
+        assert cache.peek("autocomplete:fre") is None
+        assert cache.get_stats()["base_layer_suppressed"] == 2
+
+        cache.set("discover:fresno,_ca:type:cafe", [{"id": "b", "name": "New Cafe"}])
+        assert cache.get("discover:fresno,_ca:type:cafe")[0]["name"] == "New Cafe"
+
+        cache.attach_base_layer(bundle)
+        assert cache.get("autocomplete:fre") == [{"name": "Fresno"}]
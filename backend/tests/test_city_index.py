@@ -0,0 +1,57 @@
+"""Tests for the local city autocomplete index."""
+import pytest
+from backend.services.city_index import CityIndex
+
+
+@pytest.fixture
+def index():
+    return CityIndex([
+        ("San Francisco", 873965, True),
+        ("San Jose", 1013240, False),
+        ("Santa Cruz", 62956, False),
+        ("South Lake Tahoe", 21330, False),
+        ("Fresno", 542107, False),
+        ("San Francisco", 0, False),
+    ])
+
+
+class TestCityIndex:
+    """Tests for prefix search, ranking and typo tolerance."""
+
+    def test_prefix_ranked_featured_then_population(self, index):
+        """Test that featured cities rank first, then larger cities."""
+        names = [c["name"] for c in index.search("san")]
+        assert names == ["San Francisco", "San Jose", "Santa Cruz"]
+
+    def test_matches_later_words(self, index):
+        """Test that any word start in a name matches."""
+        assert [c["name"] for c in index.search("tahoe")] == ["South Lake Tahoe"]
+
+    def test_typo_tolerance(self, index):
+        """Test that a single typo or swapped letter still matches."""
+        assert index.suggest("frsno")[0]["name"] == "Fresno"
+        assert index.suggest("sna f")[0]["name"] == "San Francisco"
+        assert index.suggest("fr") == []
+
+    def test_fuzzy_only_match_is_unresolved(self, index):
+        """Test that a prefix with only typo matches falls back instead of guessing."""
+        assert index.search("sol") is None  # Solvang isn't bundled; don't answer South Lake Tahoe
+        assert [c["name"] for c in index.suggest("sol")] == ["South Lake Tahoe"]
+
+    def test_partial_page_counts_as_fallback(self, index):
+        """Test that fewer matches than requested are returned but not counted as resolved."""
+        assert len(index.search("san", max_results=3)) == 3
+        assert len(index.search("san", max_results=10)) == 3
+        assert index.get_stats()["local_hits"] == 1
+        assert index.get_stats()["google_fallbacks"] == 1
+
+    def test_unresolved_prefix_returns_none(self, index):
+        """Test that unknown prefixes signal a fallback."""
+        assert index.search("xyzzy") is None
+        assert index.get_stats()["google_fallbacks"] == 1
+
+    def test_google_shaped_results(self, index):
+        """Test that results match the autocomplete response shape."""
+        result = index.search("fresno")[0]
+        assert result["full_description"] == "Fresno, CA, USA"
+        assert result["place_id"] == "local:fresno"
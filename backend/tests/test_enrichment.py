@@ -0,0 +1,41 @@
+"""Tests for the background detail-enrichment queue."""
+from unittest.mock import MagicMock
+from backend.models.place import PlaceRecord
+from backend.services.enrichment_service import DetailEnricher
+
+
+def _place(place_id, reviews):
+    return PlaceRecord(id=place_id, name=place_id, user_rating_total=reviews)
+
+
+class TestDetailEnricher:
+    """Tests for queue ordering, deduplication and batching."""
+
+    def test_most_popular_first_and_deduplicated(self):
+        """Test that popular places are enriched first and queued once."""
+        enricher = DetailEnricher()
+        enricher.enqueue([_place("quiet", 10), _place("busy", 5000)])
+        assert enricher.enqueue([_place("busy", 5000), _place("mid", 300)]) == 1
+
+        assert enricher.pop_batch(3) == ["busy", "mid", "quiet"]
+        assert len(enricher) == 0
+
+    def test_queue_is_bounded(self):
+        """Test that places beyond the queue limit are dropped."""
+        enricher = DetailEnricher(max_queue=2)
+        enricher.enqueue([_place("a", 1), _place("b", 2), _place("c", 3)])
+
+        assert len(enricher) == 2
+        assert enricher.get_stats()["dropped"] == 1
+
+    def test_batch_counts_google_calls_and_failures(self):
+        """Test that a batch only processes its size and records outcomes."""
+        enricher = DetailEnricher()
+        enricher.enqueue([_place("a", 3), _place("b", 2), _place("c", 1)])
+        service = MagicMock()
+        service.enrich_place.side_effect = [True, Exception("timeout")]
+
+        assert enricher.process_batch(service, size=2) == 1
+        assert enricher.get_stats() == {
+            "queued": 1, "enriched": 1, "google_calls": 1, "failures": 1, "dropped": 0
+        }
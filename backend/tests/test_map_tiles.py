@@ -0,0 +1,56 @@
+"""Tests for map tile math and marker clustering."""
+from backend.models.place import PlaceRecord, LatLng
+from backend.services.map_tiles import (
+    CLUSTER_GRID,
+    MAX_CLUSTER_ZOOM,
+    cluster_tile,
+    tile_bounds,
+    tile_for,
+    tiles_in_viewport,
+)
+
+
+def _place(place_id, lat, lng):
+    return PlaceRecord(id=place_id, name=place_id, coordinates=LatLng(lat=lat, lng=lng))
+
+
+class TestTileMath:
+    """Tests for Web-Mercator tile coordinates."""
+
+    def test_tile_contains_its_point(self):
+        """Test that a point falls inside the bounds of its tile."""
+        x, y = tile_for(37.7749, -122.4194, 12)
+        south, west, north, east = tile_bounds(12, x, y)
+        assert (x, y) == (655, 1583)
+        assert south <= 37.7749 <= north and west <= -122.4194 <= east
+
+    def test_viewport_tiles(self):
+        """Test that a viewport maps to the tiles covering it."""
+        tiles = tiles_in_viewport(37.70, -122.52, 37.82, -122.35, 12)
+        assert (655, 1583) in tiles
+        assert len(tiles) == 9
+
+
+class TestClustering:
+    """Tests for per-tile clustering."""
+
+    def test_dense_cell_becomes_cluster(self):
+        """Test that nearby places collapse into one cluster with a centroid."""
+        x, y = tile_for(37.7749, -122.4194, 12)
+        places = [_place(f"p{i}", 37.7749 + i * 0.00001, -122.4194) for i in range(50)]
+
+        tile = cluster_tile(places, 12, x, y)
+
+        assert tile["places"] == []
+        assert tile["clusters"][0]["count"] == 50
+        assert len(tile["clusters"]) <= CLUSTER_GRID ** 2
+
+    def test_high_zoom_returns_every_place(self):
+        """Test that clustering stops at the max cluster zoom."""
+        x, y = tile_for(37.7749, -122.4194, MAX_CLUSTER_ZOOM)
+        places = [_place("a", 37.7749, -122.4194), _place("b", 37.7749, -122.4194)]
+
+        tile = cluster_tile(places, MAX_CLUSTER_ZOOM, x, y)
+
+        assert tile["clusters"] == []
+        assert [p["id"] for p in tile["places"]] == ["a", "b"]
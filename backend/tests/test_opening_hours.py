@@ -0,0 +1,67 @@
+"""Tests for weekly opening-hours intervals."""
+from datetime import datetime, timezone
+from backend.models.place import PlaceRecord
+from backend.services.opening_hours import (
+    MINUTES_PER_WEEK,
+    filter_open,
+    minute_of_week,
+    parse_periods,
+)
+from backend.services.places_service import filter_places
+
+
+def _period(open_day, open_time, close_day, close_time):
+    return {"open": {"day": open_day, "time": open_time}, "close": {"day": close_day, "time": close_time}}
+
+
+# Weekdays 09:00-17:00 (Google days: 0 = Sunday)
+OFFICE = parse_periods([_period(d, "0900", d, "1700") for d in range(1, 6)])
+# Friday and Saturday nights until 02:00
+BAR = parse_periods([_period(5, "2000", 6, "0200"), _period(6, "2000", 0, "0200")])
+
+
+def _place(place_id, intervals, open_now=None):
+    return PlaceRecord(id=place_id, name=place_id, open_intervals=intervals, open_now=open_now)
+
+
+class TestParsePeriods:
+    """Tests for converting Google periods to minute-of-week ranges."""
+
+    def test_overnight_period_wraps_the_week(self):
+        """Test that Saturday-night hours are split across the week boundary."""
+        assert BAR[0] == [0, 120]
+        assert BAR[-1] == [6 * 1440 + 1200, MINUTES_PER_WEEK]
+
+    def test_always_open(self):
+        """Test that a period without a close means open around the clock."""
+        assert parse_periods([{"open": {"day": 0, "time": "0000"}}]) == [[0, MINUTES_PER_WEEK]]
+
+    def test_minute_of_week_uses_pacific_time(self):
+        """Test that aware datetimes are converted to California time."""
+        # Sunday 2026-01-04 17:30 UTC is 09:30 Pacific
+        assert minute_of_week(datetime(2026, 1, 4, 17, 30, tzinfo=timezone.utc)) == 570
+
+
+class TestFilterOpen:
+    """Tests for filtering a candidate list by openness."""
+
+    def test_open_at_a_planned_time(self):
+        """Test that a future time is answered from the weekly schedule."""
+        places = [_place("office", OFFICE), _place("bar", BAR), _place("unknown", None)]
+
+        saturday_night = datetime(2026, 1, 10, 23, 0)
+        sunday_1am = datetime(2026, 1, 11, 1, 0)
+        monday_noon = datetime(2026, 1, 12, 12, 0)
+
+        assert [p.id for p in filter_open(places, saturday_night)] == ["bar"]
+        assert [p.id for p in filter_open(places, sunday_1am)] == ["bar"]
+        assert [p.id for p in filter_open(places, monday_noon)] == ["office"]
+
+    def test_open_now_falls_back_to_flag(self):
+        """Test that places without a schedule use their fetch-time flag."""
+        places = [_place("office", OFFICE, open_now=True), _place("flagged", None, open_now=True)]
+
+        result = filter_places(places, open_now=True)
+
+        # Whatever the current time, the flagged place is kept by its flag
+        assert "flagged" in [p.id for p in result]
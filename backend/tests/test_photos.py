@@ -0,0 +1,138 @@
+"""Tests for the caching photo proxy."""
+import io
+import os
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+from backend.api.main import app
+import pytest
+from backend.core.limiter import limiter
+from backend.core.config import Settings
+from backend.services.cache_service import InMemoryCache, cache_key
+from backend.services.photo_service import PhotoDiskCache, PhotoService, PhotoUnavailable, snap_width
+
+client = TestClient(app)
+
+JPEG = b"\xff\xd8\xff\xe0" + b"0" * 100
+
+
+def _service(tmp_path, max_bytes=10_000):
+    service = PhotoService(PhotoDiskCache(str(tmp_path), max_bytes))
+    service.negative_cache = InMemoryCache()
+    return service
+
+
+class TestPhotoDiskCache:
+    """Tests for the size-bounded disk cache."""
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that the oldest file goes first once the limit is passed."""
+        cache = PhotoDiskCache(str(tmp_path), max_bytes=250)
+        cache.put("old", 400, b"a" * 100)
+        cache.put("used", 400, b"b" * 100)
+        os.utime(cache._path("old", 400), (0, 0))
+        os.utime(cache._path("used", 400), (1, 1))
+        cache.get("used", 400)
+
+        cache.put("new", 400, b"c" * 100)
+
+        assert cache.get("old", 400) is None
+        assert cache.get("used", 400) is not None
+        assert cache.total_bytes == 200
+
+    def test_width_snaps_to_variant(self):
+        """Test that requested widths round up to a served variant."""
+        assert snap_width(120) == 200
+        assert snap_width(400) == 400
+        assert snap_width(5000) == 800
+
+
+class TestPhotoService:
+    """Tests for fetching photos once."""
+
+    @patch("backend.services.photo_service.get_places_service")
+    def test_google_photo_fetched_once(self, mock_get_service, tmp_path):
+        """Test that repeat requests are served from disk."""
+        mock_get_service.return_value.client.places_photo.return_value = iter([JPEG])
+        service = _service(tmp_path)
+
+        assert service.get_photo("ref1", 800) == JPEG
+        assert service.get_photo("ref1", 700) == JPEG
+
+        assert service.upstream_fetches == 1
+
+
+    @patch("backend.services.photo_service.get_places_service")
+    def test_failed_ref_remembered(self, mock_get_service, tmp_path):
+        """Test that a ref Google rejects isn't fetched again while the negative entry lives."""
+        mock_get_service.return_value.client.places_photo.side_effect = ValueError("bad ref")
+        service = _service(tmp_path)
+
+        with pytest.raises(ValueError):
+            service.get_photo("junk", 800)
+        with pytest.raises(PhotoUnavailable):
+            service.get_photo("junk", 200)
+        assert service.upstream_fetches == 1
+        assert not os.listdir(tmp_path)
+
+
+    @patch("backend.services.photo_service.get_places_service")
+    def test_smaller_widths_resized_locally(self, mock_get_service, tmp_path):
+        """Test that smaller variants are resized from the one Google fetch."""
+        Image = pytest.importorskip("PIL.Image")
+        original = io.BytesIO()
+        Image.new("RGB", (800, 600), "blue").save(original, format="JPEG")
+        mock_get_service.return_value.client.places_photo.return_value = iter([original.getvalue()])
+        service = _service(tmp_path, max_bytes=1_000_000)
+
+        thumbnail = service.get_photo("ref1", 200)
+
+        with Image.open(io.BytesIO(thumbnail)) as img:
+            assert img.size == (200, 150)
+        assert service.upstream_fetches == 1
+
+    def test_failed_refs_namespace_is_bounded(self):
+        """Test that made-up refs can't grow the negative entries without limit."""
+        cache = InMemoryCache()
+        for i in range(10_005):
+            cache.set_negative(cache_key("photo", f"junk{i}"), "ValueError")
+        assert len(cache._namespace("photo:x").keys) == 10_000
+
+    def test_photo_urls_absolute_by_default(self):
+        """Test that photo URLs point at the backend origin, not the frontend's."""
+        assert Settings.model_fields["PUBLIC_API_URL"].default.startswith("http")
+
+
+class TestPhotoEndpoint:
+    """Tests for the photo proxy endpoint."""
+
+    @patch("backend.api.places.get_photo_service")
+    def test_etag_and_not_modified(self, mock_get_photo_service):
+        """Test caching headers and conditional requests."""
+        mock_get_photo_service.return_value = MagicMock(get_photo=MagicMock(return_value=JPEG))
+
+        response = client.get("/api/places/photo/fallback-park?w=400")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/jpeg"
+        assert "immutable" in response.headers["cache-control"]
+
+        etag = response.headers["etag"]
+        again = client.get("/api/places/photo/fallback-park?w=400", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+
+    @patch("backend.api.places.get_photo_service")
+    def test_unavailable_photo(self, mock_get_photo_service):
+        """Test that upstream failures become a 404."""
+        mock_get_photo_service.return_value.get_photo.side_effect = Exception("bad ref")
+
+        assert client.get("/api/places/photo/nope").status_code == 404
+
+    @patch("backend.api.places.get_photo_service")
+    def test_rate_limited(self, mock_get_photo_service):
+        """Test that the unauthenticated photo proxy is rate limited."""
+        mock_get_photo_service.return_value.get_photo.side_effect = Exception("bad ref")
+        limiter.reset()
+        try:
+            statuses = {client.get(f"/api/places/photo/junk{i}").status_code for i in range(101)}
+        finally:
+            limiter.reset()
+        assert statuses == {404, 429}
@@ -0,0 +1,82 @@
+"""Tests for the columnar place batch."""
+import numpy as np
+from backend.models.place import LatLng, PlaceRecord
+from backend.models.user_preferance import ActivityType
+from backend.services.place_batch import ACTIVITY_BITS, PlaceBatch, activity_mask
+from backend.services.places_service import filter_places
+
+
+def _dict(place_id, rating=None, reviews=None, price=None, types=()):
+    return {
+        "id": place_id,
+        "name": place_id,
+        "rating": rating,
+        "user_rating_total": reviews,
+        "price_level": price,
+        "types": list(types),
+        "coordinates": {"lat": 37.7, "lng": -122.4},
+    }
+
+
+class TestPlaceBatch:
+    """Tests for columns, masks, ordering and lazy materialization."""
+
+    def test_columns(self):
+        """Test that attributes are laid out as arrays, with defaults for missing values."""
+        batch = PlaceBatch.from_dicts([
+            _dict("a", rating=4.5, reviews=200, price=2, types=["park", "museum"]),
+            {"id": "b", "name": "b"},
+        ])
+
+        assert batch.rating.tolist() == [4.5, 0.0]
+        assert batch.reviews.tolist() == [200, 0]
+        assert batch.price_mask.tolist() == [1 << 2, 0]
+        assert batch.activity_mask[0] == ACTIVITY_BITS[ActivityType.OUTDOOR] | ACTIVITY_BITS[ActivityType.CULTURAL]
+        assert batch.lat[0] == 37.7 and np.isnan(batch.lat[1])
+
+    def test_popularity_order_is_stable(self):
+        """Test that places sort by popularity with ties in original order."""
+        batch = PlaceBatch.from_dicts([
+            _dict("low", rating=3.0, reviews=10),
+            _dict("tie1", rating=4.0, reviews=100),
+            _dict("top", rating=4.9, reviews=5000),
+            _dict("tie2", rating=4.0, reviews=100),
+        ])
+        assert [p.id for p in batch.records(batch.by_popularity())] == ["top", "tie1", "tie2", "low"]
+
+    def test_filter_mask(self):
+        """Test price and rating filters; unknown prices fail a price bound."""
+        batch = PlaceBatch.from_dicts([
+            _dict("cheap", rating=4.0, price=1),
+            _dict("pricey", rating=4.8, price=4),
+            _dict("unknown", rating=4.9),
+        ])
+        assert batch.filter_mask(max_price=2).tolist() == [True, False, False]
+        assert batch.filter_mask(min_rating=4.5).tolist() == [False, True, True]
+
+    def test_materialization_is_lazy(self):
+        """Test that records are built only for requested rows, once."""
+        batch = PlaceBatch.from_dicts([_dict("a"), _dict("b")])
+        first = batch.record(1)
+
+        assert batch._records[0] is None
+        assert batch.record(1) is first
+        assert first.coordinates == LatLng(37.7, -122.4)
+
+    def test_take_and_records_input(self):
+        """Test subsetting a batch built from records."""
+        batch = PlaceBatch.from_records([
+            PlaceRecord(id="a", name="a", rating=3.0), PlaceRecord(id="b", name="b", rating=5.0)
+        ])
+        subset = batch.take([1])
+        assert subset.rating.tolist() == [5.0]
+        assert subset.records()[0].id == "b"
+
+    def test_filter_places_accepts_batch(self):
+        """Test that filter_places runs on a cached batch directly."""
+        batch = PlaceBatch.from_dicts([_dict("a", rating=4.0, price=1), _dict("b", rating=3.0, price=1)])
+        assert [p.id for p in filter_places(batch, max_price=1, min_rating=3.5)] == ["a"]
+
+    def test_activity_mask_ignores_unknown_types(self):
+        """Test that unmapped Google types contribute no bits."""
+        assert activity_mask(["establishment", "cafe"]) == ACTIVITY_BITS[ActivityType.FOOD]
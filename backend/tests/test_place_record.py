@@ -0,0 +1,39 @@
+"""Tests for the slotted internal place record."""
+from backend.models.place import Coordinates, LatLng, Place, PlaceRecord
+
+
+def _place_dict():
+    return Place(
+        id="p1",
+        name="Golden Gate Park",
+        rating=4.8,
+        coordinates=Coordinates(lat=37.7694, lng=-122.4862),
+        types=["park"],
+        open_intervals=[[0, 60]],
+    ).model_dump()
+
+
+class TestPlaceRecord:
+    """Tests for conversions between PlaceRecord, dicts and Place."""
+
+    def test_dict_roundtrip_matches_model_dump(self):
+        """Test that from_dict/to_dict preserve the Place.model_dump() shape."""
+        data = _place_dict()
+        record = PlaceRecord.from_dict(data)
+
+        assert record.coordinates == LatLng(37.7694, -122.4862)
+        assert record.to_dict() == data
+
+    def test_to_model_is_equivalent(self):
+        """Test that the boundary conversion yields an equal Pydantic model."""
+        data = _place_dict()
+        assert PlaceRecord.from_dict(data).to_model().model_dump() == data
+
+    def test_shared_types_tuple(self):
+        """Test that interned tuples are used as-is and dumped as lists."""
+        types = ("cafe", "food")
+        record = PlaceRecord.from_dict({"id": "c", "name": "Cafe", "types": types})
+
+        assert record.types is types
+        assert record.to_dict()["types"] == ["cafe", "food"]
+        assert record.vibe_score == 0.0
@@ -4,6 +4,8 @@ from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 from backend.api.main import app
 from backend.models.place import Place, Coordinates
+from backend.services.cache_service import get_cache
+from backend.services.places_service import discover_cache_key
 
 client = TestClient(app)
 
@@ -63,6 +65,25 @@ class TestPlacesDiscovery:
         assert response.status_code == 400
         assert "Invalid categories" in response.json()["detail"]
 
+    @patch("backend.api.places.get_places_service")
+    def test_discover_serves_rendered_body_on_cache_hit(self, mock_get_service):
+        """Test that a cached discover result is rendered once and then reused."""
+        mock_place = Place(id="place_789", name="Tower Bridge", rating=4.6, types=["tourist_attraction"])
+        get_cache().set(discover_cache_key("Sacramento, CA", None), [mock_place.model_dump()])
+
+        mock_service = MagicMock()
+        mock_service.discover_places.return_value = [mock_place]
+        mock_service.get_photo_url.return_value = None
+        mock_get_service.return_value = mock_service
+
+        first = client.get("/api/places/discover/Sacramento")
+        second = client.get("/api/places/discover/Sacramento")
+
+        assert first.status_code == 200
+        assert second.content == first.content
+        assert second.json()["places"][0]["name"] == "Tower Bridge"
+        mock_service.discover_places.assert_called_once()
+
     def test_get_categories(self):
         """Test that categories endpoint returns available categories."""
         response = client.get("/api/places/categories")
@@ -129,3 +150,64 @@ class TestCityAutocomplete:
         data = response.json()
         assert data["query"] == "San"
         assert len(data["cities"]) == 1
+
+
+class TestNearbyPlaces:
+    """Tests for the nearby-places endpoint."""
+
+    @patch("backend.api.places.get_places_service")
+    def test_nearby_returns_distances(self, mock_get_service):
+        """Test that nearby results carry their distance."""
+        place = Place(id="p1", name="Ferry Building", coordinates=Coordinates(lat=37.7955, lng=-122.3937))
+        mock_service = MagicMock()
+        mock_service.nearby_places.return_value = [(place, 120.44)]
+        mock_service.get_photo_url.return_value = None
+        mock_get_service.return_value = mock_service
+
+        response = client.get("/api/places/nearby?lat=37.795&lng=-122.394&radius=500&category=cafes")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["places"][0]["distance_m"] == 120.4
+        mock_service.nearby_places.assert_called_once_with(37.795, -122.394, 500, category="cafes", limit=20)
+
+    def test_nearby_invalid_category(self):
+        """Test that unknown categories are rejected."""
+        response = client.get("/api/places/nearby?lat=37.7&lng=-122.4&category=zoos")
+        assert response.status_code == 400
+
+    def test_viewport_rejects_oversized_area(self):
+        """Test that a viewport spanning too many tiles is refused."""
+        response = client.get("/api/places/viewport?south=32&west=-124&north=42&east=-114&zoom=12")
+        assert response.status_code == 400
+
+    def test_viewport_rejects_world_zooms(self):
+        """Test that zooms below the minimum are refused before any work."""
+        response = client.get("/api/places/viewport?south=-85&west=-180&north=85&east=180&zoom=2")
+        assert response.status_code == 422
+
+
+class TestBatchDetails:
+    """Tests for the batch place details endpoint."""
+
+    @patch("backend.api.places.get_places_service")
+    def test_batch_returns_items_in_order(self, mock_get_service):
+        """Test that each requested id gets a place or an error, in order."""
+        mock_service = MagicMock()
+        mock_service.get_place_details_batch.return_value = [
+            (Place(id="a", name="A"), None),
+            (None, "not_found"),
+        ]
+        mock_get_service.return_value = mock_service
+
+        response = client.post("/api/places/detail/batch", json={"place_ids": ["a", "b"]})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0]["place"]["name"] == "A"
+        assert results[1] == {"place_id": "b", "place": None, "error": "not_found"}
+
+    def test_batch_size_is_limited(self):
+        """Test that oversized batches are rejected."""
+        response = client.post("/api/places/detail/batch", json={"place_ids": [str(i) for i in range(26)]})
+        assert response.status_code == 422
@@ -0,0 +1,534 @@
+"""Tests for PlacesService caching behaviour (Google client mocked)."""
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.core.database import Base
+from backend.models.place import Place
+from backend.services.cache_service import InMemoryCache, NegativeResult
+from backend.services.catalog_service import PlaceCatalog
+from backend.services.spatial_index import SpatialIndex
+from backend.services.enrichment_service import DetailEnricher
+from backend.services.quota_service import QuotaManager, UpstreamUnavailable
+from backend.services.upstream_service import UpstreamCaller
+from backend.services.places_service import (
+    PlacesService,
+    discover_cache_key,
+    search_cache_key,
+    place_cache_key,
+    GOOGLE_AUTOCOMPLETE_LIMIT,
+    OPEN_NOW_MAX_AGE_SECONDS,
+)
+
+
+def _google_place(place_id, name, rating=4.5, types=None):
+    """Build a minimal Google Places text-search result."""
+    return {
+        "place_id": place_id,
+        "name": name,
+        "rating": rating,
+        "user_ratings_total": 100,
+        "types": types or ["tourist_attraction"],
+        "geometry": {"location": {"lat": 37.77, "lng": -122.42}},
+    }
+
+
+def _prediction(name):
+    """Build a minimal Google autocomplete prediction for a California city."""
+    return {
+        "description": f"{name}, CA, USA",
+        "place_id": f"id_{name}",
+        "structured_formatting": {"main_text": name, "secondary_text": "CA, USA"},
+    }
+
+
+@pytest.fixture
+def service():
+    """A PlacesService with a mocked Google client and private cache, catalog, index, queue and quota."""
+    with patch("backend.services.places_service.get_settings") as mock_settings, \
+         patch("backend.services.places_service.googlemaps.Client"):
+        mock_settings.return_value = MagicMock(GOOGLE_MAPS_API_KEY="test-key")
+        svc = PlacesService()
+    svc.cache = InMemoryCache()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    svc.catalog = PlaceCatalog(session_factory=sessionmaker(bind=engine))
+    svc.spatial_index = SpatialIndex()
+    svc.enricher = DetailEnricher()
+    svc.upstream = UpstreamCaller(QuotaManager())
+    return svc
+
+
+class TestGoogleClient:
+    """Tests for the real googlemaps client configuration."""
+
+    def _ok_response(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"status": "OK", "results": []}
+        return response
+
+    def test_places_service_request_reaches_transport(self):
+        """Test that the client's retry budget doesn't fail a call before it is sent."""
+        with patch("backend.services.places_service.get_settings") as mock_settings:
+            mock_settings.return_value = MagicMock(GOOGLE_MAPS_API_KEY="AIza-test-key", UPSTREAM_TIMEOUT_SECONDS=8)
+            svc = PlacesService()
+        svc.client.session.get = MagicMock(return_value=self._ok_response())
+
+        for _ in range(20):
+            assert svc.client.places(query="museums in Fresno")["status"] == "OK"
+        assert svc.client.session.get.call_count == 20
+
+    def test_route_optimizer_request_reaches_transport(self):
+        """Test that the distance matrix client is configured the same way."""
+        from backend.core.route_optimizer import RouteOptimizer
+        with patch.dict("os.environ", {"GOOGLE_MAPS_API_KEY": "AIza-test-key"}):
+            optimizer = RouteOptimizer()
+        optimizer.client.session.get = MagicMock(return_value=self._ok_response())
+
+        for _ in range(20):
+            optimizer.client._request("/maps/api/distancematrix/json", {"origins": "a", "destinations": "b"})
+        assert optimizer.client.session.get.call_count == 20
+
+
+class TestNegativeCaching:
+    """Tests for short-lived negative cache entries."""
+
+    def test_empty_search_is_cached_negatively(self, service):
+        """Test that a zero-result search does not hit Google twice."""
+        service.client.places.return_value = {"results": []}
+
+        assert service.search_places("zzzz", "Fresno, CA") == []
+        assert service.search_places("zzzz", "Fresno, CA") == []
+
+        service.client.places.assert_called_once()
+        cached = service.cache.get(search_cache_key("zzzz", "Fresno, CA"))
+        assert isinstance(cached, NegativeResult)
+        assert cached.reason == "empty"
+
+    def test_upstream_error_records_error_class(self, service):
+        """Test that a failed detail lookup stores the error class."""
+        service.client.place.side_effect = TimeoutError("slow")
+
+        assert service.get_place_details("abc") is None
+        assert service.get_place_details("abc") is None
+
+        service.client.place.assert_called_once()
+        assert service.cache.get("place:abc").reason == "TimeoutError"
+
+    def test_empty_list_is_a_valid_cached_value(self, service):
+        """Test that a cached empty list is returned without refetching."""
+        service.cache.set(discover_cache_key("Fresno, CA", None), [])
+
+        assert service.discover_places("Fresno, CA") == []
+        service.client.places.assert_not_called()
+
+    def test_min_rating_applied_after_cache(self, service):
+        """Test that rating filters reuse the same cached search."""
+        service.client.places.return_value = {"results": [
+            _google_place("a", "Good", rating=4.8),
+            _google_place("b", "Okay", rating=3.9),
+        ]}
+
+        assert len(service.search_places("coffee", "Fresno, CA")) == 2
+        assert [p.id for p in service.search_places("coffee", "Fresno, CA", min_rating=4.5)] == ["a"]
+        service.client.places.assert_called_once()
+
+
+class TestResultReuse:
+    """Tests for reusing canonical base result sets."""
+
+    def test_category_order_shares_cache(self, service):
+        """Test that category order does not create separate cache entries."""
+        service.client.places.return_value = {"results": [_google_place("a", "Cafe")]}
+
+        service.discover_places("Fresno, CA", ["cafes", "restaurants"])
+        calls = service.client.places.call_count
+        service.discover_places("Fresno, CA", ["restaurants", "cafes"])
+
+        assert service.client.places.call_count == calls
+
+    def test_subset_reuses_type_base_sets(self, service):
+        """Test that a category subset only fetches types not yet cached."""
+        service.client.places.return_value = {"results": [_google_place("a", "Cafe")]}
+
+        service.discover_places("Fresno, CA", ["cafes", "restaurants"])
+        service.client.places.reset_mock()
+        service.discover_places("Fresno, CA", ["cafes"])
+
+        # cafe and bakery were fetched for the pair; only coffee_shop is new
+        searched = [c.kwargs["type"] for c in service.client.places.call_args_list]
+        assert searched == ["coffee_shop"]
+
+    def test_filter_variations_answered_locally(self, service):
+        """Test that price filters reuse the unfiltered base search."""
+        cheap = _google_place("a", "Cheap Eats")
+        cheap["price_level"] = 1
+        fancy = _google_place("b", "Fancy")
+        fancy["price_level"] = 4
+        service.client.places.return_value = {"results": [cheap, fancy]}
+
+        assert [p.id for p in service.search_places("food", "Fresno, CA", max_price=2)] == ["a"]
+        assert [p.id for p in service.search_places("food", "Fresno, CA", min_price=3)] == ["b"]
+        assert len(service.search_places("food", "Fresno, CA")) == 2
+        service.client.places.assert_called_once()
+
+    def test_open_now_uses_schedules_without_refetch(self, service):
+        """Test that an old base set with weekly hours answers open_now locally."""
+        always = _google_place("a", "Diner")
+        always["opening_hours"] = {"open_now": False, "periods": [{"open": {"day": 0, "time": "0000"}}]}
+        service.client.places.return_value = {"results": [always]}
+        service.search_places("food", "Fresno, CA")
+
+        cached = service.cache.get(search_cache_key("food", "Fresno, CA"))
+        cached["fetched_at"] -= 3600
+        service.cache.set(search_cache_key("food", "Fresno, CA"), cached)
+
+        assert [p.id for p in service.search_places("food", "Fresno, CA", open_now=True)] == ["a"]
+        service.client.places.assert_called_once()
+
+
+class TestPlaceCatalog:
+    """Tests for reading place details through the catalog."""
+
+    def test_search_results_are_cataloged(self, service):
+        """Test that text-search results are upserted with a city."""
+        service.client.places.return_value = {"results": [_google_place("p1", "Tower")]}
+
+        service.search_places("tower", "Fresno, CA")
+
+        record = service.catalog.get("p1")
+        assert record.name == "Tower"
+        assert record.city == "Fresno, CA"
+        assert record.atmosphere_fetched_at is not None
+        assert record.contact_fetched_at is None
+
+    def test_details_request_only_stale_groups(self, service):
+        """Test that details for a cataloged place only fetch missing groups."""
+        service.catalog.upsert_results([_google_place("p1", "Tower")])
+        service.client.place.return_value = {"result": {
+            "place_id": "p1",
+            "website": "https://tower.example",
+            "opening_hours": {"open_now": True, "weekday_text": ["Monday: 9 AM – 5 PM"]},
+        }}
+
+        place = service.get_place_details("p1")
+
+        fields = service.client.place.call_args.kwargs["fields"]
+        assert "website" in fields
+        assert "name" not in fields and "rating" not in fields
+        assert place.name == "Tower"
+        assert place.rating == 4.5
+        assert service.catalog.get("p1").opening_hours == {"weekday_text": ["Monday: 9 AM – 5 PM"]}
+
+    def test_fresh_catalog_record_skips_google(self, service):
+        """Test that a fully fresh catalog record answers without Google."""
+        data = dict(_google_place("p1", "Tower"), website="https://tower.example")
+        service.catalog.upsert_results([data], groups=("basic", "atmosphere", "contact"))
+
+        place = service.get_place_details("p1")
+
+        service.client.place.assert_not_called()
+        assert place.name == "Tower"
+
+    def test_stale_group_is_refreshed(self, service):
+        """Test that an aged field group is requested again."""
+        service.catalog.upsert_results([_google_place("p1", "Tower")], groups=("basic", "atmosphere", "contact"))
+        record = service.catalog.get("p1")
+        later = datetime.utcnow() + timedelta(days=8)
+
+        assert service.catalog.stale_groups(record, now=later) == ["atmosphere"]
+
+    def test_upstream_error_serves_catalog_copy(self, service):
+        """Test that a failed refresh falls back to the cataloged place."""
+        service.catalog.upsert_results([_google_place("p1", "Tower")])
+        service.client.place.side_effect = Exception("timeout")
+
+        place = service.get_place_details("p1")
+
+        assert place.name == "Tower"
+
+
+class TestNearbyPlaces:
+    """Tests for nearby queries backed by fetched and cataloged places."""
+
+    def test_fetched_places_are_indexed(self, service):
+        """Test that search results become answerable by nearby queries."""
+        service.client.places.return_value = {"results": [_google_place("p1", "Tower", types=["cafe"])]}
+        service.search_places("tower", "San Francisco, CA")
+
+        results = service.nearby_places(37.77, -122.42, 100, category="cafes")
+
+        assert [p.id for p, _ in results] == ["p1"]
+        assert service.nearby_places(37.77, -122.42, 100, category="nightlife") == []
+
+    def test_seed_from_catalog(self, service):
+        """Test that cataloged places are loaded into the index."""
+        service.catalog.upsert_results([_google_place("p1", "Tower"), _google_place("p2", "Pier")])
+
+        assert service.seed_spatial_index() == 2
+        assert len(service.nearby_places(37.77, -122.42, 100)) == 2
+
+
+class TestViewport:
+    """Tests for clustered viewport queries."""
+
+    def test_tiles_are_cached_between_pans(self, service):
+        """Test that tiles are computed once and reused."""
+        service.catalog.upsert_results([_google_place(f"p{i}", f"Place {i}") for i in range(3)])
+        service.seed_spatial_index()
+        service.spatial_index.within = MagicMock(wraps=service.spatial_index.within)
+
+        first = service.viewport_places(37.76, -122.43, 37.78, -122.41, zoom=12)
+        calls = service.spatial_index.within.call_count
+        second = service.viewport_places(37.76, -122.43, 37.78, -122.41, zoom=12)
+
+        assert first["clusters"] == [{"lat": 37.77, "lng": -122.42, "count": 3}]
+        assert second == first
+        assert service.spatial_index.within.call_count == calls
+
+
+    def test_low_zoom_viewport_is_bounded(self, service):
+        """Test that a zoom-2 world viewport over an empty index returns quickly."""
+        started = time.perf_counter()
+        result = service.viewport_places(-85, -180, 85, 180, zoom=2)
+        assert time.perf_counter() - started < 1.0
+        assert result == {"clusters": [], "places": []}
+
+
+class TestBatchDetails:
+    """Tests for batch detail fetches."""
+
+    def test_batch_keeps_input_order_and_reports_errors(self, service):
+        """Test cached hits, fetched misses and per-item errors in one batch."""
+        service.cache.set(place_cache_key("cached"), Place(id="cached", name="Cached").model_dump())
+
+        def place(place_id, fields):
+            if place_id == "broken":
+                raise Exception("timeout")
+            if place_id == "gone":
+                return {"result": {}}
+            return {"result": _google_place(place_id, place_id.title())}
+        service.client.place.side_effect = place
+
+        results = service.get_place_details_batch(["new", "cached", "gone", "broken", "new"])
+
+        assert [p.id if p else err for p, err in results] == [
+            "new", "cached", "not_found", "upstream_error", "new"
+        ]
+        assert service.client.place.call_count == 3
+
+    def test_concurrent_requests_share_one_fetch(self, service):
+        """Test that simultaneous detail calls for one place hit Google once."""
+        release = threading.Event()
+
+        def slow_place(place_id, fields):
+            release.wait(timeout=2)
+            return {"result": _google_place(place_id, "Tower")}
+        service.client.place.side_effect = slow_place
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(service.get_place_details, "p1") for _ in range(4)]
+            time.sleep(0.05)
+            release.set()
+            names = [f.result().name for f in futures]
+
+        assert names == ["Tower"] * 4
+        service.client.place.assert_called_once()
+
+
+class TestEnrichment:
+    """Tests for background detail enrichment."""
+
+    def test_enrichment_merges_into_cached_results(self, service):
+        """Test that fetched hours and price land in every cached list with the place."""
+        service.client.places.return_value = {"results": [_google_place("p1", "Tower")]}
+        service.discover_places("Fresno, CA", ["attractions"])
+        service.search_places("tower", "Fresno, CA")
+        assert service.enricher.pop_batch(10) == ["p1"]
+
+        hours = {"open_now": True, "periods": [{"open": {"day": 0, "time": "0900"}}]}
+        service.client.place.return_value = {"result": {"place_id": "p1", "price_level": 2, "opening_hours": hours}}
+
+        assert service.enrich_place("p1") is True
+        fields = service.client.place.call_args.kwargs["fields"]
+        assert "opening_hours" in fields and "rating" not in fields
+
+        discovered = service.discover_places("Fresno, CA", ["attractions"])[0]
+        searched = service.search_places("tower", "Fresno, CA")[0]
+        for place in (discovered, searched):
+            assert place.price_level == 2
+            assert place.opening_hours == {"periods": [{"open": {"day": 0, "time": "0900"}}]}
+
+    def test_fresh_catalog_skips_google(self, service):
+        """Test that a place with fresh detail groups is merged without a call."""
+        data = dict(_google_place("p1", "Tower"), price_level=1)
+        service.catalog.upsert_results([data], groups=("basic", "atmosphere", "contact"))
+
+        assert service.enrich_place("p1") is False
+        service.client.place.assert_not_called()
+
+
+class TestWarmDiscover:
+    """Tests for refreshing discover results ahead of expiry."""
+
+    def test_warm_fetches_missing_types_within_budget(self, service):
+        """Test that warming fetches only up to its budget and skips the rebuild."""
+        service.client.places.return_value = {"results": [_google_place("a", "Cafe")]}
+
+        assert service.warm_discover("Fresno, CA", ["cafes"], refresh_within=3600, budget=2) == 2
+        assert service.cache.expires_in(discover_cache_key("Fresno, CA", ["cafes"])) is None
+
+        # The remaining type completes the set and the merged entry is rebuilt
+        assert service.warm_discover("Fresno, CA", ["cafes"], refresh_within=3600, budget=2) == 1
+        assert service.cache.expires_in(discover_cache_key("Fresno, CA", ["cafes"])) is not None
+        assert service.client.places.call_count == 3
+
+    def test_warm_skips_fresh_entries(self, service):
+        """Test that entries far from expiry cost no Google calls."""
+        service.client.places.return_value = {"results": [_google_place("a", "Cafe")]}
+        service.discover_places("Fresno, CA", ["cafes"])
+        service.client.places.reset_mock()
+
+        assert service.warm_discover("Fresno, CA", ["cafes"], refresh_within=3600, budget=10) == 0
+        service.client.places.assert_not_called()
+
+
+class TestAutocomplete:
+    """Tests for local-first city autocomplete."""
+
+    def test_local_index_answers_without_google(self, service):
+        """Test that a prefix with a full page of local matches never reaches Google."""
+        cities = service.autocomplete_cities("San")
+        assert len(cities) == 10
+        service.client.places_autocomplete.assert_not_called()
+
+    def test_partial_local_matches_merged_with_google(self, service):
+        """Test that cities missing from the bundled list still come from Google."""
+        service.client.places_autocomplete.return_value = [
+            _prediction("Lancaster"),
+            _prediction("La Mesa"),
+            _prediction("Lakewood"),
+        ]
+        names = [c["name"] for c in service.autocomplete_cities("La")]
+
+        assert names[:2] == ["Lake Tahoe", "Lancaster"]
+        assert names.count("Lancaster") == 1
+        assert {"La Mesa", "Lakewood"} <= set(names)
+        service.client.places_autocomplete.assert_called_once()
+
+    def test_unknown_prefix_falls_back_to_google(self, service):
+        """Test that prefixes the index can't resolve use Google."""
+        service.client.places_autocomplete.return_value = []
+        assert service.autocomplete_cities("Qqzx") == []
+        service.client.places_autocomplete.assert_called_once()
+
+    def test_typo_matches_follow_google_results(self, service):
+        """Test that a city missing locally comes from Google, with local typo matches after it."""
+        service.client.places_autocomplete.return_value = [_prediction("Ojai")]
+        names = [c["name"] for c in service.autocomplete_cities("Oja")]
+        assert names[0] == "Ojai"
+        assert "Oakland" in names[1:]
+
+        service.client.places_autocomplete.return_value = []
+        assert service.autocomplete_cities("Frsno")[0]["name"] == "Fresno"
+        assert service.client.places_autocomplete.call_count == 2
+        assert [c["name"] for c in service.autocomplete_cities("Oja")][0] == "Ojai"
+        assert service.client.places_autocomplete.call_count == 2
+
+    def test_longer_query_narrows_complete_prefix(self, service):
+        """Test that a complete prefix result answers longer queries locally."""
+        service.client.places_autocomplete.return_value = [
+            _prediction("Qqzville"),
+            _prediction("Qqztown"),
+        ]
+
+        assert len(service.autocomplete_cities("Qqz")) == 2
+        assert [c["name"] for c in service.autocomplete_cities("Qqzv")] == ["Qqzville"]
+
+        service.client.places_autocomplete.assert_called_once()
+        stats = service.cache.get_stats()["namespaces"]["autocomplete"]
+        assert stats["prefix_reuse"] == 1
+
+    def test_truncated_prefix_is_not_narrowed(self, service):
+        """Test that a prefix result cut off at the limit is not reused."""
+        service.client.places_autocomplete.return_value = [
+            _prediction(f"Qqzcity {i}") for i in range(GOOGLE_AUTOCOMPLETE_LIMIT)
+        ]
+
+        service.autocomplete_cities("Qqz")
+        service.autocomplete_cities("Qqzc")
+
+        assert service.client.places_autocomplete.call_count == 2
+
+
+class TestQuotaFallbacks:
+    """Tests for serving cached or cataloged data when Google calls are refused."""
+
+    def test_discover_falls_back_to_catalog(self, service):
+        """Test that discover serves cataloged places, uncached, when Google is unavailable."""
+        service.catalog.upsert_results(
+            [_google_place("p1", "Alcatraz"), _google_place("p2", "Golden Gate Park", types=["park"])],
+            city="San Francisco"
+        )
+        service.upstream.quota.apis["text_search"].breaker.opened_at = time.monotonic()
+
+        places = service.discover_places("San Francisco", ["attractions"])
+
+        assert [p.id for p in places] == ["p1"]
+        service.client.places.assert_not_called()
+        assert service.cache.get(discover_cache_key("San Francisco", ["attractions"])) is None
+
+    def test_search_falls_back_to_catalog(self, service):
+        """Test that a refused search serves cataloged places matching the query, uncached."""
+        service.catalog.upsert_results(
+            [_google_place("p1", "Blue Bottle Coffee", types=["cafe"]), _google_place("p2", "Golden Gate Park", types=["park"])],
+            city="San Francisco"
+        )
+        service.upstream.quota.apis["text_search"].breaker.opened_at = time.monotonic()
+
+        assert [p.id for p in service.search_places("coffee", "San Francisco")] == ["p1"]
+        assert [p.id for p in service.search_places("park", "San Francisco")] == ["p2"]
+        service.client.places.assert_not_called()
+        assert service.cache.get(search_cache_key("coffee", "San Francisco", None)) is None
+
+    def test_search_serves_stale_base_set(self, service):
+        """Test that an open_now search too old to trust is served from cache when Google is refused."""
+        place = {**_google_place("p1", "Blue Bottle"), "opening_hours": {"open_now": True}}
+        service.client.places.return_value = {"results": [place]}
+        service.search_places("coffee", "San Francisco")
+        cache_k = search_cache_key("coffee", "San Francisco", None)
+        cached = service.cache.get(cache_k)
+        cached["fetched_at"] = time.time() - 2 * OPEN_NOW_MAX_AGE_SECONDS
+        service.cache.set(cache_k, cached)
+        service.client.places.reset_mock()
+        service.upstream.quota.apis["text_search"].breaker.opened_at = time.monotonic()
+
+        places = service.search_places("coffee", "San Francisco", open_now=True)
+
+        assert [p.id for p in places] == ["p1"]
+        service.client.places.assert_not_called()
+
+    def test_refused_search_is_not_negatively_cached(self, service):
+        """Test that a refused search is retried once Google is available again."""
+        service.upstream.quota.apis["text_search"].breaker.opened_at = time.monotonic()
+        assert service.search_places("coffee", "San Francisco") == []
+
+        service.upstream.quota.apis["text_search"].breaker.record_success()
+        service.client.places.return_value = {"results": [_google_place("p1", "Blue Bottle")]}
+        assert [p.id for p in service.search_places("coffee", "San Francisco")] == ["p1"]
+
+    def test_repeated_failures_open_the_circuit(self, service):
+        """Test that Google stops being called after consecutive failures."""
+        service.client.place.side_effect = Exception("timeout")
+        for i in range(5):
+            service.get_place_details(f"p{i}")
+
+        with pytest.raises(UpstreamUnavailable):
+            service.upstream.quota.acquire("place_details")
+        assert service.client.place.call_count == 5
@@ -0,0 +1,130 @@
+"""Tests for Google API quota budgets and circuit breakers."""
+import time
+import googlemaps
+import pytest
+from unittest.mock import MagicMock
+from backend.services.enrichment_service import DetailEnricher
+from backend.services.quota_service import (
+    QuotaManager,
+    TokenBucket,
+    CircuitBreaker,
+    UpstreamUnavailable,
+    background_priority,
+)
+from backend.models.place import PlaceRecord
+
+
+class TestTokenBucket:
+    """Tests for the short-term rate limiter."""
+
+    def test_bucket_refuses_when_empty(self):
+        """Test that a drained bucket refuses further calls."""
+        bucket = TokenBucket(rate=0.001, capacity=2)
+        assert bucket.try_take(1)
+        assert bucket.try_take(1)
+        assert not bucket.try_take(1)
+
+    def test_keep_reserves_tokens(self):
+        """Test that `keep` leaves the reserved tokens untouched."""
+        bucket = TokenBucket(rate=0.001, capacity=4)
+        assert bucket.try_take(2, keep=2)
+        assert not bucket.try_take(1, keep=2)
+        assert bucket.try_take(1)
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the breaker."""
+        breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60)
+        breaker.record_failure()
+        assert breaker.available()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.available()
+
+    def test_half_open_allows_one_trial(self):
+        """Test that after the cooldown a single trial call is admitted."""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=0)
+        breaker.record_failure()
+        assert breaker.state == "half_open"
+        assert breaker.available()
+        breaker.begin()
+        assert not breaker.available()
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+class TestQuotaManager:
+    """Tests for daily budgets, priorities and call accounting."""
+
+    def test_daily_budget_is_enforced(self):
+        """Test that calls beyond the daily limit are refused."""
+        quota = QuotaManager()
+        quota.apis["text_search"].daily_limit = 2
+        quota.acquire("text_search")
+        quota.acquire("text_search")
+
+        with pytest.raises(UpstreamUnavailable) as exc:
+            quota.acquire("text_search")
+        assert exc.value.reason == "budget_exhausted"
+
+    def test_background_share_of_budget(self):
+        """Test that background work stops at its share, leaving the rest for users."""
+        quota = QuotaManager()
+        quota.background_share = 0.5
+        quota.apis["place_details"].daily_limit = 4
+        with background_priority():
+            quota.acquire("place_details")
+            quota.acquire("place_details")
+            with pytest.raises(UpstreamUnavailable):
+                quota.acquire("place_details")
+
+        quota.acquire("place_details")
+        assert quota.get_stats()["apis"]["place_details"]["calls"] == {"interactive": 1, "background": 2}
+
+    def test_background_keeps_burst_headroom(self):
+        """Test that background calls cannot drain the bucket below half."""
+        quota = QuotaManager()
+        bucket = quota.apis["autocomplete"].bucket
+        bucket.rate = 0.001
+        bucket.tokens = bucket.capacity / 2
+        with background_priority(), pytest.raises(UpstreamUnavailable) as exc:
+            quota.acquire("autocomplete")
+        assert exc.value.reason == "rate_limited"
+        quota.acquire("autocomplete")
+
+    def test_element_cost(self):
+        """Test that a call's cost is charged against the daily budget."""
+        quota = QuotaManager()
+        fn = MagicMock(return_value={"status": "OK"})
+        quota.call("distance_matrix_elements", fn, cost=9, origins=["a"])
+
+        fn.assert_called_once_with(origins=["a"])
+        assert quota.get_stats()["apis"]["distance_matrix_elements"]["used_today"] == 9
+
+    def test_bad_requests_do_not_trip_breaker(self):
+        """Test that only degraded-upstream errors count as failures."""
+        quota = QuotaManager()
+        fn = MagicMock(side_effect=googlemaps.exceptions.ApiError("INVALID_REQUEST"))
+        for _ in range(10):
+            with pytest.raises(googlemaps.exceptions.ApiError):
+                quota.call("place_details", fn)
+        assert quota.apis["place_details"].breaker.state == "closed"
+
+
+class TestBackgroundWorkers:
+    """Tests for background work backing off when refused."""
+
+    def test_enricher_requeues_refused_places(self):
+        """Test that a refused batch stops early and keeps its places queued."""
+        enricher = DetailEnricher()
+        enricher.enqueue([PlaceRecord(id="a", name="a", user_rating_total=2), PlaceRecord(id="b", name="b", user_rating_total=1)])
+        service = MagicMock()
+        service.enrich_place.side_effect = UpstreamUnavailable("place_details", "budget_exhausted")
+
+        assert enricher.process_batch(service, size=2) == 0
+        assert service.enrich_place.call_count == 1
+        assert enricher.pop_batch(2) == ["a", "b"]
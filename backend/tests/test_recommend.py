@@ -3,7 +3,14 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 from backend.api.main import app
-from backend.models.place import Place, Coordinates
+from backend.api.recommend import RECOMMEND_LIMIT
+from backend.models.place import Place, PlaceRecord, Coordinates
+from backend.services.cache_service import InMemoryCache
+from backend.services.places_service import discover_cache_key
+from backend.services.recommendation_system import RecommendationService
+from backend.services.taste_profile import TasteProfileStore
+from backend.core.deps import get_current_user_optional
+from backend.models.db import User
 
 client = TestClient(app)
 
@@ -58,6 +65,106 @@ class TestRecommendEndpoint:
         assert data["recommendations"][0]["name"] == "Test Park"
         assert data["recommendations"][0]["score"] == 85.0
 
+    @patch("backend.api.recommend.get_cache")
+    @patch("backend.api.recommend.get_places_service")
+    @patch("backend.api.recommend.get_recommendation_service")
+    def test_results_cached_per_city_and_preferences(self, mock_rec_service, mock_places_service, mock_get_cache):
+        """Test that equivalent preferences share cached results until the city's places change."""
+        cache = InMemoryCache()
+        mock_get_cache.return_value = cache
+        place = Place(id="p1", name="Dolores Park", rating=4.7, types=["park"])
+        cache.set(discover_cache_key("San Francisco, CA", ["outdoor", "culture"]), [place.model_dump()])
+
+        mock_places_service.return_value.discover_places.return_value = [place]
+        mock_places_service.return_value.get_photo_url.return_value = None
+        mock_rec_service.return_value.recommend.return_value = [{"place": place, "score": 60.0, "reasons": []}]
+
+        def post(activities, pace):
+            return client.post("/api/recommend/", json={
+                "city": "San Francisco, CA",
+                "user_preference": {"activities": activities, "price_range": "budget", "travel_pace": pace},
+            })
+
+        assert post(["outdoor", "cultural"], "relaxed").status_code == 200
+        # Same score-relevant answers in another order, different pace: served from cache
+        assert post(["cultural", "outdoor", "outdoor"], "packed").json()["count"] == 1
+        assert mock_rec_service.return_value.recommend.call_count == 1
+        namespaces = cache.get_stats()["namespaces"]
+        assert (namespaces["recommend"]["hits"], namespaces["recommend"]["misses"]) == (1, 1)
+        assert namespaces["discover"]["hits"] == 0
+
+        # A different response limit is cut from the same cached pool
+        with patch("backend.api.recommend.RECOMMEND_LIMIT", 0):
+            assert post(["outdoor", "cultural"], "relaxed").json()["count"] == 0
+        assert mock_rec_service.return_value.recommend.call_count == 1
+
+        cache.update_place("p1", {"price_level": 2})
+        post(["outdoor", "cultural"], "relaxed")
+        assert mock_rec_service.return_value.recommend.call_count == 2
+
+    @patch("backend.api.recommend.get_taste_profile_store")
+    @patch("backend.api.recommend.get_cache")
+    @patch("backend.api.recommend.get_places_service")
+    @patch("backend.api.recommend.get_recommendation_service")
+    def test_logged_in_user_results_reranked(self, mock_rec_service, mock_places_service, mock_get_cache, mock_store):
+        """Test that a logged-in user's taste profile re-ranks the shared cached results."""
+        mock_get_cache.return_value = InMemoryCache()
+        bar = PlaceRecord(id="bar", name="Bar", rating=4.8, types=["bar"])
+        cafe = PlaceRecord(id="cafe", name="Cafe", rating=4.6, types=["cafe"])
+        mock_places_service.return_value.discover_places.return_value = [bar, cafe]
+        mock_places_service.return_value.get_photo_url.return_value = None
+        mock_rec_service.return_value = RecommendationService()
+
+        store = TasteProfileStore(half_life_days=30)
+        store.record(42, "Fresno", ["cafes"])
+        store._seeded.add(42)
+        mock_store.return_value = store
+        app.dependency_overrides[get_current_user_optional] = lambda: User(id=42, email="a@b.c")
+        request = {
+            "city": "Fresno, CA",
+            "user_preference": {"activities": ["food", "nightlife"], "price_range": "budget"},
+        }
+        try:
+            personal = client.post("/api/recommend/", json=request).json()
+        finally:
+            app.dependency_overrides.pop(get_current_user_optional)
+        anonymous = client.post("/api/recommend/", json=request).json()
+
+        assert [r["id"] for r in anonymous["recommendations"]] == ["bar", "cafe"]
+        assert [r["id"] for r in personal["recommendations"]] == ["cafe", "bar"]
+
+    @patch("backend.api.recommend.get_taste_profile_store")
+    @patch("backend.api.recommend.get_cache")
+    @patch("backend.api.recommend.get_places_service")
+    @patch("backend.api.recommend.get_recommendation_service")
+    def test_personalization_promotes_from_whole_pool(self, mock_rec_service, mock_places_service, mock_get_cache, mock_store):
+        """Test that a favored candidate ranked below the cut can still make the results."""
+        mock_get_cache.return_value = InMemoryCache()
+        bars = [PlaceRecord(id=f"bar{i}", name=f"Bar {i}", rating=4.8, types=["bar"]) for i in range(RECOMMEND_LIMIT + 2)]
+        cafe = PlaceRecord(id="cafe", name="Cafe", rating=4.0, types=["cafe"])
+        mock_places_service.return_value.discover_places.return_value = bars + [cafe]
+        mock_places_service.return_value.get_photo_url.return_value = None
+        mock_rec_service.return_value = RecommendationService()
+
+        store = TasteProfileStore(half_life_days=30)
+        store.record(42, "Fresno", ["cafes"])
+        store._seeded.add(42)
+        mock_store.return_value = store
+        request = {
+            "city": "Fresno, CA",
+            "user_preference": {"activities": ["food", "nightlife"], "price_range": "budget"},
+        }
+        anonymous = client.post("/api/recommend/", json=request).json()
+        app.dependency_overrides[get_current_user_optional] = lambda: User(id=42, email="a@b.c")
+        try:
+            personal = client.post("/api/recommend/", json=request).json()
+        finally:
+            app.dependency_overrides.pop(get_current_user_optional)
+
+        assert anonymous["count"] == personal["count"] == RECOMMEND_LIMIT
+        assert "cafe" not in [r["id"] for r in anonymous["recommendations"]]
+        assert personal["recommendations"][0]["id"] == "cafe"
+
     def test_get_activity_types(self):
         """Test that activity types endpoint returns list of activities."""
         response = client.get("/api/recommend/activity-types")
@@ -0,0 +1,166 @@
+"""Tests for the batch recommendation scoring engine."""
+import math
+import random
+import numpy as np
+from unittest.mock import patch
+from backend.models.place import PlaceRecord
+from backend.models.user_preferance import ActivityType, PriceRange, UserPreference
+from backend.services.place_batch import PlaceBatch
+from backend.services.recommendation_system import (
+    PRICE_LEVEL_MAP,
+    TYPE_TO_ACTIVITY,
+    RecommendationService,
+    preference_key,
+    top_k,
+)
+from backend.services.taste_profile import TasteProfile
+
+TYPES = list(TYPE_TO_ACTIVITY) + ["establishment", "lodging"]
+
+
+def _reference_score(place, preference):
+    """The original one-place-at-a-time scoring rules."""
+    score = place.rating * 5 if place.rating else 0.0
+    activities = {TYPE_TO_ACTIVITY[t] for t in place.types if t in TYPE_TO_ACTIVITY}
+    matching = activities & set(preference.activities)
+    score += len(matching) * 20
+    if place.user_rating_total:
+        score += min(15, math.log(place.user_rating_total + 1) * 2)
+    if place.price_level is not None:
+        score += 10 if place.price_level <= PRICE_LEVEL_MAP[preference.price_range] else -10
+    if not matching and preference.activities:
+        score -= 15
+    return score
+
+
+def _random_places(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        PlaceRecord(
+            id=f"p{i}",
+            name=f"Place {i}",
+            rating=rng.choice([None, round(rng.uniform(1, 5), 1)]),
+            user_rating_total=rng.choice([None, rng.randint(0, 20000)]),
+            price_level=rng.choice([None, 0, 1, 2, 3, 4]),
+            types=rng.sample(TYPES, rng.randint(0, 3)),
+        )
+        for i in range(count)
+    ]
+
+
+class TestBatchScoring:
+    """Tests that vectorized scores match the per-place rules."""
+
+    def test_scores_match_reference(self):
+        """Test batch scores against the scalar rules on random places."""
+        places = _random_places(500)
+        preference = UserPreference(
+            activities=[ActivityType.FOOD, ActivityType.OUTDOOR], price_range=PriceRange.MODERATE
+        )
+        scores = RecommendationService().score_batch(PlaceBatch.from_records(places), preference)
+
+        expected = [_reference_score(p, preference) for p in places]
+        assert np.allclose(scores, expected)
+
+    def test_no_preferences_no_penalty(self):
+        """Test that an empty activity list is not penalized."""
+        place = PlaceRecord(id="a", name="a", rating=4.0)
+        scores = RecommendationService().score_batch(
+            PlaceBatch.from_records([place]), UserPreference(activities=[])
+        )
+        assert scores.tolist() == [20.0]
+
+
+class TestTopK:
+    """Tests for argpartition-based top-k selection."""
+
+    def test_matches_stable_sort(self):
+        """Test that top-k equals a stable descending sort, ties included."""
+        scores = np.array([5, 9, 5, 7, 9, 1, 5, 7], dtype=float)
+        stable = sorted(range(len(scores)), key=lambda i: -scores[i])
+        for k in range(1, len(scores) + 2):
+            assert top_k(scores, k).tolist() == stable[:k]
+
+
+class TestRecommend:
+    """Tests for the recommend() result shape."""
+
+    def test_reasons_only_for_returned_places(self):
+        """Test that reasons are built for the top-k only."""
+        service = RecommendationService()
+        places = _random_places(200)
+        preference = UserPreference(activities=[ActivityType.CULTURAL])
+
+        with patch.object(service, "_reasons", wraps=service._reasons) as reasons:
+            result = service.recommend(places, preference, limit=5)
+
+        assert reasons.call_count == 5
+        assert [r["score"] for r in result] == sorted((r["score"] for r in result), reverse=True)
+
+    def test_reasons(self):
+        """Test the reasons attached to a strong match."""
+        place = PlaceRecord(
+            id="m", name="Museum", rating=4.7, user_rating_total=5000, price_level=1, types=["museum"]
+        )
+        result = RecommendationService().recommend(
+            [place], UserPreference(activities=[ActivityType.CULTURAL], price_range=PriceRange.BUDGET)
+        )
+        assert result[0]["reasons"] == [
+            "Highly rated place with 4.7 rating",
+            "Matches activity your interests: cultural",
+            "Very popular spot",
+            "Within your budget",
+        ]
+
+    def test_empty_candidates(self):
+        """Test that no candidates yields no recommendations."""
+        assert RecommendationService().recommend([], UserPreference(activities=[])) == []
+
+
+class TestPreferenceKey:
+    """Tests for the canonical preference hash."""
+
+    def test_ignores_order_duplicates_and_unscored_fields(self):
+        """Test that only activities (as a set) and price range matter."""
+        base = UserPreference(activities=[ActivityType.FOOD, ActivityType.OUTDOOR])
+        same = UserPreference(
+            activities=[ActivityType.OUTDOOR, ActivityType.FOOD, ActivityType.FOOD],
+            travel_pace="packed",
+            has_car=False,
+        )
+        assert preference_key(base) == preference_key(same)
+
+    def test_price_range_matters(self):
+        """Test that a different budget gets its own key."""
+        budget = UserPreference(activities=[ActivityType.FOOD], price_range=PriceRange.BUDGET)
+        luxury = UserPreference(activities=[ActivityType.FOOD], price_range=PriceRange.LUXURY)
+        assert preference_key(budget) != preference_key(luxury)
+
+
+class TestPersonalize:
+    """Tests for re-ranking results by a user's taste profile."""
+
+    def _scored(self):
+        return [
+            {"place": PlaceRecord(id="bar", name="Bar", types=["bar"]), "score": 70.0, "reasons": []},
+            {"place": PlaceRecord(id="cafe", name="Cafe", types=["cafe"]), "score": 62.0, "reasons": []},
+            {"place": PlaceRecord(id="inn", name="Inn", types=["lodging"]), "score": 50.0, "reasons": []},
+        ]
+
+    def test_affinity_reorders_results(self):
+        """Test that the additive term can lift a favored category above a higher base score."""
+        profile = TasteProfile()
+        profile.record("Fresno, CA", ["cafes"], 0, 86400)
+        result = RecommendationService().personalize(self._scored(), profile, weight=15)
+        assert [item["place"].id for item in result] == ["cafe", "bar", "inn"]
+        assert result[0]["score"] == 77.0
+        assert result[0]["reasons"] == ["Similar to places you often search for"]
+
+    def test_shared_results_untouched(self):
+        """Test that the cached input list and its items aren't modified."""
+        scored = self._scored()
+        profile = TasteProfile()
+        profile.record("Fresno, CA", ["cafes"], 0, 86400)
+        RecommendationService().personalize(scored, profile, weight=15)
+        assert [item["score"] for item in scored] == [70.0, 62.0, 50.0]
+        assert scored[1]["reasons"] == []
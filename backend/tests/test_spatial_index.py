@@ -0,0 +1,58 @@
+"""Tests for the in-memory spatial index."""
+import time
+from backend.models.place import PlaceRecord, LatLng
+from backend.services.spatial_index import SpatialIndex, haversine_m
+
+
+def _place(place_id, lat, lng, types=None):
+    return PlaceRecord(id=place_id, name=place_id, coordinates=LatLng(lat=lat, lng=lng), types=types or [])
+
+
+class TestSpatialIndex:
+    """Tests for radius and bounding-box queries."""
+
+    def test_nearby_sorted_by_distance(self):
+        """Test that only places within the radius come back, nearest first."""
+        index = SpatialIndex()
+        index.add_many([
+            _place("ferry", 37.7955, -122.3937),
+            _place("coit", 37.8024, -122.4058),
+            _place("zoo", 37.7330, -122.5030),
+        ])
+
+        results = index.nearby(37.7950, -122.3940, radius_m=2000)
+
+        assert [p.id for p, _ in results] == ["ferry", "coit"]
+        assert results[0][1] < results[1][1] <= 2000
+
+    def test_type_filter_and_moves(self):
+        """Test type filtering and that re-adding a place moves it."""
+        index = SpatialIndex()
+        index.add(_place("a", 37.80, -122.40, ["cafe"]))
+        index.add(_place("b", 37.80, -122.40, ["bar"]))
+        index.add(_place("a", 34.05, -118.24, ["cafe"]))
+
+        assert [p.id for p, _ in index.nearby(37.80, -122.40, 500, types={"cafe"})] == []
+        assert [p.id for p, _ in index.nearby(34.05, -118.24, 500, types={"cafe"})] == ["a"]
+        assert len(index) == 2
+
+    def test_places_without_coordinates_are_skipped(self):
+        """Test that places lacking coordinates are not indexed."""
+        index = SpatialIndex()
+        index.add(PlaceRecord(id="x", name="Nowhere"))
+        assert len(index) == 0
+
+    def test_haversine(self):
+        """Test the distance helper against a known value (SF to LA ~559 km)."""
+        assert 555_000 < haversine_m(37.7749, -122.4194, 34.0522, -118.2437) < 562_000
+
+    def test_huge_box_scans_populated_cells_only(self):
+        """Test that a world-sized box costs no more than the index size."""
+        index = SpatialIndex()
+        index.add_many([_place("sf", 37.77, -122.42), _place("la", 34.05, -118.24)])
+
+        started = time.perf_counter()
+        found = index.within(-85, -180, 85, 180)
+        assert time.perf_counter() - started < 0.5
+        assert sorted(p.id for p in found) == ["la", "sf"]
+        assert [p.id for p in index.within(36, -123, 38, -121)] == ["sf"]
@@ -0,0 +1,116 @@
+"""Tests for incrementally maintained taste profiles."""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.core.database import Base
+from backend.models.db import SearchHistory
+from backend.services.taste_profile import TasteProfile, TasteProfileStore, history_categories
+
+DAY = 86400
+NOW = datetime(2026, 6, 1, 12, 0)
+
+
+@pytest.fixture
+def db():
+    """An isolated in-memory database session."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _add_history(db, user_id, city, query, days_ago=0):
+    db.add(SearchHistory(user_id=user_id, city=city, query=query, timestamp=NOW - timedelta(days=days_ago)))
+    db.commit()
+
+
+class TestTasteProfile:
+    """Tests for decayed affinities on a single profile."""
+
+    def test_affinities_are_shares_of_searches(self):
+        """Test that affinities are the share of searches including a category or city."""
+        profile = TasteProfile()
+        profile.record("Fresno, CA", ["cafes", "outdoor"], 0, 30 * DAY)
+        profile.record("Fresno, CA", ["cafes"], 0, 30 * DAY)
+        profile.record("San Francisco, CA", ["culture"], 0, 30 * DAY)
+        assert profile.category_affinity("cafes") == pytest.approx(2 / 3)
+        assert profile.category_affinity("outdoor") == pytest.approx(1 / 3)
+        assert profile.category_affinity("nightlife") == 0.0
+        assert profile.city_affinity("Fresno, CA") == pytest.approx(2 / 3)
+
+    def test_old_searches_decay(self):
+        """Test that a search one half-life older counts half as much."""
+        profile = TasteProfile()
+        profile.record("Fresno, CA", ["nightlife"], 0, 30 * DAY)
+        profile.record("Fresno, CA", ["cafes"], 30 * DAY, 30 * DAY)
+        assert profile.category_affinity("cafes") == pytest.approx(1 / 1.5)
+        assert profile.category_affinity("nightlife") == pytest.approx(0.5 / 1.5)
+
+    def test_out_of_order_search_weighed_by_age(self):
+        """Test that recording an older search gives the same result as recording it in order."""
+        in_order = TasteProfile()
+        in_order.record("Fresno, CA", ["nightlife"], 0, 30 * DAY)
+        in_order.record("Fresno, CA", ["cafes"], 30 * DAY, 30 * DAY)
+        reversed_order = TasteProfile()
+        reversed_order.record("Fresno, CA", ["cafes"], 30 * DAY, 30 * DAY)
+        reversed_order.record("Fresno, CA", ["nightlife"], 0, 30 * DAY)
+        for category in ("cafes", "nightlife"):
+            assert reversed_order.category_affinity(category) == pytest.approx(in_order.category_affinity(category))
+
+    def test_place_affinity_uses_best_category(self):
+        """Test that a place scores its strongest matching category via its Google types."""
+        profile = TasteProfile()
+        profile.record("Fresno, CA", ["cafes"], 0, 30 * DAY)
+        profile.record("Fresno, CA", ["cafes", "culture"], 0, 30 * DAY)
+        assert profile.place_affinity(["bakery", "museum"]) == pytest.approx(1.0)
+        assert profile.place_affinity(["museum"]) == pytest.approx(0.5)
+        assert profile.place_affinity(["lodging"]) == 0.0
+
+
+class TestTasteProfileStore:
+    """Tests for the in-memory profile store."""
+
+    def test_record_normalizes_city(self):
+        """Test that records update the profile with the normalized city."""
+        store = TasteProfileStore(half_life_days=30)
+        store.record(1, "Fresno", ["cafes"], NOW)
+        assert store.get(1).city_affinity("Fresno, CA") == 1.0
+        assert store.get(2) is None
+
+    def test_ensure_seeds_once_from_history(self, db):
+        """Test that a profile is rebuilt from history once, then only updated incrementally."""
+        _add_history(db, 1, "Fresno", "cafes,outdoor", days_ago=2)
+        _add_history(db, 1, "Fresno", "cafes", days_ago=1)
+        _add_history(db, 2, "Fresno", "nightlife")
+        store = TasteProfileStore(half_life_days=30)
+
+        profile = store.ensure(1, db)
+        assert profile.category_affinity("cafes") == pytest.approx(1.0)
+        assert profile.category_affinity("nightlife") == 0.0
+
+        _add_history(db, 1, "Fresno", "culture")
+        store.record(1, "Fresno", ["culture"], NOW)
+        assert store.ensure(1, db) is profile
+        assert store.get_stats()["seeded_from_history"] == 1
+        assert profile.searches == pytest.approx(3.0, rel=0.05)
+
+    def test_seed_matches_incremental_updates(self, db):
+        """Test that replaying history gives the same profile as recording it live."""
+        live = TasteProfileStore(half_life_days=30)
+        for days_ago, query in [(40, "nightlife"), (10, "cafes,culture"), (0, "cafes")]:
+            _add_history(db, 1, "San Francisco, CA", query, days_ago)
+            live.record(1, "San Francisco, CA", history_categories(query), NOW - timedelta(days=days_ago))
+
+        seeded = TasteProfileStore(half_life_days=30).ensure(1, db)
+        for category in ("cafes", "culture", "nightlife"):
+            assert seeded.category_affinity(category) == pytest.approx(live.get(1).category_affinity(category))
+
+    def test_user_without_history(self, db):
+        """Test that users with no history get no profile and aren't queried again."""
+        store = TasteProfileStore(half_life_days=30)
+        assert store.ensure(1, db) is None
+        _add_history(db, 1, "Fresno", "cafes")
+        assert store.ensure(1, db) is None
+        assert store.get_stats()["seeded_from_history"] == 1
@@ -0,0 +1,192 @@
+"""Tests for hedged and retried Google calls."""
+import threading
+import time
+import googlemaps
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+from backend.services.quota_service import QuotaManager, UpstreamUnavailable, background_priority
+from backend.services.upstream_service import LatencyHistogram, UpstreamCaller, google_client, is_retryable
+
+
+@pytest.fixture
+def upstream():
+    """An UpstreamCaller with its own quota and fast, deterministic settings."""
+    caller = UpstreamCaller(QuotaManager(), max_workers=4)
+    caller.settings = MagicMock(
+        HEDGE_ENABLED=True,
+        HEDGE_QUANTILE=0.95,
+        HEDGE_MIN_SAMPLES=5,
+        HEDGE_MIN_DELAY_SECONDS=0.01,
+        UPSTREAM_MAX_RETRIES=2,
+        UPSTREAM_RETRY_BASE_SECONDS=0.001,
+    )
+    return caller
+
+
+def _warm(upstream, api="place_details", seconds=0.01, samples=10):
+    """Give an endpoint a latency history so hedging kicks in."""
+    for _ in range(samples):
+        upstream._stats(api).attempts.record(seconds)
+
+
+class TestLatencyHistogram:
+    """Tests for histogram quantiles."""
+
+    def test_quantiles_follow_samples(self):
+        """Test that p50 and p95 land in the buckets holding the samples."""
+        histogram = LatencyHistogram()
+        for _ in range(95):
+            histogram.record(0.02)
+        for _ in range(5):
+            histogram.record(2.0)
+
+        assert 0.02 <= histogram.quantile(0.5) < 0.03
+        assert histogram.quantile(0.95) < 0.03
+        assert histogram.quantile(0.99) >= 2.0
+
+    def test_empty_histogram(self):
+        """Test that an empty histogram has no quantiles."""
+        assert LatencyHistogram().quantile(0.95) is None
+
+
+class TestRetries:
+    """Tests for retrying only retryable failures."""
+
+    def test_retryable_statuses(self):
+        """Test the retryable classification of Google errors."""
+        assert is_retryable(googlemaps.exceptions.Timeout())
+        assert is_retryable(googlemaps.exceptions.HTTPError(503))
+        assert is_retryable(googlemaps.exceptions.ApiError("UNKNOWN_ERROR"))
+        assert not is_retryable(googlemaps.exceptions.HTTPError(404))
+        assert not is_retryable(googlemaps.exceptions.ApiError("INVALID_REQUEST"))
+        assert not is_retryable(googlemaps.exceptions.ApiError("OVER_QUERY_LIMIT"))
+
+    def test_retries_then_succeeds(self, upstream):
+        """Test that a transient failure is retried."""
+        fn = MagicMock(side_effect=[googlemaps.exceptions.Timeout(), {"status": "OK"}])
+
+        assert upstream.call("place_details", fn, place_id="p1") == {"status": "OK"}
+        assert fn.call_count == 2
+        assert upstream.get_stats()["place_details"]["retries"] == 1
+
+    def test_gives_up_after_max_retries(self, upstream):
+        """Test that retries stop at the configured limit."""
+        fn = MagicMock(side_effect=googlemaps.exceptions.Timeout())
+        with pytest.raises(googlemaps.exceptions.Timeout):
+            upstream.call("place_details", fn)
+        assert fn.call_count == 3
+
+    def test_bad_request_is_not_retried(self, upstream):
+        """Test that non-retryable errors are raised immediately."""
+        fn = MagicMock(side_effect=googlemaps.exceptions.ApiError("INVALID_REQUEST"))
+        with pytest.raises(googlemaps.exceptions.ApiError):
+            upstream.call("place_details", fn)
+        assert fn.call_count == 1
+
+
+class _StatusAdapter(requests.adapters.BaseAdapter):
+    """Transport that answers every request with one HTTP status."""
+
+    def __init__(self, status):
+        super().__init__()
+        self.status = status
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        response = requests.Response()
+        response.status_code = self.status
+        response.request = request
+        response.url = request.url
+        response._content = b'{"status": "UNKNOWN_ERROR"}'
+        return response
+
+    def close(self):
+        pass
+
+
+class TestGoogleClient:
+    """Tests for the single-attempt googlemaps client."""
+
+    def test_server_error_sent_once_per_attempt(self, upstream):
+        """Test that a 503 reaches the transport once per UpstreamCaller attempt."""
+        client = google_client("AIza-test-key")
+        adapter = _StatusAdapter(503)
+        client.session.mount("https://", adapter)
+
+        with pytest.raises(googlemaps.exceptions.HTTPError) as error:
+            upstream.call("place_details", client.place, place_id="p1")
+
+        assert error.value.status_code == 503
+        assert adapter.sent == 3  # One attempt plus UPSTREAM_MAX_RETRIES
+        assert upstream.get_stats()["place_details"]["retries"] == 2
+        assert upstream.quota.get_stats()["apis"]["place_details"]["used_today"] == 3
+
+
+class TestHedging:
+    """Tests for hedged duplicate requests."""
+
+    def test_no_hedge_without_history(self, upstream):
+        """Test that an endpoint without latency samples is never hedged."""
+        fn = MagicMock(side_effect=lambda: time.sleep(0.05) or "slow")
+        assert upstream.call("place_details", fn) == "slow"
+        assert fn.call_count == 1
+
+    def test_slow_primary_is_hedged(self, upstream):
+        """Test that the hedge answers when the primary stalls past p95."""
+        _warm(upstream)
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(2)  # Primary stalls
+                return "primary"
+            return "hedge"
+
+        start = time.perf_counter()
+        assert upstream.call("place_details", fn) == "hedge"
+        assert time.perf_counter() - start < 1
+        release.set()
+
+        stats = upstream.get_stats()["place_details"]
+        assert stats["hedges"] == 1
+        assert stats["hedge_wins"] == 1
+
+    def test_hedge_costs_quota(self, upstream):
+        """Test that a hedge is charged against the daily budget."""
+        _warm(upstream)
+        release = threading.Event()
+        fn = MagicMock(side_effect=lambda: release.wait(0.2) or "ok")
+
+        upstream.call("place_details", fn)
+        release.set()
+        assert upstream.quota.get_stats()["apis"]["place_details"]["used_today"] == 2
+
+    def test_no_hedge_when_budget_exhausted(self, upstream):
+        """Test that the caller waits on the primary if the hedge is refused."""
+        _warm(upstream)
+        upstream.quota.apis["place_details"].daily_limit = 1
+        fn = MagicMock(side_effect=lambda: time.sleep(0.05) or "primary")
+
+        assert upstream.call("place_details", fn) == "primary"
+        assert fn.call_count == 1
+
+    def test_background_calls_are_not_hedged(self, upstream):
+        """Test that background work never pays for hedges."""
+        _warm(upstream)
+        fn = MagicMock(side_effect=lambda: time.sleep(0.05) or "slow")
+        with background_priority():
+            assert upstream.call("place_details", fn) == "slow"
+        assert fn.call_count == 1
+        assert upstream.quota.get_stats()["apis"]["place_details"]["calls"]["background"] == 1
+
+    def test_refused_primary_raises(self, upstream):
+        """Test that a refused call surfaces UpstreamUnavailable without retrying."""
+        upstream.quota.apis["text_search"].daily_limit = 0
+        fn = MagicMock()
+        with pytest.raises(UpstreamUnavailable):
+            upstream.call("text_search", fn)
+        fn.assert_not_called()
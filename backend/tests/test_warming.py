@@ -0,0 +1,74 @@
+"""Tests for history-driven cache warming."""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.core.database import Base
+from backend.models.db import SearchHistory
+from backend.services.warming_service import CacheWarmer, rank_warm_targets, in_warm_window
+
+
+@pytest.fixture
+def db():
+    """An isolated in-memory database session."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _add_history(db, city, query, count, days_ago=0):
+    for _ in range(count):
+        db.add(SearchHistory(
+            user_id=1,
+            city=city,
+            query=query,
+            timestamp=datetime.utcnow() - timedelta(days=days_ago)
+        ))
+    db.commit()
+
+
+class TestWarmTargets:
+    """Tests for ranking warm targets from history."""
+
+    def test_ranks_by_search_count(self, db):
+        """Test that category order is canonicalized and pairs are ranked."""
+        _add_history(db, "San Francisco", "cafes,restaurants", 2)
+        _add_history(db, "San Francisco", "restaurants,cafes", 2)
+        _add_history(db, "Fresno", None, 3)
+        _add_history(db, "Oakland", None, 10, days_ago=30)
+
+        targets = rank_warm_targets(db, datetime.utcnow() - timedelta(days=14))
+
+        assert targets[0] == ("San Francisco, CA", ["cafes", "restaurants"], 4)
+        assert targets[1] == ("Fresno, CA", ["attractions", "restaurants"], 3)
+        assert len(targets) == 2
+
+    def test_warm_window_wraps_midnight(self):
+        """Test off-peak windows that span midnight."""
+        assert in_warm_window("22-5", datetime(2026, 1, 1, 23))
+        assert in_warm_window("22-5", datetime(2026, 1, 1, 3))
+        assert not in_warm_window("22-5", datetime(2026, 1, 1, 12))
+
+
+class TestWarmCycle:
+    """Tests for a warming cycle's Google-call budget."""
+
+    @patch("backend.services.warming_service.get_places_service")
+    def test_cycle_stops_at_budget(self, mock_get_service, db):
+        """Test that a cycle never spends more than its budget."""
+        _add_history(db, "San Francisco", None, 3)
+        _add_history(db, "Fresno", None, 2)
+        _add_history(db, "Oakland", None, 1)
+
+        mock_service = MagicMock()
+        mock_service.warm_discover.side_effect = lambda city, cats, refresh_within, budget: min(3, budget)
+        mock_get_service.return_value = mock_service
+
+        report = CacheWarmer().run_cycle(db, budget=5)
+
+        assert report["google_calls"] == 5
+        assert report["warmed"] == 2
+        assert mock_service.warm_discover.call_count == 2